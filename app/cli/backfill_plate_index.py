@@ -0,0 +1,39 @@
+"""
+Index existing vehicles by numberplate.
+
+Vehicles saved before the plate index existed have no PK=PLATE item, so the
+admin plate search cannot find them. This scans the table in parallel segments
+and writes the missing index items. Safe to re-run: items are overwritten with
+the same content.
+
+    python -m app.cli.backfill_plate_index --region ap-south-1 --segments 8 --checkpoint plates.json
+"""
+import argparse
+import asyncio
+import logging
+
+import boto3
+
+from app.cli.scan import add_scan_arguments, scan_options
+from app.log import setup_logging, shutdown_logging
+from app.repository.vehicle_repo import VehicleRepository
+
+logger = logging.getLogger(__name__)
+
+
+async def main(args: argparse.Namespace):
+    db = boto3.resource("dynamodb", region_name=args.region)
+    checkpoint, limiter = scan_options(args)
+    indexed = await VehicleRepository(db=db).backfill_plate_index(args.segments, checkpoint, limiter)
+    logger.info("backfilled plate index", extra={"indexed": indexed})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_scan_arguments(parser)
+    args = parser.parse_args()
+    setup_logging()
+    try:
+        asyncio.run(main(args))
+    finally:
+        shutdown_logging()
@@ -0,0 +1,36 @@
+"""
+Backfill login fields onto existing email lookup items.
+
+Users registered before the lookup item carried the password hash, role, office
+and username still need two reads at login. This copies those fields from each
+profile onto its lookup item. Safe to re-run: already backfilled items are skipped.
+
+    python -m app.cli.backfill_user_lookup --region ap-south-1
+"""
+import argparse
+import asyncio
+import logging
+
+import boto3
+
+from app.log import setup_logging, shutdown_logging
+from app.repository.user_repo import UserRepository
+
+logger = logging.getLogger(__name__)
+
+
+async def main(region: str):
+    db = boto3.resource("dynamodb", region_name=region)
+    updated = await UserRepository(db=db).backfill_lookup_items()
+    logger.info("backfilled lookup items", extra={"updated": updated})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--region", default="ap-south-1")
+    args = parser.parse_args()
+    setup_logging()
+    try:
+        asyncio.run(main(args.region))
+    finally:
+        shutdown_logging()
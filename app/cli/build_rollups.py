@@ -0,0 +1,45 @@
+"""
+Build hourly occupancy rollups from closed parking sessions.
+
+Recomputes the ROLLUP# items of every floor for each UTC day in the range
+(yesterday by default), which the utilization endpoint reads. Re-running a
+range overwrites it, so late-closing sessions are picked up by running the
+previous days again.
+
+    python -m app.cli.build_rollups --region ap-south-1 --start 2025-01-01 --end 2025-01-31
+"""
+import argparse
+import asyncio
+import datetime
+import logging
+
+import boto3
+
+from app.cli.scan import add_scan_arguments, scan_options
+from app.log import setup_logging, shutdown_logging
+from app.repository.rollup_repo import RollupRepository
+
+logger = logging.getLogger(__name__)
+
+
+async def main(args: argparse.Namespace):
+    db = boto3.resource("dynamodb", region_name=args.region)
+    _, limiter = scan_options(args)
+    written = await RollupRepository(db=db).build_rollups(args.start, args.end, args.segments, limiter)
+    logger.info("wrote rollups", extra={"items": written})
+
+
+if __name__ == "__main__":
+    yesterday = datetime.datetime.now(datetime.timezone.utc).date() - datetime.timedelta(days=1)
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_scan_arguments(parser)
+    parser.add_argument("--start", type=datetime.date.fromisoformat, default=yesterday, help="first UTC day")
+    parser.add_argument("--end", type=datetime.date.fromisoformat, default=yesterday, help="last UTC day")
+    args = parser.parse_args()
+    if args.checkpoint:
+        parser.error("rollups are built from a full scan and cannot resume from a checkpoint")
+    setup_logging()
+    try:
+        asyncio.run(main(args))
+    finally:
+        shutdown_logging()
@@ -0,0 +1,41 @@
+"""
+Move parking history to month-bucketed sort keys.
+
+Rewrites legacy PARKING#<epoch> items as PARKING#<YYYYMM>#<epoch> (closed sessions)
+or PARKING#OPEN#<epoch> (sessions in progress). The table is scanned in parallel
+segments, and each item is moved by a conditional copy-and-delete transaction, so
+the service can keep running. Safe to re-run: already moved items are skipped.
+
+    python -m app.cli.migrate_parking_history --region ap-south-1 --segments 8 --checkpoint migrate.json
+
+Once a fresh run (no --checkpoint) reports 0 moved items, set PARKING_HISTORY_LEGACY_READS to False.
+"""
+import argparse
+import asyncio
+import logging
+
+import boto3
+
+from app.cli.scan import add_scan_arguments, scan_options
+from app.log import setup_logging, shutdown_logging
+from app.repository.parking_repo import ParkingRepository
+
+logger = logging.getLogger(__name__)
+
+
+async def main(args: argparse.Namespace):
+    db = boto3.resource("dynamodb", region_name=args.region)
+    checkpoint, limiter = scan_options(args)
+    moved = await ParkingRepository(db=db).migrate_parking_items(args.segments, checkpoint, limiter)
+    logger.info("migrated parking history", extra={"moved": moved})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_scan_arguments(parser)
+    args = parser.parse_args()
+    setup_logging()
+    try:
+        asyncio.run(main(args))
+    finally:
+        shutdown_logging()
@@ -0,0 +1,82 @@
+"""
+Scan the whole table in parallel and write the items as JSON lines.
+
+    python -m app.cli.scan --segments 8 --sk-prefix VEHICLE# > vehicles.jsonl
+    python -m app.cli.scan --count --max-rcu 200
+
+--count prints the number of items of each kind (the sort key up to its first
+"#") instead of the items. With --checkpoint, an interrupted run restarted with
+the same file and segment count resumes where it stopped.
+
+Other whole-table jobs build on add_scan_arguments and scan_options, so they
+share these flags.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from collections import Counter
+from decimal import Decimal
+
+import boto3
+from boto3.dynamodb.conditions import Attr
+
+from app.constants import TABLE
+from app.log import setup_logging, shutdown_logging
+from app.repository.scan import CapacityLimiter, ScanCheckpoint, parallel_scan
+
+logger = logging.getLogger(__name__)
+
+
+def add_scan_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--region", default="ap-south-1")
+    parser.add_argument("--segments", type=int, default=8, help="parallel scan segments")
+    parser.add_argument("--checkpoint", help="file to record per-segment progress in, for resuming")
+    parser.add_argument("--max-rcu", type=float, help="read capacity units per second to stay under")
+
+
+def scan_options(args: argparse.Namespace) -> tuple[ScanCheckpoint | None, CapacityLimiter | None]:
+    checkpoint = ScanCheckpoint(args.checkpoint, args.segments) if args.checkpoint else None
+    limiter = CapacityLimiter(args.max_rcu) if args.max_rcu else None
+    return checkpoint, limiter
+
+
+def _json_default(value):
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, set):
+        return sorted(value)
+    return str(value)
+
+
+async def main(args: argparse.Namespace):
+    db = boto3.resource("dynamodb", region_name=args.region)
+    checkpoint, limiter = scan_options(args)
+    scan_kwargs = {"FilterExpression": Attr("SK").begins_with(args.sk_prefix)} if args.sk_prefix else {}
+
+    kinds: Counter[str] = Counter()
+    async for page in parallel_scan(db.Table(TABLE), args.segments, checkpoint, limiter, **scan_kwargs):
+        for item in page.items:
+            if args.count:
+                kinds[item["SK"].split("#", 1)[0]] += 1
+            else:
+                sys.stdout.write(json.dumps(item, default=_json_default) + "\n")
+
+    if args.count:
+        json.dump(dict(kinds.most_common()), sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    logger.info("scan finished", extra={"kinds": dict(kinds)})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_scan_arguments(parser)
+    parser.add_argument("--sk-prefix", help="only items whose sort key starts with this")
+    parser.add_argument("--count", action="store_true", help="print item counts per kind instead of items")
+    args = parser.parse_args()
+    setup_logging(stream=sys.stderr)
+    try:
+        asyncio.run(main(args))
+    finally:
+        shutdown_logging()
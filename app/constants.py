@@ -1,6 +1,104 @@
 TABLE = "parking-management-test"
+ACTIVE_PARKINGS_INDEX = "ActiveParkingsByBuilding"
 SLOT_LAYOUT = '000000000000000111111111111111'
 JWT_SECRET = "asdfasasdfasdf"
 JWT_ALGORITHM = "HS256"
+JWT_CACHE_SIZE = 4096
 
-BILL_NOT_GENERATED_MESSAGE = "Bill not generated for the specified month and year."
\ No newline at end of file
+BILL_NOT_GENERATED_MESSAGE = "Bill not generated for the specified month and year."
+
+LOG_LEVEL = "INFO"
+# fraction of the app's DEBUG records kept even though LOG_LEVEL is above DEBUG (0 keeps none);
+# a record can override it with extra={"sample_rate": ...}
+LOG_DEBUG_SAMPLE_RATE = 0.01
+LOG_QUEUE_SIZE = 10000
+
+# event loop monitor: tick interval, what counts as a stall, and how many of the
+# worst stalls (with stacks) are kept over what window
+LOOP_MONITOR_INTERVAL = 0.05
+LOOP_STALL_THRESHOLD = 0.1
+EXECUTOR_PROBE_INTERVAL = 1.0
+LOOP_STALL_WINDOW_SECONDS = 600
+LOOP_STALLS_KEPT = 10
+
+PROFILER_MAX_SECONDS = 60
+PROFILER_DEFAULT_INTERVAL_MS = 5
+
+# also read PARKING#<epoch> items written before month-bucketed history keys;
+# turn off once app.cli.migrate_parking_history has run to completion
+PARKING_HISTORY_LEGACY_READS = True
+
+# build models read from the table without pydantic validation (see app.utils.trusted_model);
+# turn off to validate every item in full
+TRUSTED_REPOSITORY_READS = True
+
+PARKINGS_PAGE_SIZE = 50
+PARKINGS_MAX_PAGE_SIZE = 500
+# pages read by the NDJSON stream of GET /parkings; only one page is held at a time
+PARKINGS_STREAM_PAGE_SIZE = 100
+
+ACTIVE_PARKINGS_PAGE_SIZE = 50
+ACTIVE_PARKINGS_MAX_PAGE_SIZE = 500
+
+PLATE_SEARCH_LIMIT = 20
+PLATE_SEARCH_MAX_LIMIT = 100
+
+# longest date range one utilization request may cover
+UTILIZATION_MAX_DAYS = 92
+
+# responses smaller than this are not compressed
+COMPRESSION_MIN_SIZE = 1024
+COMPRESSION_GZIP_LEVEL = 6
+COMPRESSION_BROTLI_QUALITY = 5
+# total size of compressed bodies kept per worker for ETagged responses
+COMPRESSION_CACHE_BYTES = 16 * 1024 * 1024
+
+# per-caller token bucket: sustained requests per second and burst size
+RATE_LIMIT_PER_SECOND = 50
+RATE_LIMIT_BURST = 100
+RATE_LIMIT_MAX_CALLERS = 100_000
+# requests in flight per worker, by route class (see app.utils.admission.route_class)
+ADMISSION_CONCURRENCY_LIMITS = {"read": 256, "write": 128, "admin": 16}
+ADMISSION_EXEMPT_PATHS = frozenset({"/health", "/metrics", "/docs", "/redoc", "/openapi.json"})
+
+# DynamoDB circuit breaker (see app.repository.circuit_breaker): it opens when, over the
+# window and at least BREAKER_MIN_CALLS calls, the failed or slow fraction reaches its rate
+BREAKER_WINDOW_SECONDS = 30
+BREAKER_MIN_CALLS = 20
+BREAKER_ERROR_RATE = 0.5
+BREAKER_SLOW_CALL_SECONDS = 2.0
+BREAKER_SLOW_CALL_RATE = 0.8
+BREAKER_OPEN_SECONDS = 10
+# probes let through when half-open; this many successes in a row close the breaker
+BREAKER_HALF_OPEN_PROBES = 3
+# how old a last good read may be and still be served while DynamoDB is unavailable
+STALE_READ_MAX_AGE_SECONDS = 600
+STALE_READ_MAX_ENTRIES = 1024
+
+# request deadlines (see app.utils.deadline): clients may ask for a shorter or longer
+# one, up to the max, with the header; routes that legitimately run long get their own default
+REQUEST_DEADLINE_HEADER = "X-Request-Timeout"
+REQUEST_DEADLINE_SECONDS = 10
+REQUEST_DEADLINE_MAX_SECONDS = 60
+REQUEST_DEADLINE_ROUTE_SECONDS = {"/admin/profile": PROFILER_MAX_SECONDS + 5}
+# a retry is not started with less time than this left
+DEADLINE_MIN_ATTEMPT_SECONDS = 0.05
+# per-attempt limits of the DynamoDB client, attempts including the first
+DYNAMODB_CONNECT_TIMEOUT = 1
+DYNAMODB_READ_TIMEOUT = 3
+DYNAMODB_MAX_ATTEMPTS = 3
+# BatchGetItem requests for keys DynamoDB left unprocessed, first one included;
+# the wait between them doubles from the base up to the cap, with full jitter
+BATCH_GET_MAX_ATTEMPTS = 8
+BATCH_GET_BACKOFF_BASE_SECONDS = 0.05
+BATCH_GET_BACKOFF_MAX_SECONDS = 2.0
+
+# hedged GetItem on hot lookups (see app.repository.hedging); off unless turned on here
+HEDGED_READS = False
+HEDGE_PERCENTILE = 95
+HEDGE_SAMPLE_WINDOW = 1000
+HEDGE_MIN_SAMPLES = 50
+HEDGE_MIN_DELAY_SECONDS = 0.002
+# extra reads hedging may add, as a fraction of hedged-method calls, and how many may be saved up
+HEDGE_MAX_RATE = 0.05
+HEDGE_BUDGET_BURST = 10
@@ -0,0 +1,29 @@
+from app.constants import ACTIVE_PARKINGS_INDEX, TABLE
+
+# The single application table, as passed to create_table. Production tables are
+# provisioned outside this repo and must carry the same indexes.
+TABLE_DEFINITION = {
+    "TableName": TABLE,
+    "KeySchema": [
+        {"AttributeName": "PK", "KeyType": "HASH"},
+        {"AttributeName": "SK", "KeyType": "RANGE"},
+    ],
+    "AttributeDefinitions": [
+        {"AttributeName": "PK", "AttributeType": "S"},
+        {"AttributeName": "SK", "AttributeType": "S"},
+        {"AttributeName": "ActiveBuildingId", "AttributeType": "S"},
+        {"AttributeName": "ActiveSince", "AttributeType": "N"},
+    ],
+    "GlobalSecondaryIndexes": [
+        {
+            # sparse: only open parking sessions carry ActiveBuildingId
+            "IndexName": ACTIVE_PARKINGS_INDEX,
+            "KeySchema": [
+                {"AttributeName": "ActiveBuildingId", "KeyType": "HASH"},
+                {"AttributeName": "ActiveSince", "KeyType": "RANGE"},
+            ],
+            "Projection": {"ProjectionType": "ALL"},
+        },
+    ],
+    "BillingMode": "PAY_PER_REQUEST",
+}
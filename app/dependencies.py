@@ -1,5 +1,5 @@
+import logging
 from app.models.roles import Roles
-import jwt
 from contextlib import asynccontextmanager
 from typing import Annotated
 
@@ -11,20 +11,44 @@ import boto3
 
 from fastapi import FastAPI, Request
 
-from app.dto.login import UserJWT
 from app.errors.web_exception import WebException, UNAUTHORIZED_ERROR
+from app.log import setup_logging, shutdown_logging
+from app.metrics.capacity import install_capacity_accounting
+from app.metrics.dynamodb import install_dynamodb_metrics
+from app.repository.circuit_breaker import install_circuit_breaker
+from app.metrics.loop_monitor import LoopMonitor
+from app.utils.deadline import dynamodb_config, install_deadline_hooks
+from app.utils.jwt_utils import decode_user_jwt
+
+logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    setup_logging()
+    loop_monitor = LoopMonitor()
+    loop_monitor.start()
+    app.state.loop_monitor = loop_monitor
     try:
         db: DynamoDBServiceResource = boto3.resource(
-            "dynamodb", region_name="ap-south-1"
+            "dynamodb", region_name="ap-south-1", config=dynamodb_config()
         )
+        install_dynamodb_hooks(db.meta.client)
         app.state.db = db
         yield
-    except Exception as e:
-        print(f"Error connecting to DynamoDB: {e}")
+    except Exception:
+        logger.exception("error connecting to DynamoDB")
+    finally:
+        await loop_monitor.stop()
+        shutdown_logging()
+
+
+def install_dynamodb_hooks(client):
+    install_dynamodb_metrics(client)
+    install_capacity_accounting(client)
+    # before the breaker, so a call refused for its deadline never takes a half-open probe
+    install_deadline_hooks(client)
+    install_circuit_breaker(client)
 
 
 def get_db(req: Request) -> DynamoDBServiceResource:
@@ -36,17 +60,12 @@ bearer_security = HTTPBearer(scheme_name="Bearer")
 
 
 def get_user(allowed_roles: list[Roles]):
-    def get_auth_user(
+    async def get_auth_user(
         token: Annotated[HTTPAuthorizationCredentials, Depends(bearer_security)],
     ):
         try:
-            decoded_token = jwt.decode(
-                jwt=token.credentials,
-                verify=True,
-                key="asdfasasdfasdf",
-                algorithms=["HS256"],
-            )
-            user = UserJWT(**decoded_token)
+            # verified tokens are cached until their exp; the role check below stays per-route
+            user = decode_user_jwt(token.credentials)
 
             if user.role not in allowed_roles:
                 raise WebException(
@@ -58,7 +77,7 @@ def get_user(allowed_roles: list[Roles]):
         except WebException:
             raise
         except Exception as exc:
-            print(exc)
+            logger.debug("JWT rejected", extra={"reason": str(exc)})
             raise WebException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 error_code=UNAUTHORIZED_ERROR,
@@ -1,7 +1,15 @@
 from datetime import datetime, timezone
+from typing import overload
+
 from pydantic import BaseModel, Field
 
 
+@overload
+def _ts_to_iso(ts: int) -> str: ...
+@overload
+def _ts_to_iso(ts: None) -> None: ...
+@overload
+def _ts_to_iso(ts: int | None) -> str | None: ...
 def _ts_to_iso(ts: int | None) -> str | None:
     if ts is None:
         return None
@@ -36,3 +44,30 @@ class ParkingHistoryResponseDTO(BaseModel):
             EndTime=_ts_to_iso(end_time),
             VehicleType=vehicle_type,
         )
+
+
+class ActiveParkingResponseDTO(BaseModel):
+    ticket_id: str = Field(alias="TicketId")
+    user_id: str = Field(alias="UserId")
+    number_plate: str = Field(alias="NumberPlate")
+    floor_number: int = Field(alias="FloorNumber")
+    slot_number: int = Field(alias="SlotNumber")
+    start_time: str = Field(alias="StartTime")
+    vehicle_type: str = Field(alias="VehicleType")
+
+    @classmethod
+    def from_model(cls, *, ticket_id: str, user_id: str, number_plate: str, floor_number: int, slot_number: int, start_time: int, vehicle_type: str):
+        return cls(
+            TicketId=ticket_id,
+            UserId=user_id,
+            NumberPlate=number_plate,
+            FloorNumber=floor_number,
+            SlotNumber=slot_number,
+            StartTime=_ts_to_iso(start_time),
+            VehicleType=vehicle_type,
+        )
+
+
+class ActiveParkingsPageDTO(BaseModel):
+    items: list[ActiveParkingResponseDTO] = Field(alias="Items")
+    next_cursor: str | None = Field(alias="NextCursor")
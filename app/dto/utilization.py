@@ -0,0 +1,18 @@
+from pydantic import BaseModel, Field
+
+
+class FloorHeatmapDTO(BaseModel):
+    floor_number: int = Field(alias="FloorNumber")
+    capacity: int = Field(alias="Capacity")
+    days: list[str] = Field(alias="Days")
+    # one row per day, one column per UTC hour
+    occupancy: list[list[float]] = Field(alias="Occupancy")
+    utilization: list[list[float]] = Field(alias="Utilization")
+    arrivals: list[list[int]] = Field(alias="Arrivals")
+
+
+class UtilizationResponseDTO(BaseModel):
+    building_id: str = Field(alias="BuildingId")
+    start: str = Field(alias="Start")
+    end: str = Field(alias="End")
+    floors: list[FloorHeatmapDTO] = Field(alias="Floors")
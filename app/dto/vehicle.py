@@ -13,4 +13,9 @@ class VehicleResponseDTO(BaseModel):
 
 class AddVehicleRequestDTO(BaseModel):
     number_plate: str = Field(alias="numberplate")
-    vehicle_type: int = Field(alias="type")
\ No newline at end of file
+    vehicle_type: int = Field(alias="type")
+
+class PlateSearchResultDTO(BaseModel):
+    number_plate: str
+    vehicle_type: str
+    user_id: str
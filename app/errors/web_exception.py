@@ -3,6 +3,10 @@ VALIDATION_ERROR = 1002
 UNEXPECTED_ERROR = 1003
 UNAUTHORIZED_ERROR = 1004
 CONFLICT_ERROR = 1005
+RATE_LIMITED_ERROR = 1006
+OVERLOADED_ERROR = 1007
+UNAVAILABLE_ERROR = 1008
+DEADLINE_ERROR = 1009
 
 class WebException(Exception):
     def __init__(self, status_code: int, message: str, error_code: int ):
@@ -0,0 +1,136 @@
+"""
+Structured, non-blocking logging.
+
+Request handlers only put records on an in-memory queue; a QueueListener thread
+formats them as one JSON object per line and does the actual write, so a slow
+stdout or log shipper never stalls the event loop. The app's DEBUG records are
+sampled before they are queued whatever the root level, and a full queue drops
+records instead of blocking.
+
+Modules log through the standard library as usual::
+
+    logger = logging.getLogger(__name__)
+    logger.warning("parking transaction cancelled", extra={"reasons": reasons})
+
+Keys passed in ``extra`` become top-level JSON fields.
+"""
+import copy
+import datetime
+import json
+import logging
+import queue
+import random
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import TextIO
+
+from app.constants import LOG_DEBUG_SAMPLE_RATE, LOG_LEVEL, LOG_QUEUE_SIZE
+
+# attributes every LogRecord has; anything else on a record came from ``extra``
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "taskName"}
+
+# logger whose DEBUG records are sampled rather than cut off by the root level
+_APP_LOGGER = "app"
+
+# records dropped because the queue was full, and DEBUG records sampled out
+log_stats = {"dropped": 0, "sampled_out": 0}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.datetime.fromtimestamp(record.created, tz=datetime.timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and key != "sample_rate":
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Keep only a fraction of DEBUG records; a record's ``sample_rate`` extra overrides the default."""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG:
+            return True
+        if random.random() < getattr(record, "sample_rate", self.rate):
+            return True
+        log_stats["sampled_out"] += 1
+        return False
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # resolve the message and traceback on the calling thread, but leave the
+        # JSON formatting (and the extra fields it reads) to the listener; other
+        # handlers on the logger still see the original record
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            log_stats["dropped"] += 1
+
+
+_listener: QueueListener | None = None
+
+
+def setup_logging(
+    level: str = LOG_LEVEL,
+    stream: TextIO | None = None,
+    debug_sample_rate: float = LOG_DEBUG_SAMPLE_RATE,
+) -> QueueListener:
+    """Route the root logger through the queue and start the writer thread. Idempotent."""
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(JsonFormatter())
+
+    records: queue.Queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    handler = NonBlockingQueueHandler(records)
+    handler.addFilter(SamplingFilter(debug_sample_rate))
+
+    root = logging.getLogger()
+    root.addHandler(handler)
+    root.setLevel(level)
+    if debug_sample_rate > 0:
+        # the app's DEBUG records must get past the level check to reach the sampling
+        # filter; libraries (botocore logs every request at DEBUG) stay at ``level``
+        logging.getLogger(_APP_LOGGER).setLevel(logging.DEBUG)
+
+    _listener = QueueListener(records, output, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def shutdown_logging():
+    """Flush queued records and stop the writer thread."""
+    global _listener
+    if _listener is None:
+        return
+    root = logging.getLogger()
+    for handler in [h for h in root.handlers if isinstance(h, NonBlockingQueueHandler)]:
+        root.removeHandler(handler)
+    logging.getLogger(_APP_LOGGER).setLevel(logging.NOTSET)
+    _listener.stop()
+    _listener = None
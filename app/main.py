@@ -1,7 +1,9 @@
+import logging
+import math
 from fastapi import FastAPI, HTTPException, Request
 from fastapi import status
 from fastapi.exceptions import ValidationException
-from fastapi.responses import JSONResponse
+from app.utils.serialization import ORJSONResponse
 
 from app.routers import (
     auth_router,
@@ -10,25 +12,42 @@ from app.routers import (
     office_router,
     parking_router,
     billing_router,
+    metrics_router,
+    admin_router,
 )
 from app.dependencies import lifespan
-from app.errors.web_exception import VALIDATION_ERROR, WebException, UNEXPECTED_ERROR
+from app.errors.web_exception import UNAVAILABLE_ERROR, VALIDATION_ERROR, WebException, UNEXPECTED_ERROR
 from fastapi.middleware.cors import CORSMiddleware
+from app.metrics.middleware import MetricsMiddleware
+from app.repository.batch import UnprocessedKeysError
+from app.repository.circuit_breaker import CircuitOpenError, StaleReadMiddleware
+from app.utils.admission import AdmissionMiddleware
+from app.utils.compression import CompressionMiddleware
+from app.utils.deadline import DeadlineMiddleware
 
-app = FastAPI(lifespan=lifespan)
+logger = logging.getLogger(__name__)
 
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
+
+app.add_middleware(StaleReadMiddleware)
+app.add_middleware(DeadlineMiddleware)
+# inside CORS, so rejections still get CORS headers, and counted by MetricsMiddleware
+app.add_middleware(AdmissionMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["https://1337park.kaushiksaha.me"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Retry-After", "X-Stale-Read"],
 )
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 
 @app.exception_handler(HTTPException)
 def http_exception_handler(request: Request, exc: HTTPException):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={"message": exc.detail, "code": UNEXPECTED_ERROR},
     )
@@ -36,7 +55,7 @@ def http_exception_handler(request: Request, exc: HTTPException):
 
 # @app.exception_handler(Exception)
 # def exception_handler(request: Request, exc: Exception):
-#     return JSONResponse(
+#     return ORJSONResponse(
 #         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
 #         content={"message": "Internal Server Error", "code": UNEXPECTED_ERROR},
 #     )
@@ -44,16 +63,35 @@ def http_exception_handler(request: Request, exc: HTTPException):
 
 @app.exception_handler(WebException)
 def web_exception_handler(request: Request, exc: WebException):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={"message": exc.message, "code": exc.error_code},
     )
 
 
+@app.exception_handler(CircuitOpenError)
+def circuit_open_handler(request: Request, exc: CircuitOpenError):
+    return ORJSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"message": "Database is temporarily unavailable", "code": UNAVAILABLE_ERROR},
+        headers={"Retry-After": str(max(1, math.ceil(exc.retry_after)))},
+    )
+
+
+@app.exception_handler(UnprocessedKeysError)
+def unprocessed_keys_handler(request: Request, exc: UnprocessedKeysError):
+    logger.warning("batch read still throttled after retries", extra={"path": request.url.path, "keys": exc.remaining})
+    return ORJSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"message": "Database is temporarily unavailable", "code": UNAVAILABLE_ERROR},
+        headers={"Retry-After": "1"},
+    )
+
+
 @app.exception_handler(ValidationException)
 def validation_exception_handler(request: Request, exc: ValidationException):
-    print(exc.errors())
-    return JSONResponse(
+    logger.info("request validation failed", extra={"path": request.url.path, "errors": exc.errors()})
+    return ORJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content={"message": str(exc), "code": VALIDATION_ERROR},
     )
@@ -65,6 +103,8 @@ app.include_router(building_router.router, prefix="/buildings", tags=["buildings
 app.include_router(office_router.router, prefix="/offices", tags=["offices"])
 app.include_router(parking_router.router, prefix="/parkings", tags=["parkings"])
 app.include_router(billing_router.router)
+app.include_router(admin_router.router, prefix="/admin", tags=["admin"])
+app.include_router(metrics_router.router)
 
 
 @app.get("/health", tags=["health"])
@@ -0,0 +1,154 @@
+"""
+Per-worker metrics in the Prometheus text format, served from /metrics.
+
+Each uvicorn worker keeps its own registry; recording is lock-free (see
+registry._Sharded), so instrumenting hot paths costs a dict update.
+"""
+import asyncio
+
+from app.log import log_stats
+from app.metrics.registry import Counter, Gauge, Histogram, Registry
+from app.utils.jwt_utils import token_cache
+from app.utils.single_flight import single_flight_stats
+
+registry = Registry()
+
+http_request_duration = registry.register(Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template, method and status.",
+    ("method", "route", "status"),
+))
+
+repository_call_duration = registry.register(Histogram(
+    "repository_call_duration_seconds",
+    "Latency of repository methods, including every DynamoDB call they make.",
+    ("method", "outcome"),
+))
+
+dynamodb_call_duration = registry.register(Histogram(
+    "dynamodb_call_duration_seconds",
+    "Latency of individual DynamoDB API calls, retries included.",
+    ("operation",),
+))
+
+dynamodb_calls = registry.register(Counter(
+    "dynamodb_calls_total",
+    "DynamoDB API calls by operation and result.",
+    ("operation", "result"),
+))
+
+transaction_cancellations = registry.register(Counter(
+    "dynamodb_transaction_cancellations_total",
+    "Cancelled TransactWriteItems calls by cancellation reason code.",
+    ("reason",),
+))
+
+consumed_capacity = registry.register(Counter(
+    "dynamodb_consumed_capacity_units_total",
+    "Capacity units reported by DynamoDB, by operation, table or index, and read/write.",
+    ("operation", "table", "kind"),
+))
+
+route_consumed_capacity = registry.register(Counter(
+    "http_consumed_capacity_units_total",
+    "DynamoDB capacity units consumed per route template, summed over requests.",
+    ("method", "route", "kind"),
+))
+
+event_loop_lag = registry.register(Histogram(
+    "event_loop_lag_seconds",
+    "How late the event loop ran a timer callback, sampled by the loop monitor.",
+))
+
+executor_queue_wait = registry.register(Histogram(
+    "executor_queue_wait_seconds",
+    "Time a probe job waited in the default executor queue before a worker picked it up.",
+))
+
+event_loop_stalls = registry.register(Counter(
+    "event_loop_stalls_total",
+    "Event loop stalls longer than the monitor's stall threshold.",
+))
+
+compressed_responses = registry.register(Counter(
+    "http_compressed_responses_total",
+    "Compressed responses by encoding and source: compressed, stream, or cache (a precompressed body).",
+    ("encoding", "source"),
+))
+
+admission_rejections = registry.register(Counter(
+    "http_admission_rejections_total",
+    "Requests turned away before routing, by route class and reason (rate_limited or overloaded).",
+    ("route_class", "reason"),
+))
+
+circuit_breaker_transitions = registry.register(Counter(
+    "dynamodb_circuit_breaker_transitions_total",
+    "DynamoDB circuit breaker state changes, by the state entered.",
+    ("state",),
+))
+
+deadline_exceeded = registry.register(Counter(
+    "request_deadline_exceeded_total",
+    "Work stopped because the request deadline passed, by where: request, before-call, before-send or retry.",
+    ("stage",),
+))
+
+hedged_reads = registry.register(Counter(
+    "dynamodb_hedged_reads_total",
+    "Hedged reads by method and result: hedged (duplicate sent), hedge_won, or budget_exhausted.",
+    ("method", "result"),
+))
+
+stale_reads = registry.register(Counter(
+    "dynamodb_stale_reads_total",
+    "Repository reads answered with their last good result while DynamoDB was unavailable.",
+    ("method",),
+))
+
+
+def _executor_stats() -> dict[tuple, float]:
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return {}
+    executor = getattr(loop, "_default_executor", None)
+    if executor is None:
+        return {("queued",): 0, ("threads",): 0}
+    return {
+        ("queued",): executor._work_queue.qsize(),
+        ("threads",): len(executor._threads),
+    }
+
+
+registry.register(Gauge(
+    "executor_work_items",
+    "Default executor (asyncio.to_thread) queue depth and thread count.",
+    ("state",),
+    _executor_stats,
+))
+
+registry.register(Gauge(
+    "single_flight_calls",
+    "Calls to single-flight repository methods, and how many were coalesced.",
+    ("method", "kind"),
+    lambda: {
+        (method, kind): value
+        for method, stats in single_flight_stats().items()
+        for kind, value in stats.items()
+    },
+))
+
+registry.register(Gauge(
+    "jwt_cache_lookups",
+    "JWT verification cache hits and misses.",
+    ("result",),
+    lambda: {("hit",): token_cache.hits, ("miss",): token_cache.misses},
+))
+
+registry.register(Gauge(
+    "log_records_discarded",
+    "Log records dropped because the queue was full, or DEBUG records sampled out.",
+    ("reason",),
+    lambda: {(reason,): value for reason, value in log_stats.items()},
+))
@@ -0,0 +1,76 @@
+from contextvars import ContextVar
+
+from app.metrics import consumed_capacity
+
+READ_OPERATIONS = frozenset({"GetItem", "BatchGetItem", "Query", "Scan", "TransactGetItems"})
+WRITE_OPERATIONS = frozenset({
+    "PutItem",
+    "UpdateItem",
+    "DeleteItem",
+    "BatchWriteItem",
+    "TransactWriteItems",
+})
+
+
+class CapacityTally:
+    """Consumed capacity of one HTTP request; appended to from to_thread workers, summed once at the end."""
+
+    def __init__(self):
+        self.entries: list[tuple[str, float]] = []
+
+    def add(self, kind: str, units: float):
+        # list.append is atomic, so concurrent DynamoDB calls of one request need no lock
+        self.entries.append((kind, units))
+
+    def totals(self) -> tuple[float, float]:
+        read = sum(u for k, u in self.entries if k == "read")
+        write = sum(u for k, u in self.entries if k == "write")
+        return read, write
+
+
+request_capacity: ContextVar[CapacityTally | None] = ContextVar("request_capacity", default=None)
+
+
+def _request_consumed_capacity(params, model, **kwargs):
+    if model.name in READ_OPERATIONS or model.name in WRITE_OPERATIONS:
+        params.setdefault("ReturnConsumedCapacity", "INDEXES")
+
+
+def _record_consumed_capacity(parsed, model, **kwargs):
+    capacity = parsed.get("ConsumedCapacity")
+    if not capacity:
+        return
+
+    kind = "read" if model.name in READ_OPERATIONS else "write"
+    tally = request_capacity.get()
+    for entry in capacity if isinstance(capacity, list) else [capacity]:
+        units = float(entry.get("CapacityUnits", 0))
+        if tally is not None:
+            tally.add(kind, units)
+
+        table = entry.get("TableName", "")
+        consumed_capacity.inc(model.name, table, kind, amount=float(entry.get("Table", {}).get("CapacityUnits", units)))
+        for index_type in ("GlobalSecondaryIndexes", "LocalSecondaryIndexes"):
+            for index, index_capacity in (entry.get(index_type) or {}).items():
+                consumed_capacity.inc(
+                    model.name, f"{table}/{index}", kind, amount=float(index_capacity.get("CapacityUnits", 0))
+                )
+
+
+def install_capacity_accounting(client):
+    """Ask DynamoDB for consumed capacity on every call and attribute it to the current request."""
+    events = client.meta.events
+    # before-parameter-build sees the params actually sent; boto3's resource layer swaps in
+    # a copy during provide-client-params, so changes made there would be dropped
+    events.register(
+        "before-parameter-build.dynamodb", _request_consumed_capacity, unique_id="capacity-parameter-build"
+    )
+    events.register("after-call.dynamodb", _record_consumed_capacity, unique_id="capacity-after-call")
+
+
+def capacity_headers(tally: CapacityTally) -> list[tuple[bytes, bytes]]:
+    read, write = tally.totals()
+    return [
+        (b"x-consumed-capacity", f"read={read:g}, write={write:g}, total={read + write:g}".encode("latin-1")),
+        (b"server-timing", f'ddb-rcu;desc="DynamoDB RCU";dur={read:g}, ddb-wcu;desc="DynamoDB WCU";dur={write:g}'.encode("latin-1")),
+    ]
@@ -0,0 +1,68 @@
+import inspect
+import time
+from functools import wraps
+
+from app.metrics import (
+    dynamodb_call_duration,
+    dynamodb_calls,
+    repository_call_duration,
+    transaction_cancellations,
+)
+
+_START = "metrics_start"
+
+
+def _before_call(model, context, **kwargs):
+    context[_START] = time.perf_counter()
+
+
+def _after_call(http_response, parsed, model, context, **kwargs):
+    operation = model.name
+    start = context.get(_START)
+    if start is not None:
+        dynamodb_call_duration.observe(time.perf_counter() - start, operation)
+
+    if http_response.status_code < 300:
+        dynamodb_calls.inc(operation, "ok")
+        return
+
+    error = parsed.get("Error", {}).get("Code", "Unknown")
+    dynamodb_calls.inc(operation, error)
+    for reason in parsed.get("CancellationReasons") or []:
+        transaction_cancellations.inc(reason.get("Code") or "None")
+
+
+def _after_call_error(context, exception, event_name, **kwargs):
+    dynamodb_calls.inc(event_name.rsplit(".", 1)[-1], type(exception).__name__)
+
+
+def install_dynamodb_metrics(client):
+    """Hook botocore's call events on the shared client so every DynamoDB call is timed and counted."""
+    events = client.meta.events
+    events.register("before-call.dynamodb", _before_call, unique_id="metrics-before-call")
+    events.register("after-call.dynamodb", _after_call, unique_id="metrics-after-call")
+    events.register("after-call-error.dynamodb", _after_call_error, unique_id="metrics-after-call-error")
+
+
+def instrument_repository(cls):
+    """Time every public async method of a repository class under ``<Class>.<method>``."""
+    for name, fn in list(vars(cls).items()):
+        if name.startswith("_") or not inspect.iscoroutinefunction(fn):
+            continue
+        setattr(cls, name, _timed(f"{cls.__name__}.{name}", fn))
+    return cls
+
+
+def _timed(label: str, fn):
+    @wraps(fn)
+    async def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            result = await fn(*args, **kwargs)
+            outcome = "ok"
+            return result
+        finally:
+            repository_call_duration.observe(time.perf_counter() - start, label, outcome)
+
+    return wrapper
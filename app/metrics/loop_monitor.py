@@ -0,0 +1,155 @@
+import asyncio
+import datetime
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass, field
+
+from app.constants import (
+    EXECUTOR_PROBE_INTERVAL,
+    LOOP_MONITOR_INTERVAL,
+    LOOP_STALL_THRESHOLD,
+    LOOP_STALL_WINDOW_SECONDS,
+    LOOP_STALLS_KEPT,
+)
+from app.metrics import event_loop_lag, event_loop_stalls, executor_queue_wait
+
+
+@dataclass
+class Stall:
+    at: float
+    duration: float
+    stack: list[str] = field(default_factory=list)
+
+    def as_dict(self) -> dict:
+        return {
+            "at": datetime.datetime.fromtimestamp(self.at, tz=datetime.timezone.utc).isoformat(),
+            "duration_ms": round(self.duration * 1000, 3),
+            "stack": self.stack,
+        }
+
+
+class LoopMonitor:
+    """
+    Watch one worker's event loop for stalls and its default executor for queueing.
+
+    A task on the loop sleeps for ``interval`` and records how late it woke up. A
+    watchdog thread checks that task's heartbeat; once the loop is a full
+    ``stall_threshold`` behind, it captures the loop thread's stack, which is the
+    code that is blocking it. A second task submits a no-op to the default executor
+    every ``probe_interval`` and records how long it queued behind to_thread work.
+
+    The worst ``kept`` stalls of the last ``window_seconds`` are kept with their stacks.
+    """
+
+    def __init__(
+        self,
+        interval: float = LOOP_MONITOR_INTERVAL,
+        stall_threshold: float = LOOP_STALL_THRESHOLD,
+        probe_interval: float = EXECUTOR_PROBE_INTERVAL,
+        window_seconds: float = LOOP_STALL_WINDOW_SECONDS,
+        kept: int = LOOP_STALLS_KEPT,
+    ):
+        self.interval = interval
+        self.stall_threshold = stall_threshold
+        self.probe_interval = probe_interval
+        self.window_seconds = window_seconds
+        self.kept = kept
+
+        self.stalls: list[Stall] = []
+        self.recent_lag: deque[float] = deque(maxlen=200)
+        self.recent_executor_wait: deque[float] = deque(maxlen=60)
+
+        self._heartbeat = time.perf_counter()
+        self._pending_stack: list[str] | None = None
+        self._loop_thread_id: int | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._watchdog: threading.Thread | None = None
+        self._stopping = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self):
+        if self.running:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.perf_counter()
+        self._stopping.clear()
+        self._tasks = [
+            asyncio.create_task(self._tick(), name="loop-monitor"),
+            asyncio.create_task(self._probe_executor(), name="executor-probe"),
+        ]
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self):
+        self._stopping.set()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._watchdog is not None:
+            self._watchdog.join()
+            self._watchdog = None
+
+    async def _tick(self):
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.perf_counter()
+            self._heartbeat = now
+
+            lag = max(0.0, now - expected)
+            event_loop_lag.observe(lag)
+            self.recent_lag.append(lag)
+            if lag >= self.stall_threshold:
+                self.record_stall(lag)
+            else:
+                self._pending_stack = None
+
+    async def _probe_executor(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.probe_interval)
+            submitted = time.perf_counter()
+            started = await loop.run_in_executor(None, time.perf_counter)
+            wait = max(0.0, started - submitted)
+            executor_queue_wait.observe(wait)
+            self.recent_executor_wait.append(wait)
+
+    def _watch(self):
+        while not self._stopping.wait(self.interval):
+            # the tick task is normally up to one interval behind; anything past that is the loop stalling
+            behind = time.perf_counter() - self._heartbeat - self.interval
+            # None until start() has recorded the loop thread
+            thread_id = self._loop_thread_id
+            if thread_id is not None and behind >= self.stall_threshold and self._pending_stack is None:
+                frame = sys._current_frames().get(thread_id)
+                if frame is not None:
+                    self._pending_stack = [line.rstrip() for line in traceback.format_stack(frame)]
+
+    def record_stall(self, duration: float, stack: list[str] | None = None):
+        event_loop_stalls.inc()
+        stall = Stall(at=time.time(), duration=duration, stack=stack or self._pending_stack or [])
+        self._pending_stack = None
+
+        cutoff = stall.at - self.window_seconds
+        stalls = [s for s in self.stalls if s.at >= cutoff]
+        stalls.append(stall)
+        stalls.sort(key=lambda s: s.duration, reverse=True)
+        self.stalls = stalls[:self.kept]
+
+    def snapshot(self) -> dict:
+        cutoff = time.time() - self.window_seconds
+        return {
+            "running": self.running,
+            "interval_ms": self.interval * 1000,
+            "stall_threshold_ms": self.stall_threshold * 1000,
+            "max_recent_lag_ms": round(max(self.recent_lag, default=0.0) * 1000, 3),
+            "max_recent_executor_wait_ms": round(max(self.recent_executor_wait, default=0.0) * 1000, 3),
+            "worst_stalls": [s.as_dict() for s in self.stalls if s.at >= cutoff],
+        }
@@ -0,0 +1,51 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.metrics import http_request_duration, route_consumed_capacity
+from app.metrics.capacity import CapacityTally, capacity_headers, request_capacity
+
+
+class MetricsMiddleware:
+    """
+    Record request latency per route template (not raw path, to keep label cardinality bounded)
+    and the DynamoDB capacity the request consumed, which is also returned in response headers.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+        tally = CapacityTally()
+        token = request_capacity.set(tally)
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = [*message.get("headers", []), *capacity_headers(tally)]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_capacity.reset(token)
+            route = scope.get("route")
+            route_path = route.path if route is not None else "unmatched"
+            http_request_duration.observe(
+                time.perf_counter() - start,
+                scope["method"],
+                route_path,
+                str(status_code),
+            )
+            read, write = tally.totals()
+            if read:
+                route_consumed_capacity.inc(scope["method"], route_path, "read", amount=read)
+            if write:
+                route_consumed_capacity.inc(scope["method"], route_path, "write", amount=write)
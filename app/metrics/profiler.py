@@ -0,0 +1,79 @@
+import asyncio
+import concurrent.futures
+import sys
+import threading
+import time
+from collections import Counter
+from types import FrameType
+
+from starlette import status
+
+from app.constants import PROFILER_MAX_SECONDS
+from app.errors.web_exception import CONFLICT_ERROR, WebException
+
+_active = threading.Lock()
+
+
+def _collapse(frame: FrameType | None, thread_name: str) -> str:
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{frame.f_globals.get('__name__', '?')}:{code.co_qualname}")
+        frame = frame.f_back
+    names.append(thread_name)
+    return ";".join(reversed(names))
+
+
+def sample_stacks(seconds: float, interval: float, thread_ids: set[int] | None = None) -> Counter[str]:
+    """
+    Sample the Python stacks of this process's threads every ``interval`` for ``seconds``.
+
+    Returns collapsed stacks (``thread;module:func;...``) with sample counts. The
+    sampler's own thread is skipped, and so is anything outside ``thread_ids`` if given.
+    """
+    me = threading.get_ident()
+    samples: Counter[str] = Counter()
+    deadline = time.perf_counter() + seconds
+
+    while time.perf_counter() < deadline:
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == me or (thread_ids is not None and ident not in thread_ids):
+                continue
+            samples[_collapse(frame, names.get(ident, f"thread-{ident}"))] += 1
+        time.sleep(interval)
+
+    return samples
+
+
+def render_collapsed(samples: Counter[str]) -> str:
+    """One ``stack count`` line per stack, the input format of flamegraph.pl and speedscope."""
+    return "".join(f"{stack} {count}\n" for stack, count in samples.most_common())
+
+
+async def profile(seconds: float, interval: float, thread_ids: set[int] | None = None) -> Counter[str]:
+    """
+    Run the sampler on a dedicated thread and wait for it without blocking the loop.
+
+    Nothing is installed while no profile is running: no hooks, no threads. Only one
+    profile runs per worker at a time; a second request gets a 409.
+    """
+    if not _active.acquire(blocking=False):
+        raise WebException(
+            status_code=status.HTTP_409_CONFLICT,
+            message="A profile is already running in this worker",
+            error_code=CONFLICT_ERROR,
+        )
+
+    result: concurrent.futures.Future[Counter[str]] = concurrent.futures.Future()
+
+    def run():
+        try:
+            result.set_result(sample_stacks(min(seconds, PROFILER_MAX_SECONDS), interval, thread_ids))
+        except BaseException as exc:
+            result.set_exception(exc)
+        finally:
+            _active.release()
+
+    threading.Thread(target=run, name="sampling-profiler", daemon=True).start()
+    return await asyncio.wrap_future(result)
@@ -0,0 +1,89 @@
+from array import array
+from typing import Iterable, Iterator
+
+from app.models.slot import OccupantDetails, Slot, SlotType
+from app.utils.trusted_model import from_item
+
+_SLOT_TYPES = list(SlotType)
+_SLOT_TYPE_CODES = {t: code for code, t in enumerate(_SLOT_TYPES)}
+
+
+class FloorGrid:
+    """
+    The slots of one floor, stored by column instead of as one Slot per slot.
+
+    Slot numbers and types are arrays, assigned and occupied are bitsets (bit i
+    is the slot at position i), and occupants are a side table of the few
+    occupied positions. A floor of 30 slots is a handful of objects rather than
+    30 Slots with 30 field dicts, which matters for campus-wide views over
+    hundreds of floors. Slot models are built only when one is needed, e.g. to
+    update it.
+    """
+
+    __slots__ = ("building_id", "floor_number", "slot_ids", "slot_types", "assigned", "occupied", "occupants")
+
+    def __init__(self, building_id: str, floor_number: int):
+        self.building_id = building_id
+        self.floor_number = floor_number
+        self.slot_ids = array("H")
+        self.slot_types = array("B")
+        self.assigned = 0
+        self.occupied = 0
+        self.occupants: dict[int, OccupantDetails] = {}
+
+    @classmethod
+    def from_items(cls, building_id: str, floor_number: int, items: Iterable[dict]) -> "FloorGrid":
+        """A grid from FLOOR#<n>#SLOT#<k> items, kept in the order they are given."""
+        grid = cls(building_id, floor_number)
+        for position, item in enumerate(items):
+            grid.slot_ids.append(int(item["SlotId"]))
+            grid.slot_types.append(_SLOT_TYPE_CODES[SlotType(item["SlotType"])])
+            if item.get("IsAssigned"):
+                grid.assigned |= 1 << position
+            if item.get("IsOccupied"):
+                grid.occupied |= 1 << position
+            if item.get("OccupiedBy"):
+                grid.occupants[position] = from_item(OccupantDetails, item["OccupiedBy"])
+        return grid
+
+    def __len__(self) -> int:
+        return len(self.slot_ids)
+
+    def slot_type(self, position: int) -> SlotType:
+        return _SLOT_TYPES[self.slot_types[position]]
+
+    def is_assigned(self, position: int) -> bool:
+        return bool(self.assigned >> position & 1)
+
+    def is_occupied(self, position: int) -> bool:
+        return bool(self.occupied >> position & 1)
+
+    def free_positions(self) -> Iterator[int]:
+        """Positions of slots not assigned to a vehicle."""
+        free = ~self.assigned & ((1 << len(self)) - 1)
+        while free:
+            lowest = free & -free
+            yield lowest.bit_length() - 1
+            free ^= lowest
+
+    @property
+    def assigned_count(self) -> int:
+        return self.assigned.bit_count()
+
+    @property
+    def occupied_count(self) -> int:
+        return self.occupied.bit_count()
+
+    def slot(self, position: int) -> Slot:
+        return Slot.model_construct(
+            building_id=self.building_id,
+            floor_number=self.floor_number,
+            slot_id=self.slot_ids[position],
+            slot_type=self.slot_type(position),
+            is_assigned=self.is_assigned(position),
+            is_occupied=self.is_occupied(position),
+            occupied_by=self.occupants.get(position),
+        )
+
+    def slots(self) -> list[Slot]:
+        return [self.slot(position) for position in range(len(self))]
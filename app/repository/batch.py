@@ -0,0 +1,67 @@
+import random
+import time
+from typing import Callable, Mapping, cast
+
+from mypy_boto3_dynamodb.service_resource import DynamoDBServiceResource
+from mypy_boto3_dynamodb.type_defs import KeysAndAttributesServiceResourceUnionTypeDef
+
+from app.constants import (
+    BATCH_GET_BACKOFF_BASE_SECONDS,
+    BATCH_GET_BACKOFF_MAX_SECONDS,
+    BATCH_GET_MAX_ATTEMPTS,
+    TABLE,
+)
+
+# BatchGetItem accepts at most 100 keys per request
+BATCH_GET_LIMIT = 100
+
+_RequestItems = Mapping[str, KeysAndAttributesServiceResourceUnionTypeDef]
+
+
+class UnprocessedKeysError(Exception):
+    def __init__(self, remaining: int):
+        super().__init__(f"{remaining} keys still unprocessed after {BATCH_GET_MAX_ATTEMPTS} BatchGetItem attempts")
+        self.remaining = remaining
+
+
+def backoff(attempt: int) -> float:
+    """Seconds to wait before retry ``attempt`` (1 for the first retry): capped exponential, full jitter."""
+    return random.uniform(0, min(BATCH_GET_BACKOFF_MAX_SECONDS, BATCH_GET_BACKOFF_BASE_SECONDS * 2 ** (attempt - 1)))
+
+
+def batch_get(
+    db: DynamoDBServiceResource,
+    keys: list[dict],
+    projection: str | None = None,
+    sleep: Callable[[float], None] = time.sleep,
+) -> list[dict]:
+    """
+    Fetch many items by key, one BatchGetItem per 100 keys.
+
+    Duplicate keys are dropped (DynamoDB rejects them). Unprocessed keys, which
+    DynamoDB returns when it is throttling, are retried with backoff at most
+    BATCH_GET_MAX_ATTEMPTS times before UnprocessedKeysError is raised. Items
+    come back in no particular order.
+    """
+    unique = list({(k["PK"], k["SK"]): k for k in keys}.values())
+    items: list[dict] = []
+
+    for start in range(0, len(unique), BATCH_GET_LIMIT):
+        request: KeysAndAttributesServiceResourceUnionTypeDef = {"Keys": unique[start:start + BATCH_GET_LIMIT]}
+        if projection:
+            request["ProjectionExpression"] = projection
+
+        pending: _RequestItems = {TABLE: request}
+        attempt = 0
+        while pending:
+            if attempt:
+                if attempt >= BATCH_GET_MAX_ATTEMPTS:
+                    raise UnprocessedKeysError(len(pending[TABLE]["Keys"]))
+                # runs on a to_thread worker, so blocking here does not stall the loop
+                sleep(backoff(attempt))
+            attempt += 1
+            response = db.batch_get_item(RequestItems=pending)
+            items.extend(response.get("Responses", {}).get(TABLE, []))
+            pending = cast(_RequestItems, response.get("UnprocessedKeys") or {})
+
+    return items
@@ -7,8 +7,10 @@ from mypy_boto3_dynamodb.service_resource import DynamoDBServiceResource
 from app.constants import TABLE
 from app.dependencies import get_db
 from app.models.bill import Bill
+from app.metrics.dynamodb import instrument_repository
 
 
+@instrument_repository
 class BillingRepository:
     def __init__(
         self,
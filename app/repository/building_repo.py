@@ -8,31 +8,64 @@ from app.dependencies import get_db
 from app.constants import TABLE
 from app.errors.web_exception import WebException, DB_ERROR
 from app.models.building import Building
+from app.repository.batch import batch_get
+from app.repository.version_repo import BUILDINGS_SCOPE, building_scope, version_bump
+from app.utils.single_flight import single_flight
+from app.repository.circuit_breaker import serve_stale
+from app.repository.hedging import hedged
+from app.metrics.dynamodb import instrument_repository
+from app.utils.trusted_model import from_item
 from typing import cast
 from boto3.dynamodb.conditions import Key
+from mypy_boto3_dynamodb.type_defs import TransactWriteItemTypeDef
 
 
+@instrument_repository
 class BuildingRepository:
     def __init__(self, db: DynamoDBServiceResource = Depends(get_db)):
         self.db = db
         self.table = db.Table(TABLE)
 
+    @serve_stale
+    @single_flight
     async def get_building_by_id(self, building_id: str) -> Building:
-        building = await to_thread(
+        building = await hedged(
+            "BuildingRepository.get_building_by_id",
             lambda: self.table.get_item(
                 Key={
                     "PK": "BUILDING",
                     "SK": f"BUILDING#{building_id}"
                 },
                 ProjectionExpression="BuildingId, BuildingName, TotalFloors, TotalSlots, AvailableSlots",
-            ).get("Item")
+            ).get("Item"),
         )
 
         if building is None:
             raise WebException(status_code=status.HTTP_404_NOT_FOUND, message="Building not found", error_code=DB_ERROR)
 
-        return Building(**cast(dict, building))
+        return from_item(Building, cast(dict, building))
 
+    @serve_stale
+    async def get_buildings_by_ids(self, building_ids: list[str]) -> dict[str, Building]:
+        if not building_ids:
+            return {}
+
+        items = await to_thread(
+            lambda: batch_get(
+                self.db,
+                [{"PK": "BUILDING", "SK": f"BUILDING#{building_id}"} for building_id in building_ids],
+                projection="BuildingId, BuildingName, TotalFloors, TotalSlots, AvailableSlots",
+            )
+        )
+
+        buildings = {str(b["BuildingId"]): from_item(Building, cast(dict, b)) for b in items}
+        if any(building_id not in buildings for building_id in building_ids):
+            raise WebException(status_code=status.HTTP_404_NOT_FOUND, message="Building not found", error_code=DB_ERROR)
+
+        return buildings
+
+    @serve_stale
+    @single_flight
     async def get_buildings(self) -> list[Building]:
         buildings = await to_thread(
             lambda: self.table.query(
@@ -41,16 +74,27 @@ class BuildingRepository:
             ).get("Items", [])
         )
 
-        return [Building(**cast(dict, b)) for b in buildings]
+        return [from_item(Building, cast(dict, b)) for b in buildings]
 
     async def add_building(self, building: Building):
-        await to_thread(
-            lambda : self.table.put_item(
-                Item={
+        put_building: TransactWriteItemTypeDef = {
+            "Put": {
+                "TableName": TABLE,
+                "Item": {
                     **building.model_dump(by_alias=True),
                     "PK": "BUILDING",
                     "SK": f"BUILDING#{building.id}",
                 },
-                ConditionExpression="attribute_not_exists(PK) and attribute_not_exists(SK)",
+                "ConditionExpression": "attribute_not_exists(PK) and attribute_not_exists(SK)",
+            }
+        }
+
+        await to_thread(
+            lambda : self.table.meta.client.transact_write_items(
+                TransactItems=[
+                    put_building,
+                    version_bump(BUILDINGS_SCOPE),
+                    version_bump(building_scope(building.id)),
+                ]
             )
         )
\ No newline at end of file
@@ -0,0 +1,291 @@
+"""
+Circuit breaker around DynamoDB, with stale reads while it is open.
+
+The breaker watches every DynamoDB call through botocore's call events, so it
+sees whatever repository issued the call, and measures each call with its
+retries included. It opens when, over the last BREAKER_WINDOW_SECONDS and at
+least BREAKER_MIN_CALLS calls, too many calls failed (throttling, 5xx,
+connection errors) or were slow. While it is open every call fails at once with
+CircuitOpenError instead of sitting in botocore's retry chain on an executor
+thread. After BREAKER_OPEN_SECONDS it lets a few probe calls through
+(half-open): if they succeed it closes, and if one fails it opens again.
+
+Reads decorated with ``@serve_stale`` (buildings, offices, floors and the version
+counters behind their ETags) keep their last good result. When DynamoDB is
+unavailable they return that result instead of failing, and StaleReadMiddleware
+marks the response with X-Stale-Read and drops its ETag so clients do not cache
+it. Everything else, writes included, fails fast: CircuitOpenError is a 503
+with Retry-After.
+"""
+import threading
+import time
+from collections import OrderedDict, deque
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Awaitable, Callable, TypeVar
+
+from botocore.exceptions import BotoCoreError, ClientError
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.constants import (
+    BREAKER_ERROR_RATE,
+    BREAKER_HALF_OPEN_PROBES,
+    BREAKER_MIN_CALLS,
+    BREAKER_OPEN_SECONDS,
+    BREAKER_SLOW_CALL_RATE,
+    BREAKER_SLOW_CALL_SECONDS,
+    BREAKER_WINDOW_SECONDS,
+    STALE_READ_MAX_AGE_SECONDS,
+    STALE_READ_MAX_ENTRIES,
+)
+from app.metrics import circuit_breaker_transitions, stale_reads
+from app.repository.batch import UnprocessedKeysError
+from app.utils.deadline import DeadlineExceeded
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+STALE_HEADER = "X-Stale-Read"
+
+_THROTTLING_ERRORS = {"ProvisionedThroughputExceededException", "ThrottlingException", "RequestLimitExceeded"}
+_START = "breaker_start"
+_PROBE = "breaker_probe"
+
+
+class CircuitOpenError(Exception):
+    def __init__(self, retry_after: float):
+        super().__init__(f"DynamoDB circuit is open; retry in {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Closed, open or half-open, from the failures and slow calls of a rolling window.
+
+    Calls are made from to_thread workers, so all state is behind a lock.
+    """
+
+    def __init__(
+        self,
+        window_seconds: float = BREAKER_WINDOW_SECONDS,
+        min_calls: int = BREAKER_MIN_CALLS,
+        error_rate: float = BREAKER_ERROR_RATE,
+        slow_call_seconds: float = BREAKER_SLOW_CALL_SECONDS,
+        slow_call_rate: float = BREAKER_SLOW_CALL_RATE,
+        open_seconds: float = BREAKER_OPEN_SECONDS,
+        half_open_probes: int = BREAKER_HALF_OPEN_PROBES,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        self.state = CLOSED
+        self._opened_at = 0.0
+        # (time, failed, slow) per finished call
+        self._calls: deque[tuple[float, bool, bool]] = deque()
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+
+    def before_call(self) -> bool:
+        """Admit a call, raising CircuitOpenError if it may not run; True when the call is a half-open probe."""
+        with self._lock:
+            now = self._clock()
+            if self.state == OPEN:
+                remaining = self._opened_at + self.open_seconds - now
+                if remaining > 0:
+                    raise CircuitOpenError(remaining)
+                self._transition(HALF_OPEN)
+
+            if self.state == HALF_OPEN:
+                if self._probes_in_flight >= self.half_open_probes:
+                    raise CircuitOpenError(1.0)
+                self._probes_in_flight += 1
+                return True
+
+            return False
+
+    def record(self, duration: float, failed: bool, probe: bool = False):
+        with self._lock:
+            now = self._clock()
+            if probe:
+                self._probes_in_flight -= 1
+                if self.state != HALF_OPEN:
+                    return
+                if failed or duration >= self.slow_call_seconds:
+                    self._open(now)
+                    return
+                self._probe_successes += 1
+                if self._probe_successes >= self.half_open_probes:
+                    self._transition(CLOSED)
+                return
+
+            if self.state != CLOSED:
+                return
+            self._calls.append((now, failed, duration >= self.slow_call_seconds))
+            cutoff = now - self.window_seconds
+            while self._calls and self._calls[0][0] < cutoff:
+                self._calls.popleft()
+
+            total = len(self._calls)
+            if total < self.min_calls:
+                return
+            failures = sum(1 for _, f, _ in self._calls if f)
+            slow = sum(1 for _, _, s in self._calls if s)
+            if failures / total >= self.error_rate or slow / total >= self.slow_call_rate:
+                self._open(now)
+
+    def release(self, probe: bool):
+        """Forget a call that ended without saying anything about DynamoDB's health."""
+        if probe:
+            with self._lock:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+    def _open(self, now: float):
+        self._opened_at = now
+        self._transition(OPEN)
+
+    def _transition(self, state: str):
+        self.state = state
+        self._calls.clear()
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        circuit_breaker_transitions.inc(state)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "state": self.state,
+                "recent_calls": len(self._calls),
+                "recent_failures": sum(1 for _, f, _ in self._calls if f),
+            }
+
+
+dynamodb_breaker = CircuitBreaker()
+
+
+def _failed(http_response, parsed) -> bool:
+    if http_response.status_code >= 500:
+        return True
+    return parsed.get("Error", {}).get("Code") in _THROTTLING_ERRORS
+
+
+def install_circuit_breaker(client, breaker: CircuitBreaker = dynamodb_breaker):
+    """Route every call of ``client`` through ``breaker``."""
+    def before_call(context, **kwargs):
+        context[_PROBE] = breaker.before_call()
+        context[_START] = time.perf_counter()
+
+    def after_call(http_response, parsed, context, **kwargs):
+        breaker.record(time.perf_counter() - context[_START], _failed(http_response, parsed), context[_PROBE])
+
+    def after_call_error(context, exception, **kwargs):
+        if isinstance(exception, DeadlineExceeded):
+            # the request ran out of time, which may be no fault of DynamoDB's
+            breaker.release(context[_PROBE])
+            return
+        breaker.record(time.perf_counter() - context[_START], True, context[_PROBE])
+
+    events = client.meta.events
+    events.register("before-call.dynamodb", before_call, unique_id="breaker-before-call")
+    events.register("after-call.dynamodb", after_call, unique_id="breaker-after-call")
+    events.register("after-call-error.dynamodb", after_call_error, unique_id="breaker-after-call-error")
+
+
+def is_unavailable(exc: BaseException) -> bool:
+    """Whether ``exc`` means DynamoDB could not answer, as opposed to rejecting the request."""
+    if isinstance(exc, (CircuitOpenError, BotoCoreError, UnprocessedKeysError)):
+        return True
+    if isinstance(exc, ClientError):
+        response = exc.response
+        return (
+            response.get("ResponseMetadata", {}).get("HTTPStatusCode", 0) >= 500
+            or response.get("Error", {}).get("Code") in _THROTTLING_ERRORS
+        )
+    return False
+
+
+# names of the reads a request was served stale, set per request by StaleReadMiddleware
+request_stale_reads: ContextVar[list[str] | None] = ContextVar("request_stale_reads", default=None)
+
+_last_good: OrderedDict[tuple, tuple[float, Any]] = OrderedDict()
+
+
+def serve_stale(fn: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+    """
+    Keep the last good result of a repository read and return it while DynamoDB is unavailable.
+
+    Results are keyed by method name plus arguments, kept for
+    STALE_READ_MAX_AGE_SECONDS, and at most STALE_READ_MAX_ENTRIES per worker. Like
+    single_flight results they are shared, so callers must treat them as read-only.
+    """
+    name = fn.__qualname__
+
+    @wraps(fn)
+    async def wrapper(self, *args: Any, **kwargs: Any) -> T:
+        # list arguments (ids to batch-get) become tuples so they can be part of the key
+        key = (
+            name,
+            tuple(tuple(a) if isinstance(a, list) else a for a in args),
+            frozenset((k, tuple(v) if isinstance(v, list) else v) for k, v in kwargs.items()),
+        )
+        try:
+            result = await fn(self, *args, **kwargs)
+        except Exception as exc:
+            if not is_unavailable(exc):
+                raise
+            saved = _last_good.get(key)
+            if saved is None or time.monotonic() - saved[0] > STALE_READ_MAX_AGE_SECONDS:
+                raise
+            stale_reads.inc(name)
+            marks = request_stale_reads.get()
+            if marks is not None:
+                marks.append(name)
+            return saved[1]
+
+        _last_good[key] = (time.monotonic(), result)
+        _last_good.move_to_end(key)
+        while len(_last_good) > STALE_READ_MAX_ENTRIES:
+            _last_good.popitem(last=False)
+        return result
+
+    return wrapper
+
+
+class StaleReadMiddleware:
+    """Mark responses built from stale reads: X-Stale-Read names the reads, and the ETag is dropped."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        marks: list[str] = []
+        token = request_stale_reads.set(marks)
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start" and marks:
+                headers = MutableHeaders(scope=message)
+                headers[STALE_HEADER] = ", ".join(sorted(set(marks)))
+                # an ETag from a fresh version read must not be cached against stale data
+                del headers["ETag"]
+                headers["Cache-Control"] = "no-store"
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_stale_reads.reset(token)
@@ -4,13 +4,20 @@ from typing import Annotated, cast
 from boto3.dynamodb.conditions import Key
 from fastapi.params import Depends
 from mypy_boto3_dynamodb.service_resource import DynamoDBServiceResource
+from mypy_boto3_dynamodb.type_defs import TransactWriteItemTypeDef
 
 from app.constants import SLOT_LAYOUT
 from app.constants import TABLE
 from app.dependencies import get_db
 from app.models.floor import Floor
 from app.models.slot import Slot, SlotType
+from app.repository.version_repo import BUILDINGS_SCOPE, building_scope, version_bump
+from app.utils.single_flight import single_flight
+from app.repository.circuit_breaker import serve_stale
+from app.metrics.dynamodb import instrument_repository
+from app.utils.trusted_model import from_item
 
+@instrument_repository
 class FloorRepository:
     def __init__(
             self,
@@ -47,29 +54,47 @@ class FloorRepository:
             AvailableSlots=len(SLOT_LAYOUT),
         )
 
-        self.table.put_item(
-            Item={
-                **floor_info.model_dump(by_alias=True),
-                "PK": f"BUILDING#{building_id}",
-                "SK": f"FLOORINFO#{floor_info.floor_number}",
-            },
-            ConditionExpression="attribute_not_exists(PK) and attribute_not_exists(SK)",
-        )
+        put_floor: TransactWriteItemTypeDef = {
+            "Put": {
+                "TableName": TABLE,
+                "Item": {
+                    **floor_info.model_dump(by_alias=True),
+                    "PK": f"BUILDING#{building_id}",
+                    "SK": f"FLOORINFO#{floor_info.floor_number}",
+                },
+                "ConditionExpression": "attribute_not_exists(PK) and attribute_not_exists(SK)",
+            }
+        }
 
-        self.table.meta.client.update_item(
-            TableName=TABLE,
-            Key={
-                "PK": f"BUILDING",
-                "SK": f"BUILDING#{building_id}",
-            },
-            UpdateExpression="SET TotalFloors = TotalFloors + :inc, TotalSlots = TotalSlots + :slots, AvailableSlots = AvailableSlots + :avail",
-            ExpressionAttributeValues={
-                ":inc": 1,
-                ":slots": len(SLOT_LAYOUT),
-                ":avail": len(SLOT_LAYOUT),
+        update_building: TransactWriteItemTypeDef = {
+            "Update": {
+                "TableName": TABLE,
+                "Key": {
+                    "PK": "BUILDING",
+                    "SK": f"BUILDING#{building_id}",
+                },
+                "UpdateExpression": "SET TotalFloors = TotalFloors + :inc, TotalSlots = TotalSlots + :slots, AvailableSlots = AvailableSlots + :avail",
+                "ExpressionAttributeValues": {
+                    ":inc": 1,
+                    ":slots": len(SLOT_LAYOUT),
+                    ":avail": len(SLOT_LAYOUT),
+                },
             }
+        }
+
+        await to_thread(
+            lambda: self.table.meta.client.transact_write_items(
+                TransactItems=[
+                    put_floor,
+                    update_building,
+                    version_bump(BUILDINGS_SCOPE),
+                    version_bump(building_scope(building_id)),
+                ]
+            )
         )
 
+    @serve_stale
+    @single_flight
     async def get_floors(self, building_id: str) -> list[Floor]:
         floors = await to_thread(
             lambda: self.table.query(
@@ -78,9 +103,6 @@ class FloorRepository:
         )
 
         return [
-            Floor(
-                building_id=building_id,
-                **cast(dict, floor),
-            )
+            from_item(Floor, cast(dict, floor), building_id=building_id)
             for floor in floors
         ]
\ No newline at end of file
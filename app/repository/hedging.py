@@ -0,0 +1,158 @@
+"""
+Hedged reads for hot single-item lookups.
+
+    item = await hedged("BuildingRepository.get_building_by_id", lambda: table.get_item(...))
+
+With HEDGED_READS on, the call is started on a worker thread as usual. If it
+has not answered after the method's recent HEDGE_PERCENTILE latency, the same
+call is sent again and whichever answers first is used. The other one is left
+to finish on its thread and its result is dropped. GetItem has no side effects,
+so only idempotent reads may be hedged.
+
+The delay adapts to each method's own latency: it is the percentile of its last
+HEDGE_SAMPLE_WINDOW unhedged calls (no hedging until HEDGE_MIN_SAMPLES have been
+seen). Hedges are paid for from a budget that earns HEDGE_MAX_RATE of a hedge
+per call, up to HEDGE_BUDGET_BURST, so they add at most that fraction of extra
+reads however slow DynamoDB gets.
+"""
+import asyncio
+import time
+from asyncio import to_thread
+from collections import deque
+from typing import Callable, TypeVar
+
+from app.constants import (
+    HEDGE_BUDGET_BURST,
+    HEDGE_MAX_RATE,
+    HEDGE_MIN_DELAY_SECONDS,
+    HEDGE_MIN_SAMPLES,
+    HEDGE_PERCENTILE,
+    HEDGE_SAMPLE_WINDOW,
+    HEDGED_READS,
+)
+from app.metrics import hedged_reads
+
+T = TypeVar("T")
+
+_RECOMPUTE_EVERY = 20
+
+
+class LatencyTracker:
+    """Recent latencies of one method and the hedge delay derived from them."""
+
+    def __init__(
+        self,
+        percentile: float = HEDGE_PERCENTILE,
+        window: int = HEDGE_SAMPLE_WINDOW,
+        min_samples: int = HEDGE_MIN_SAMPLES,
+        min_delay: float = HEDGE_MIN_DELAY_SECONDS,
+    ):
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self._samples: deque[float] = deque(maxlen=window)
+        self._since_recompute = 0
+        self._threshold: float | None = None
+
+    def record(self, seconds: float):
+        self._samples.append(seconds)
+        self._since_recompute += 1
+        # sorting the window on every call would cost more than the hedge saves
+        if self._threshold is None or self._since_recompute >= _RECOMPUTE_EVERY:
+            self._recompute()
+
+    def _recompute(self):
+        self._since_recompute = 0
+        if len(self._samples) < self.min_samples:
+            self._threshold = None
+            return
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))
+        self._threshold = max(self.min_delay, ordered[index])
+
+    def threshold(self) -> float | None:
+        """Seconds to wait before hedging, or None while there are too few samples."""
+        return self._threshold
+
+
+class HedgeBudget:
+    """Earns ``rate`` of a hedge per call, holds at most ``burst``; a hedge spends one."""
+
+    def __init__(self, rate: float = HEDGE_MAX_RATE, burst: float = HEDGE_BUDGET_BURST):
+        self.rate = rate
+        self.burst = burst
+        self.balance = burst
+
+    def earn(self):
+        self.balance = min(self.burst, self.balance + self.rate)
+
+    def spend(self) -> bool:
+        if self.balance < 1:
+            return False
+        self.balance -= 1
+        return True
+
+
+_trackers: dict[str, LatencyTracker] = {}
+budget = HedgeBudget()
+
+
+def tracker(name: str) -> LatencyTracker:
+    found = _trackers.get(name)
+    if found is None:
+        found = _trackers[name] = LatencyTracker()
+    return found
+
+
+def _drop(task: asyncio.Future):
+    # a loser's error is not wanted, but must be retrieved so asyncio does not log it
+    if not task.cancelled():
+        task.exception()
+
+
+async def hedged(name: str, call: Callable[[], T]) -> T:
+    """Run the blocking ``call`` on a worker thread, hedging it once if it is slow (see module docstring)."""
+    if not HEDGED_READS:
+        return await to_thread(call)
+
+    latency = tracker(name)
+    start = time.perf_counter()
+    primary = asyncio.ensure_future(to_thread(call))
+    primary.add_done_callback(
+        lambda f: latency.record(time.perf_counter() - start) if not f.cancelled() and f.exception() is None else None
+    )
+    budget.earn()
+
+    delay = latency.threshold()
+    tasks = {primary}
+    try:
+        if delay is not None:
+            await asyncio.wait(tasks, timeout=delay)
+        if primary.done() or delay is None:
+            return await primary
+
+        if not budget.spend():
+            hedged_reads.inc(name, "budget_exhausted")
+            return await primary
+
+        hedged_reads.inc(name, "hedged")
+        hedge = asyncio.ensure_future(to_thread(call))
+        tasks.add(hedge)
+        while True:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            # take the first success; an error only counts once neither call can succeed
+            succeeded = [t for t in done if t.exception() is None]
+            if succeeded:
+                winner = succeeded[0]
+                if winner is hedge:
+                    hedged_reads.inc(name, "hedge_won")
+                return winner.result()
+            tasks -= done
+            if not tasks:
+                return primary.result()
+    finally:
+        # the loser is left to finish rather than cancelled: its thread runs on either way,
+        # and a slow primary still has to reach the latency window
+        for task in tasks:
+            if not task.done():
+                task.add_done_callback(_drop)
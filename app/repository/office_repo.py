@@ -1,3 +1,4 @@
+import logging
 from mypy_boto3_dynamodb.type_defs import TransactWriteItemTypeDef
 from mypy_boto3_dynamodb.type_defs import UpdateItemInputTypeDef
 import boto3
@@ -12,7 +13,18 @@ from mypy_boto3_dynamodb.service_resource import DynamoDBServiceResource
 from app.constants import TABLE
 from app.dependencies import get_db
 from app.models.office import Office
+from app.repository.batch import batch_get
+from app.repository.version_repo import OFFICES_SCOPE, building_scope, version_bump
+from app.utils.single_flight import single_flight
+from app.repository.circuit_breaker import serve_stale
+from app.repository.hedging import hedged
+from app.metrics.dynamodb import instrument_repository
+from app.utils.trusted_model import from_item
 
+logger = logging.getLogger(__name__)
+
+
+@instrument_repository
 class OfficeRepository:
     def __init__(
             self,
@@ -54,25 +66,52 @@ class OfficeRepository:
         try:
             await to_thread(
                 lambda: self.client.transact_write_items(
-                    TransactItems=[put_office, update_floor],
+                    TransactItems=[
+                        put_office,
+                        update_floor,
+                        version_bump(OFFICES_SCOPE),
+                        version_bump(building_scope(office.building_id)),
+                    ],
                 )
             )
         except self.table.meta.client.exceptions.TransactionCanceledException as e:
-            print(e.response.get("CancellationReasons"))
+            logger.warning(
+                "office transaction cancelled",
+                extra={"reasons": e.response.get("CancellationReasons")},
+            )
             raise Exception("Office creation failed due to conflict") from e
 
+    @serve_stale
+    @single_flight
     async def get_office_by_id(self, office_id: str)->Office:
-        office_item = await to_thread(
+        office_item = await hedged(
+            "OfficeRepository.get_office_by_id",
             lambda :self.table.get_item(
                 Key={
                     "PK":"OFFICE",
                     "SK":f"DETAILS#{office_id}",
                 }
-            ).get("Item")
+            ).get("Item"),
+        )
+
+        return from_item(Office, cast(dict, office_item))
+
+    @serve_stale
+    async def get_offices_by_ids(self, office_ids: list[str]) -> dict[str, Office]:
+        if not office_ids:
+            return {}
+
+        items = await to_thread(
+            lambda: batch_get(
+                self.db,
+                [{"PK": "OFFICE", "SK": f"DETAILS#{office_id}"} for office_id in office_ids],
+            )
         )
 
-        return Office(**cast(dict, office_item))
+        return {str(o["OfficeId"]): from_item(Office, cast(dict, o)) for o in items}
 
+    @serve_stale
+    @single_flight
     async def get_offices(self) -> list[Office]:
         offices = await to_thread(
             lambda: self.table.query(
@@ -81,7 +120,7 @@ class OfficeRepository:
             ).get("Items", [])
         )
 
-        return [Office(**cast(dict, office)) for office in offices]
+        return [from_item(Office, cast(dict, office)) for office in offices]
 
     async def get_all_offices(self) -> list[Office]:
         offices = await to_thread(
@@ -90,7 +129,7 @@ class OfficeRepository:
             ).get("Items", [])
         )
 
-        return [Office(**cast(dict, o)) for o in offices]
+        return [from_item(Office, cast(dict, o)) for o in offices]
 
     async def delete_office(self, building_id: str, floor_number: int, office_id: str):
         delete_office :TransactWriteItemTypeDef= {
@@ -121,6 +160,11 @@ class OfficeRepository:
 
         await to_thread(
             lambda: self.client.transact_write_items(
-                TransactItems=[delete_office, clear_floor]
+                TransactItems=[
+                    delete_office,
+                    clear_floor,
+                    version_bump(OFFICES_SCOPE),
+                    version_bump(building_scope(building_id)),
+                ]
             )
         )
\ No newline at end of file
@@ -1,3 +1,5 @@
+import asyncio
+import logging
 import time
 
 from fastapi.exceptions import ValidationException
@@ -18,13 +20,96 @@ from app.models.parking_history import ParkingHistory
 from asyncio import to_thread
 
 from starlette import status
-from app.constants import TABLE
+from app.constants import ACTIVE_PARKINGS_INDEX, PARKING_HISTORY_LEGACY_READS, TABLE
 from app.dependencies import get_db
 from boto3.dynamodb.conditions import Key, Attr
 
 from app.models.user import User
+from app.repository.scan import CapacityLimiter, ScanCheckpoint, parallel_scan
+from app.repository.version_repo import building_scope, version_bump
+from app.metrics.dynamodb import instrument_repository
+from app.utils.trusted_model import from_item
 
+logger = logging.getLogger(__name__)
 
+# Parking history lives under the user's partition in two sort-key ranges:
+#   PARKING#OPEN#<start epoch>          sessions still in progress
+#   PARKING#<YYYYMM>#<start epoch>      closed sessions, bucketed by start month (UTC)
+# "OPEN" sorts after every digit, so a range over closed sessions never touches open
+# ones and a month (or any start-time range) is a single exact key range.
+# Items written before this layout are PARKING#<start epoch>; see migrate_parking_item.
+OPEN_PARKING_PREFIX = "PARKING#OPEN#"
+
+# Open sessions also carry these, which puts them (and only them) in the sparse
+# ACTIVE_PARKINGS_INDEX, keyed by building and ordered by start time.
+ACTIVE_INDEX_ATTRIBUTES = ("ActiveBuildingId", "ActiveSince")
+
+
+def active_index_attributes(building_id: str, start_time: int) -> dict:
+    return {"ActiveBuildingId": building_id, "ActiveSince": start_time}
+
+
+def month_bucket(ts: int) -> str:
+    return datetime.datetime.fromtimestamp(ts, tz=datetime.timezone.utc).strftime("%Y%m")
+
+
+def open_parking_sk(start_time: int) -> str:
+    return f"{OPEN_PARKING_PREFIX}{start_time}"
+
+
+def closed_parking_sk(start_time: int) -> str:
+    return f"PARKING#{month_bucket(start_time)}#{start_time}"
+
+
+def is_legacy_parking_sk(sk: str) -> bool:
+    prefix, _, rest = sk.partition("#")
+    return prefix == "PARKING" and rest.isdigit()
+
+
+def _is_open(item: dict) -> bool:
+    return item.get("EndTime") in (None, "null")
+
+
+def query_open_parkings(table, user_id: str, numberplate: str | None = None) -> list[dict]:
+    """Open sessions of a user, for repositories that need them outside a ParkingRepository."""
+    kwargs: dict = {
+        "KeyConditionExpression": Key("PK").eq(f"USER#{user_id}") & Key("SK").begins_with(OPEN_PARKING_PREFIX),
+    }
+    if numberplate is not None:
+        kwargs["FilterExpression"] = Attr("Numberplate").eq(numberplate)
+
+    items = table.query(**kwargs).get("Items", [])
+    if items or not PARKING_HISTORY_LEGACY_READS:
+        return items
+
+    # not migrated yet: an open session may still sit in the legacy range
+    legacy_filter = Attr("EndTime").not_exists() | Attr("EndTime").eq(None) | Attr("EndTime").eq("null")
+    if numberplate is not None:
+        legacy_filter = Attr("Numberplate").eq(numberplate) & legacy_filter
+    legacy = table.query(
+        KeyConditionExpression=Key("PK").eq(f"USER#{user_id}") & Key("SK").begins_with("PARKING#"),
+        FilterExpression=legacy_filter,
+    ).get("Items", [])
+    return [i for i in legacy if is_legacy_parking_sk(str(i["SK"]))]
+
+
+def migrate_parking_item(item: dict) -> dict | None:
+    """The new-layout copy of a legacy PARKING#<epoch> item, or None if it is not one."""
+    if not is_legacy_parking_sk(str(item["SK"])):
+        return None
+
+    start_time = int(item["StartTime"])
+    migrated = {**item}
+    if _is_open(item):
+        migrated["SK"] = open_parking_sk(start_time)
+        migrated["EndTime"] = None
+        migrated.update(active_index_attributes(str(item["BuildingId"]), start_time))
+    else:
+        migrated["SK"] = closed_parking_sk(start_time)
+    return migrated
+
+
+@instrument_repository
 class ParkingRepository:
     def __init__(
             self,
@@ -129,8 +214,9 @@ class ParkingRepository:
                 TableName=TABLE,
                 Item={
                     "PK": f"USER#{user.user_id}",
-                    "SK": f"PARKING#{parking.start_time}",
+                    "SK": open_parking_sk(parking.start_time),
                     **parking.model_dump(by_alias=True),
+                    **active_index_attributes(parking.building_id, parking.start_time),
                 },
                 ConditionExpression="attribute_not_exists(PK) and attribute_not_exists(SK)",
             ),
@@ -145,40 +231,46 @@ class ParkingRepository:
                             decrement_floor_available,
                             decrement_building_available,
                             put_parking_history,
+                            version_bump(building_scope(parking.building_id)),
                         ],
                 )
             )
         except self.table.meta.client.exceptions.TransactionCanceledException as e:
-            print(e.response.get("CancellationReasons"))
+            logger.warning(
+                "parking transaction cancelled",
+                extra={"reasons": e.response.get("CancellationReasons")},
+            )
             raise WebException(status_code=status.HTTP_409_CONFLICT, message="Parking creation failed due to conflict", error_code=DB_ERROR) from e
 
 
     async def unpark_by_numberplate(self, user_id: str, numberplate: str):
-        print(f"userid = {user_id}, numberplate = {numberplate}")
-        parking_items = await to_thread(
-            lambda: self.table.query(
-                KeyConditionExpression=Key("PK").eq(f"USER#{user_id}") & Key("SK").begins_with("PARKING#"),
-                FilterExpression=(
-                    Attr("Numberplate").eq(numberplate)
-                    & (
-                        Attr("EndTime").not_exists()
-                        | Attr("EndTime").eq(None)
-                        | Attr("EndTime").eq("null")
-                    )
-                ),
-            ).get("Items", [])
-        )
+        logger.debug("unpark requested", extra={"user_id": user_id, "numberplate": numberplate})
+        # the open item can move under us (the layout migration moves legacy ones), so on
+        # a cancelled transaction it is read again and the unpark retried once
+        for attempt in range(2):
+            parking_items = await self.get_open_parkings(user_id, numberplate)
 
-        if not parking_items:
-            raise WebException(status_code=404, message="No active parking found for the given numberplate", error_code=DB_ERROR)
+            if not parking_items:
+                raise WebException(status_code=404, message="No active parking found for the given numberplate", error_code=DB_ERROR)
 
-        active_parking = parking_items[0]
-        print(active_parking)
+            active_parking = parking_items[0]
+            logger.debug("active parking found", extra={"user_id": user_id, "sk": active_parking["SK"]})
+            transact_items = self._unpark_items(user_id, numberplate, active_parking)
+            try:
+                await to_thread(lambda: self.table.meta.client.transact_write_items(TransactItems=transact_items))
+                return
+            except self.table.meta.client.exceptions.TransactionCanceledException as e:
+                logger.warning(
+                    "unpark transaction cancelled",
+                    extra={"reasons": e.response.get("CancellationReasons"), "attempt": attempt},
+                )
+                if attempt:
+                    raise WebException(status_code=status.HTTP_409_CONFLICT, message="Unpark failed due to conflict", error_code=DB_ERROR) from e
+
+    @staticmethod
+    def _unpark_items(user_id: str, numberplate: str, active_parking: dict) -> list[TransactWriteItemTypeDef]:
         parking_sk = active_parking["SK"]
-        parking = ParkingHistory(
-            user_id=user_id,
-            **cast(dict, active_parking)
-        )
+        parking = from_item(ParkingHistory, cast(dict, active_parking), user_id=user_id)
 
 
         update_vehicle : TransactWriteItemTypeDef = {
@@ -242,49 +334,196 @@ class ParkingRepository:
             )
         }
 
-        update_parking_history : TransactWriteItemTypeDef = {
-            "Update": UpdateTypeDef(
-                Key={
+        # closing a session moves it from the open range to its month bucket
+        delete_open_parking : TransactWriteItemTypeDef = {
+            "Delete": {
+                "TableName": TABLE,
+                "Key": {
                     "PK": f"USER#{user_id}",
                     "SK": parking_sk,
                 },
-                UpdateExpression="SET EndTime = :end_time",
-                ExpressionAttributeValues={
-                    ":end_time": int(time.time()),
-                },
-                ConditionExpression="attribute_exists(PK) and attribute_exists(SK)",
+                "ConditionExpression": "attribute_exists(PK) and attribute_exists(SK)",
+            }
+        }
+
+        put_closed_parking : TransactWriteItemTypeDef = {
+            "Put": PutTypeDef(
                 TableName=TABLE,
+                Item={
+                    **{k: v for k, v in active_parking.items() if k not in ACTIVE_INDEX_ATTRIBUTES},
+                    "PK": f"USER#{user_id}",
+                    "SK": closed_parking_sk(parking.start_time),
+                    "EndTime": int(time.time()),
+                },
+                ConditionExpression="attribute_not_exists(PK) and attribute_not_exists(SK)",
             ),
         }
 
-        await to_thread(
-            lambda : self.table.meta.client.transact_write_items(
-                TransactItems=[
-                    update_vehicle,
-                    update_slot,
-                    increment_floor_available,
-                    increment_building_available,
-                    update_parking_history,
-                ],
-            )
-        )
+        return [
+            update_vehicle,
+            update_slot,
+            increment_floor_available,
+            increment_building_available,
+            delete_open_parking,
+            put_closed_parking,
+            version_bump(building_scope(parking.building_id)),
+        ]
+
+
+    async def get_open_parkings(self, user_id: str, numberplate: str | None = None) -> list[dict]:
+        """Raw items of the user's sessions that are still in progress, optionally for one vehicle."""
+        return await to_thread(lambda: query_open_parkings(self.table, user_id, numberplate))
+
+    async def get_active_parkings(
+            self,
+            building_id: str,
+            limit: int,
+            exclusive_start_key: dict | None = None,
+    ) -> tuple[list[ParkingHistory], dict | None]:
+        """One page of the building's open sessions, oldest first, from the sparse active-parkings index."""
+        kwargs: dict = {
+            "IndexName": ACTIVE_PARKINGS_INDEX,
+            "KeyConditionExpression": Key("ActiveBuildingId").eq(building_id),
+            "Limit": limit,
+        }
+        if exclusive_start_key:
+            kwargs["ExclusiveStartKey"] = exclusive_start_key
 
+        page = await to_thread(lambda: self.table.query(**kwargs))
+
+        parkings = [
+            from_item(ParkingHistory, cast(dict, item), user_id=str(item["PK"]).removeprefix("USER#"))
+            for item in page.get("Items", [])
+        ]
+        return parkings, page.get("LastEvaluatedKey")
 
     async def get_parking_history(self, user_id: str, start_time: int, end_time: int) -> list[ParkingHistory]:
-        response = await to_thread(
-            lambda: self.table.query(
-                KeyConditionExpression=Key("PK").eq(f"USER#{user_id}") & Key("SK").between(f"PARKING#{start_time}", f"PARKING#{end_time}"),
-                FilterExpression=Attr("EndTime").attribute_type("N")
-            ).get("Items", [])
-        )
-        
-        history = []
+        """Closed sessions that started within [start_time, end_time], newest first."""
+        history: list[ParkingHistory] = []
+        position = None
+        while True:
+            page, position = await self.get_parking_history_page(user_id, start_time, end_time, position=position)
+            history.extend(page)
+            if position is None:
+                return history
+
+    async def get_parking_history_page(
+        self,
+        user_id: str,
+        start_time: int,
+        end_time: int,
+        limit: int | None = None,
+        position: dict | None = None,
+    ) -> tuple[list[ParkingHistory], dict | None]:
+        """
+        One page of closed sessions that started within [start_time, end_time], newest first.
+
+        The bucketed key range is read in descending key order, then, while
+        PARKING_HISTORY_LEGACY_READS is on, the legacy one. ``position`` is the second
+        element returned by the previous page, None once there are no more. Until the
+        migration finishes, migrated sessions can come before older legacy ones.
+        """
+        legacy = bool(position and position.get("legacy"))
+        start_key = position.get("key") if position else None
+        items: list[dict] = []
+
+        if not legacy:
+            response = await to_thread(lambda: self.table.query(**self._history_query(
+                user_id, Key("SK").between(closed_parking_sk(start_time), closed_parking_sk(end_time)), limit, start_key,
+            )))
+            items = response.get("Items", [])
+            if "LastEvaluatedKey" in response:
+                return self._to_history(user_id, items), {"legacy": False, "key": response["LastEvaluatedKey"]}
+            if not PARKING_HISTORY_LEGACY_READS:
+                return self._to_history(user_id, items), None
+            if limit is not None:
+                limit -= len(items)
+                if limit <= 0:
+                    return self._to_history(user_id, items), {"legacy": True, "key": None}
+            start_key = None
+
+        response = await to_thread(lambda: self.table.query(
+            **self._history_query(
+                user_id, Key("SK").between(f"PARKING#{start_time}", f"PARKING#{end_time}"), limit, start_key,
+            ),
+            FilterExpression=Attr("EndTime").attribute_type("N"),
+        ))
+        items += [i for i in response.get("Items", []) if is_legacy_parking_sk(str(i["SK"]))]
+        next_position = {"legacy": True, "key": response["LastEvaluatedKey"]} if "LastEvaluatedKey" in response else None
+        return self._to_history(user_id, items), next_position
+
+    @staticmethod
+    def _history_query(user_id: str, sort_key_range, limit: int | None, start_key: dict | None) -> dict:
+        kwargs: dict = {
+            "KeyConditionExpression": Key("PK").eq(f"USER#{user_id}") & sort_key_range,
+            "ScanIndexForward": False,
+        }
+        if limit is not None:
+            kwargs["Limit"] = limit
+        if start_key:
+            kwargs["ExclusiveStartKey"] = start_key
+        return kwargs
+
+    @staticmethod
+    def _to_history(user_id: str, items: list[dict]) -> list[ParkingHistory]:
         try:
-            history =[ParkingHistory(
-                user_id=user_id,
-                **cast(dict, item)) for item in response
-            ] 
+            return [from_item(ParkingHistory, cast(dict, item), user_id=user_id) for item in items]
         except ValidationError as e:
-            print("Data validation error while fetching parking history:", e.errors())
+            logger.error("invalid parking history item", extra={"user_id": user_id, "errors": e.errors()})
             raise WebException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, message="Data validation error while fetching parking history", error_code=DB_ERROR) from e
-        return history
\ No newline at end of file
+
+    async def migrate_parking_items(
+        self,
+        total_segments: int,
+        checkpoint: ScanCheckpoint | None = None,
+        limiter: CapacityLimiter | None = None,
+    ) -> int:
+        """
+        Move legacy PARKING#<epoch> items to the bucketed layout.
+
+        Each item is copied and its original deleted in one transaction, conditioned on
+        the original still existing, so live traffic and re-runs are both safe.
+        """
+        migrated = 0
+        async for page in parallel_scan(
+            self.table,
+            total_segments,
+            checkpoint,
+            limiter,
+            FilterExpression=Attr("SK").begins_with("PARKING#"),
+        ):
+            moved = await asyncio.gather(*(self._migrate_one(item) for item in page.items))
+            migrated += sum(moved)
+        return migrated
+
+    async def _migrate_one(self, item: dict) -> bool:
+        new_item = migrate_parking_item(item)
+        if new_item is None:
+            return False
+        try:
+            await to_thread(lambda: self._move_parking_item(item, new_item))
+        except self.table.meta.client.exceptions.TransactionCanceledException:
+            # unparked or migrated concurrently; the live path already moved it
+            logger.info("parking item changed during migration", extra={"pk": item["PK"], "sk": item["SK"]})
+            return False
+        return True
+
+    def _move_parking_item(self, item: dict, new_item: dict):
+        self.table.meta.client.transact_write_items(
+            TransactItems=[
+                {
+                    "Put": {
+                        "TableName": TABLE,
+                        "Item": new_item,
+                        "ConditionExpression": "attribute_not_exists(PK) and attribute_not_exists(SK)",
+                    }
+                },
+                {
+                    "Delete": {
+                        "TableName": TABLE,
+                        "Key": {"PK": item["PK"], "SK": item["SK"]},
+                        "ConditionExpression": "attribute_exists(PK) and attribute_exists(SK)",
+                    }
+                },
+            ]
+        )
@@ -0,0 +1,129 @@
+import datetime
+import logging
+from asyncio import to_thread
+from collections import defaultdict
+from decimal import Decimal
+from typing import cast
+
+import numpy as np
+from boto3.dynamodb.conditions import Attr, Key
+from fastapi import Depends
+from mypy_boto3_dynamodb.service_resource import DynamoDBServiceResource
+
+from app.constants import TABLE
+from app.dependencies import get_db
+from app.metrics.dynamodb import instrument_repository
+from app.repository.scan import CapacityLimiter, parallel_scan
+from app.utils.occupancy import HOUR, arrivals, occupied_seconds
+
+logger = logging.getLogger(__name__)
+
+# One PK=BUILDING#<id>/SK=ROLLUP#<YYYYMMDD>#FLOOR#<n> item per floor and UTC day.
+# OccupiedSeconds and Arrivals hold 24 little-endian counters, one per hour, so a
+# week of a building is a single short Query.
+ROLLUP_PREFIX = "ROLLUP#"
+OCCUPIED_DTYPE = "<u4"
+ARRIVALS_DTYPE = "<u2"
+
+
+def rollup_sk(day: datetime.date, floor_number: int) -> str:
+    return f"{ROLLUP_PREFIX}{day:%Y%m%d}#FLOOR#{floor_number}"
+
+
+def day_start(day: datetime.date) -> int:
+    return int(datetime.datetime.combine(day, datetime.time(), tzinfo=datetime.timezone.utc).timestamp())
+
+
+def decode_hours(value, dtype: str) -> np.ndarray:
+    # boto3 hands binary attributes back wrapped in a Binary
+    return np.frombuffer(getattr(value, "value", value), dtype=dtype)
+
+
+def _is_closed(item: dict) -> bool:
+    return isinstance(item.get("EndTime"), (int, Decimal))
+
+
+@instrument_repository
+class RollupRepository:
+    def __init__(self, db: DynamoDBServiceResource = Depends(get_db)):
+        self.table = db.Table(TABLE)
+
+    async def get_rollups(self, building_id: str, first_day: datetime.date, last_day: datetime.date) -> list[dict]:
+        kwargs: dict = {
+            "KeyConditionExpression": Key("PK").eq(f"BUILDING#{building_id}")
+            & Key("SK").between(f"{ROLLUP_PREFIX}{first_day:%Y%m%d}", f"{ROLLUP_PREFIX}{last_day:%Y%m%d}#~"),
+        }
+        items: list[dict] = []
+
+        while True:
+            page = await to_thread(lambda: self.table.query(**kwargs))
+            items.extend(cast(list[dict], page.get("Items", [])))
+            if "LastEvaluatedKey" not in page:
+                return items
+            kwargs["ExclusiveStartKey"] = page["LastEvaluatedKey"]
+
+    async def build_rollups(
+        self,
+        first_day: datetime.date,
+        last_day: datetime.date,
+        total_segments: int,
+        limiter: CapacityLimiter | None = None,
+    ) -> int:
+        """
+        Recompute the rollups of every floor for the days first_day..last_day (UTC).
+
+        Closed sessions overlapping the range are collected with one parallel scan,
+        along with each floor's slot count, and every floor gets an item per day,
+        zeros included. Re-running a range overwrites it. The scan is not
+        checkpointed: the counters are only complete once the whole table is read.
+        """
+        days = (last_day - first_day).days + 1
+        range_start = day_start(first_day)
+        range_end = range_start + days * 24 * HOUR
+
+        capacity: dict[tuple[str, int], int] = {}
+        sessions: dict[tuple[str, int], list[tuple[int, int]]] = defaultdict(list)
+
+        async for page in parallel_scan(
+            self.table,
+            total_segments,
+            None,
+            limiter,
+            FilterExpression=(Attr("SK").begins_with("PARKING#") & Attr("StartTime").lt(range_end))
+            | Attr("SK").begins_with("FLOORINFO#"),
+        ):
+            for item in page.items:
+                if item["SK"].startswith("FLOORINFO#"):
+                    floor = (item["PK"].removeprefix("BUILDING#"), int(item["FloorNumber"]))
+                    capacity[floor] = int(item.get("TotalSlots", 0))
+                elif _is_closed(item) and int(item["EndTime"]) > range_start:
+                    floor = (item["BuildingId"], int(item["FloorNumber"]))
+                    sessions[floor].append((int(item["StartTime"]), int(item["EndTime"])))
+
+        items = []
+        for building_id, floor_number in capacity.keys() | sessions.keys():
+            floor_sessions = np.array(sessions.get((building_id, floor_number), []), dtype=np.int64).reshape(-1, 2)
+            occupied = occupied_seconds(floor_sessions[:, 0], floor_sessions[:, 1], range_start, days * 24)
+            arrived = arrivals(floor_sessions[:, 0], range_start, days * 24)
+
+            for offset in range(days):
+                day = first_day + datetime.timedelta(days=offset)
+                hours = slice(offset * 24, (offset + 1) * 24)
+                items.append({
+                    "PK": f"BUILDING#{building_id}",
+                    "SK": rollup_sk(day, floor_number),
+                    "Day": day.isoformat(),
+                    "FloorNumber": floor_number,
+                    "Capacity": capacity.get((building_id, floor_number), 0),
+                    "OccupiedSeconds": occupied[hours].astype(OCCUPIED_DTYPE).tobytes(),
+                    "Arrivals": arrived[hours].astype(ARRIVALS_DTYPE).tobytes(),
+                })
+
+        await to_thread(lambda: self._write(items))
+        logger.info("built occupancy rollups", extra={"floors": len(items) // days, "days": days})
+        return len(items)
+
+    def _write(self, items: list[dict]):
+        with self.table.batch_writer() as batch:
+            for item in items:
+                batch.put_item(Item=item)
@@ -0,0 +1,204 @@
+"""
+Parallel segmented Scan over the whole table.
+
+    async for page in parallel_scan(table, total_segments=8, FilterExpression=Attr("SK").begins_with("VEHICLE#")):
+        for item in page.items:
+            ...
+
+Each segment is scanned by its own worker, so a whole-table job runs
+``total_segments`` reads at a time instead of one. Pages are handed to the caller
+as they arrive, through a small queue that stops workers running far ahead of
+the caller.
+
+With a ScanCheckpoint, a page's LastEvaluatedKey is saved only once the caller
+asks for the next page, i.e. after it has finished with the page, so a job that
+is interrupted and restarted with the same checkpoint resumes each segment where
+it stopped and at worst repeats the page it was working on.
+
+A CapacityLimiter keeps the job under a read-capacity budget, and halves that
+budget for a while whenever DynamoDB throttles the scan.
+"""
+import asyncio
+import json
+import os
+import time
+from asyncio import to_thread
+from dataclasses import dataclass
+from typing import AsyncIterator, Awaitable, Callable
+
+from botocore.exceptions import ClientError
+from mypy_boto3_dynamodb.service_resource import Table
+
+_THROTTLING_ERRORS = {"ProvisionedThroughputExceededException", "ThrottlingException", "RequestLimitExceeded"}
+
+
+@dataclass
+class ScanPage:
+    segment: int
+    items: list[dict]
+    last_key: dict | None
+    consumed_capacity: float = 0.0
+
+
+class CapacityLimiter:
+    """
+    Pace scan pages so consumed read capacity averages at most ``units_per_second``.
+
+    Capacity is charged after each page, since a page's cost is only known once
+    it has been read. On throttling the rate is halved; every page read without
+    throttling gives back 10% of the configured rate.
+    """
+
+    def __init__(
+        self,
+        units_per_second: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable] = asyncio.sleep,
+    ):
+        self.max_rate = units_per_second
+        self.rate = units_per_second
+        self._clock = clock
+        self._sleep = sleep
+        self._next_free = clock()
+
+    async def consume(self, units: float):
+        now = self._clock()
+        start = max(now, self._next_free)
+        self._next_free = start + units / self.rate
+        if start > now:
+            await self._sleep(start - now)
+        self.rate = min(self.max_rate, self.rate + self.max_rate * 0.1)
+
+    async def throttled(self):
+        self.rate = max(self.max_rate * 0.01, self.rate / 2)
+        await self._sleep(1 / self.rate if self.rate < 1 else 1.0)
+
+
+class ScanCheckpoint:
+    """
+    Per-segment scan progress in a JSON file.
+
+    A segment is either not started, at a LastEvaluatedKey, or done. Every update
+    rewrites the file atomically.
+    """
+
+    def __init__(self, path: str, total_segments: int):
+        self.path = path
+        self.total_segments = total_segments
+        self.segments: dict[int, dict] = {}
+
+        if os.path.exists(path):
+            with open(path) as f:
+                saved = json.load(f)
+            if saved["total_segments"] != total_segments:
+                raise ValueError(
+                    f"checkpoint {path} was written for {saved['total_segments']} segments, not {total_segments}"
+                )
+            self.segments = {int(k): v for k, v in saved["segments"].items()}
+
+    def start_key(self, segment: int) -> dict | None:
+        return self.segments.get(segment, {}).get("last_key")
+
+    def is_done(self, segment: int) -> bool:
+        return self.segments.get(segment, {}).get("done", False)
+
+    def save(self, segment: int, last_key: dict | None):
+        self.segments[segment] = {"last_key": last_key, "done": last_key is None}
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"total_segments": self.total_segments, "segments": self.segments}, f)
+        os.replace(tmp, self.path)
+
+
+async def _scan_segment(
+    table: Table,
+    segment: int,
+    total_segments: int,
+    pages: asyncio.Queue,
+    scan_kwargs: dict,
+    start_key: dict | None,
+    limiter: CapacityLimiter | None,
+):
+    kwargs = {**scan_kwargs, "Segment": segment, "TotalSegments": total_segments, "ReturnConsumedCapacity": "TOTAL"}
+    if start_key:
+        kwargs["ExclusiveStartKey"] = start_key
+
+    while True:
+        try:
+            response = await to_thread(lambda: table.scan(**kwargs))
+        except ClientError as e:
+            if limiter is None or e.response.get("Error", {}).get("Code") not in _THROTTLING_ERRORS:
+                raise
+            await limiter.throttled()
+            continue
+
+        consumed = float(response.get("ConsumedCapacity", {}).get("CapacityUnits", 0))
+        last_key = response.get("LastEvaluatedKey")
+        await pages.put(ScanPage(segment, response.get("Items", []), last_key, consumed))
+
+        if last_key is None:
+            return
+        kwargs["ExclusiveStartKey"] = last_key
+        if limiter is not None:
+            await limiter.consume(consumed)
+
+
+async def parallel_scan(
+    table: Table,
+    total_segments: int,
+    checkpoint: ScanCheckpoint | None = None,
+    limiter: CapacityLimiter | None = None,
+    **scan_kwargs,
+) -> AsyncIterator[ScanPage]:
+    """
+    Scan ``table`` with ``total_segments`` concurrent workers and yield pages as they arrive.
+
+    Extra keyword arguments (FilterExpression, ProjectionExpression, Limit, ...) are
+    passed to every Scan call. Pages of one segment arrive in order; pages of
+    different segments interleave. If a worker fails, the error is raised here
+    after the other workers are cancelled.
+    """
+    segments = [s for s in range(total_segments) if checkpoint is None or not checkpoint.is_done(s)]
+    pages: asyncio.Queue[ScanPage] = asyncio.Queue(maxsize=max(1, total_segments))
+    workers = [
+        asyncio.create_task(
+            _scan_segment(
+                table,
+                segment,
+                total_segments,
+                pages,
+                scan_kwargs,
+                checkpoint.start_key(segment) if checkpoint else None,
+                limiter,
+            ),
+            name=f"scan-segment-{segment}",
+        )
+        for segment in segments
+    ]
+    remaining = len(workers)
+
+    try:
+        while remaining:
+            for worker in workers:
+                error = worker.exception() if worker.done() else None
+                if error is not None:
+                    raise error
+
+            get_page = asyncio.ensure_future(pages.get())
+            running = [w for w in workers if not w.done()]
+            done, _ = await asyncio.wait([get_page, *running], return_when=asyncio.FIRST_COMPLETED)
+            if get_page not in done:
+                get_page.cancel()
+                continue
+
+            page = get_page.result()
+            yield page
+
+            if checkpoint is not None:
+                checkpoint.save(page.segment, page.last_key)
+            if page.last_key is None:
+                remaining -= 1
+    finally:
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
@@ -4,16 +4,21 @@ from asyncio.threads import to_thread
 
 from app.models.building import Building
 from app.models.floor import Floor
+from app.models.floor_grid import FloorGrid
 from app.models.slot import Slot, OccupantDetails
 from mypy_boto3_dynamodb.service_resource import DynamoDBServiceResource
+from mypy_boto3_dynamodb.type_defs import TransactWriteItemTypeDef
 from typing import Annotated
 
 from fastapi import Depends
 
 from app.constants import TABLE
 from app.dependencies import get_db
+from app.repository.version_repo import building_scope, version_bump
+from app.metrics.dynamodb import instrument_repository
 
 
+@instrument_repository
 class SlotRepository:
     def __init__(
             self,
@@ -22,54 +27,66 @@ class SlotRepository:
         self.db = db
         self.table = db.Table(TABLE)
 
-    async def get_slots_by_floor(self, floor: Floor)-> list[Slot]:
+    async def get_floor_grid(self, floor: Floor) -> FloorGrid:
         slot_query_items = await to_thread(
             lambda : self.table.query(
                 KeyConditionExpression=Key("PK").eq(f"BUILDING#{floor.building_id}")&Key("SK").begins_with(f"FLOOR#{floor.floor_number}#SLOT#"),
             ).get("Items")
         )
 
-        return [
-            Slot(
-                building_id=floor.building_id,
-                floor_number=floor.floor_number,
-                **cast(dict,s)
-            )
-            for s in slot_query_items
-        ]
+        return FloorGrid.from_items(floor.building_id, floor.floor_number, cast(list[dict], slot_query_items))
+
+    async def get_slots_by_floor(self, floor: Floor)-> list[Slot]:
+        grid = await self.get_floor_grid(floor)
+
+        return grid.slots()
 
     async def get_free_slots_by_floor(self, floor: Floor)-> list[Slot]:
-        slots = await self.get_slots_by_floor(floor)
+        grid = await self.get_floor_grid(floor)
 
-        return [s for s in slots if not s.is_assigned]
+        return [grid.slot(position) for position in grid.free_positions()]
 
 
     async def update_slot(self, slot: Slot):
-        await to_thread(
-            lambda : self.table.update_item(
-                Key={
+        update_slot: TransactWriteItemTypeDef = {
+            "Update": {
+                "TableName": TABLE,
+                "Key": {
                     "PK": f"BUILDING#{slot.building_id}",
                     "SK": f"FLOOR#{slot.floor_number}#SLOT#{slot.slot_id}",
                 },
-                UpdateExpression="SET OccupiedBy = :occupied_by, IsAssigned = :is_assigned",
-                ExpressionAttributeValues={
+                "UpdateExpression": "SET OccupiedBy = :occupied_by, IsAssigned = :is_assigned",
+                "ExpressionAttributeValues": {
                     ":occupied_by": slot.occupied_by.model_dump(by_alias=True) if slot.occupied_by else None,
                     ":is_assigned": slot.is_assigned,
                 },
+            }
+        }
+
+        await to_thread(
+            lambda: self.table.meta.client.transact_write_items(
+                TransactItems=[update_slot, version_bump(building_scope(slot.building_id))]
             )
         )
 
     async def update_slot_occupancy(self, building_id: str, floor_number: int, slot_id: int, occupied_by: OccupantDetails | None, is_occupied: bool):
-        await to_thread(
-            lambda: self.table.update_item(
-                Key={
+        update_slot: TransactWriteItemTypeDef = {
+            "Update": {
+                "TableName": TABLE,
+                "Key": {
                     "PK": f"BUILDING#{building_id}",
                     "SK": f"FLOOR#{floor_number}#SLOT#{slot_id}",
                 },
-                UpdateExpression="SET OccupiedBy = :occupied_by, IsOccupied = :is_occupied",
-                ExpressionAttributeValues={
+                "UpdateExpression": "SET OccupiedBy = :occupied_by, IsOccupied = :is_occupied",
+                "ExpressionAttributeValues": {
                     ":occupied_by": occupied_by.model_dump(by_alias=True) if occupied_by else None,
                     ":is_occupied": is_occupied,
                 },
+            }
+        }
+
+        await to_thread(
+            lambda: self.table.meta.client.transact_write_items(
+                TransactItems=[update_slot, version_bump(building_scope(building_id))]
             )
         )
\ No newline at end of file
@@ -2,6 +2,7 @@ from asyncio import to_thread
 from typing import cast, overload, Sequence, List
 import boto3
 
+from boto3.dynamodb.conditions import Key
 from fastapi import Depends, HTTPException
 from mypy_boto3_dynamodb.service_resource import DynamoDBServiceResource
 from mypy_boto3_dynamodb.type_defs import TransactWriteItemTypeDef, PutTypeDef
@@ -11,26 +12,37 @@ from app.dependencies import get_db
 from app.errors.web_exception import WebException, DB_ERROR
 from app.models.roles import Roles
 from app.models.user import User
+from app.metrics.dynamodb import instrument_repository
 
+# profile attributes copied onto the PK=USER/SK=<email> lookup item for single-read login
+LOOKUP_FIELDS = ("Username", "PasswordHash", "Email", "OfficeId", "Role")
 
+
+def lookup_fields(user: User) -> dict:
+    profile = user.model_dump(by_alias=True)
+    return {k: profile[k] for k in LOOKUP_FIELDS}
+
+
+@instrument_repository
 class UserRepository:
     def __init__(self, db: DynamoDBServiceResource = Depends(get_db)) -> None:
         self.db = db
         self.table = db.Table(TABLE)
 
     async def get_by_email(self, email: str):
-        uid_lookup_res = await to_thread(
-            lambda: self.table.get_item(
-                Key={"PK": "USER", "SK": email},
-                ProjectionExpression="#uuid",
-                ExpressionAttributeNames={"#uuid": "UUID"},
-            ).get("Item")
+        # the email lookup item carries everything login needs, so one read is enough;
+        # lookups written before that fall back to the profile item
+        lookup = await to_thread(
+            lambda: self.table.get_item(Key={"PK": "USER", "SK": email}).get("Item")
         )
 
-        if uid_lookup_res is None:
+        if lookup is None:
             raise HTTPException(status_code=409,detail="User not found")
 
-        uid = uid_lookup_res.get("UUID")
+        if "PasswordHash" in lookup:
+            return User(Id=str(lookup["UUID"]), **cast(dict, {k: lookup[k] for k in LOOKUP_FIELDS if k in lookup}))
+
+        uid = lookup.get("UUID")
         user_query_res = await to_thread(
             lambda: self.table.get_item(Key={"PK": f"USER#{uid}", "SK": "PROFILE"}).get(
                 "Item"
@@ -60,6 +72,7 @@ class UserRepository:
                     "PK":"USER",
                     "SK":user.email,
                     "UUID":user.user_id,
+                    **lookup_fields(user),
                 },
                 "TableName":TABLE,
                 "ConditionExpression": "attribute_not_exists(PK) AND attribute_not_exists(SK)",
@@ -98,3 +111,41 @@ class UserRepository:
         #             "SK": "PROFILE",
         #         }
         #     )
+
+    async def backfill_lookup_items(self) -> int:
+        """Copy login fields onto email lookup items written before they carried them."""
+        updated = 0
+        kwargs: dict = {
+            "KeyConditionExpression": Key("PK").eq("USER"),
+        }
+
+        while True:
+            page = await to_thread(lambda: self.table.query(**kwargs))
+
+            for lookup in page.get("Items", []):
+                if "PasswordHash" in lookup:
+                    continue
+
+                uid = lookup.get("UUID")
+                profile = await to_thread(
+                    lambda: self.table.get_item(Key={"PK": f"USER#{uid}", "SK": "PROFILE"}).get("Item")
+                )
+                if profile is None:
+                    continue
+
+                user = User(**cast(dict, profile))
+                fields = lookup_fields(user)
+                await to_thread(
+                    lambda: self.table.update_item(
+                        Key={"PK": "USER", "SK": lookup["SK"]},
+                        UpdateExpression="SET " + ", ".join(f"#{k} = :{k}" for k in fields),
+                        ConditionExpression="#uuid = :uuid",
+                        ExpressionAttributeNames={"#uuid": "UUID", **{f"#{k}": k for k in fields}},
+                        ExpressionAttributeValues={":uuid": uid, **{f":{k}": v for k, v in fields.items()}},
+                    )
+                )
+                updated += 1
+
+            if "LastEvaluatedKey" not in page:
+                return updated
+            kwargs["ExclusiveStartKey"] = page["LastEvaluatedKey"]
@@ -1,3 +1,6 @@
+import asyncio
+import logging
+import re
 from typing import cast
 from asyncio import to_thread
 from typing import List
@@ -8,11 +11,57 @@ from mypy_boto3_dynamodb.service_resource import DynamoDBServiceResource
 
 from app.dependencies import get_db
 from app.models.vehicle import Vehicle
-from boto3.dynamodb.conditions import Key
+from boto3.dynamodb.conditions import Attr, Key
 
 from app.errors.web_exception import WebException, DB_ERROR
+from app.repository.hedging import hedged
+from app.metrics.dynamodb import instrument_repository
+from app.repository.parking_repo import query_open_parkings
+from app.repository.scan import CapacityLimiter, ScanCheckpoint, parallel_scan
+from app.utils.trusted_model import from_item
 
+logger = logging.getLogger(__name__)
 
+# PK=PLATE/SK=<normalized plate>#<user id>#<plate> items index every vehicle by
+# plate, so staff can find a plate's owner with one Query instead of a Scan. The
+# owner is in the key because plates are only unique per user, and the plate as
+# saved because one user can save two plates that normalize the same ("KA-01 AB"
+# and "KA01AB"), each needing its own index item.
+#
+# All index items share one partition so that a plate prefix is a single
+# begins_with Query; PLATE#<normalized> partitions would only support exact
+# lookups. That partition takes every vehicle save and delete, which is fine at
+# registration rates (a partition sustains 1,000 writes/s) but would need
+# sharding by the plate's first character if vehicle writes grew past that.
+PLATE_INDEX_PK = "PLATE"
+
+_NOT_PLATE_CHARS = re.compile(r"[^0-9A-Z]")
+
+
+def normalize_plate(number_plate: str) -> str:
+    """Upper-case alphanumerics only, so "ka-01 ab 1234" and "KA01AB1234" index the same."""
+    return _NOT_PLATE_CHARS.sub("", number_plate.upper())
+
+
+def plate_index_item(vehicle: Vehicle, user_id: str) -> dict:
+    return {
+        "PK": PLATE_INDEX_PK,
+        "SK": plate_index_sort_key(user_id, vehicle.number_plate),
+        "UserId": user_id,
+        "Numberplate": vehicle.number_plate,
+        "VehicleType": vehicle.vehicle_type.value,
+    }
+
+
+def plate_index_sort_key(user_id: str, number_plate: str) -> str:
+    return f"{normalize_plate(number_plate)}#{user_id}#{number_plate}"
+
+
+def plate_index_key(user_id: str, number_plate: str) -> dict:
+    return {"PK": PLATE_INDEX_PK, "SK": plate_index_sort_key(user_id, number_plate)}
+
+
+@instrument_repository
 class VehicleRepository:
     def __init__(self, db: DynamoDBServiceResource = Depends(get_db)):
         self.table = db.Table(TABLE)
@@ -29,45 +78,53 @@ class VehicleRepository:
         # print(vehicles)
         vehicle_res = []
         for i in vehicles:
-            vehicle_res.append(Vehicle(**cast(dict, i)))
+            vehicle_res.append(from_item(Vehicle, cast(dict, i)))
 
         return vehicle_res
 
     async def get_vehicle_by_number_plate(
         self, user_id: str, number_plate: str
     ) -> Vehicle | None:
-        vehicle = await to_thread(
+        vehicle = await hedged(
+            "VehicleRepository.get_vehicle_by_number_plate",
             lambda: self.table.get_item(
                 Key={"PK": f"USER#{user_id}", "SK": f"VEHICLE#{number_plate}"},
                 ProjectionExpression="VehicleId, Numberplate, VehicleType, IsParked, AssignedSlot",
-            ).get("Item")
+            ).get("Item"),
         )
 
         if vehicle is None:
             return None
 
-        return Vehicle(**cast(dict, vehicle))
+        return from_item(Vehicle, cast(dict, vehicle))
 
     async def save_vehicle(self, vehicle: Vehicle, user_id: str):
         await to_thread(
-            lambda: self.table.put_item(
-                Item={
-                    **vehicle.model_dump(by_alias=True),
-                    "PK": f"USER#{user_id}",
-                    "SK": f"VEHICLE#{vehicle.number_plate}",
-                },
-                ConditionExpression="attribute_not_exists(PK) and attribute_not_exists(SK)",
+            lambda: self.table.meta.client.transact_write_items(
+                TransactItems=[
+                    {
+                        "Put": {
+                            "TableName": TABLE,
+                            "Item": {
+                                **vehicle.model_dump(by_alias=True),
+                                "PK": f"USER#{user_id}",
+                                "SK": f"VEHICLE#{vehicle.number_plate}",
+                            },
+                            "ConditionExpression": "attribute_not_exists(PK) and attribute_not_exists(SK)",
+                        }
+                    },
+                    {
+                        "Put": {
+                            "TableName": TABLE,
+                            "Item": plate_index_item(vehicle, user_id),
+                        }
+                    },
+                ]
             )
         )
 
     async def delete_vehicle(self, user_id: str, number_plate: str):
-        is_parked = self.table.query(
-            KeyConditionExpression=Key("PK").eq(f"USER#{user_id}")
-            & Key("SK").begins_with("PARKING#"),
-            ProjectionExpression="IsParked",
-            FilterExpression="attribute_not_exists(EndTime) and Numberplate = :np",
-            ExpressionAttributeValues={":np": number_plate},
-        ).get("Items")
+        is_parked = await to_thread(lambda: query_open_parkings(self.table, user_id, number_plate))
 
         if len(is_parked) > 0:
             raise WebException(
@@ -76,12 +133,91 @@ class VehicleRepository:
                 message="Cannot delete a vehicle that is currently parked.",
             )
         await to_thread(
-            lambda: self.table.delete_item(
-                Key={
-                    "PK": f"USER#{user_id}",
-                    "SK": f"VEHICLE#{number_plate}",
-                },
-                ConditionExpression="attribute_exists(PK) and attribute_exists(SK)",
+            lambda: self.table.meta.client.transact_write_items(
+                TransactItems=[
+                    {
+                        "Delete": {
+                            "TableName": TABLE,
+                            "Key": {
+                                "PK": f"USER#{user_id}",
+                                "SK": f"VEHICLE#{number_plate}",
+                            },
+                            "ConditionExpression": "attribute_exists(PK) and attribute_exists(SK)",
+                        }
+                    },
+                    {
+                        "Delete": {
+                            "TableName": TABLE,
+                            "Key": plate_index_key(user_id, number_plate),
+                        }
+                    },
+                ]
             )
         )
 
+    async def search_by_plate(self, prefix: str, limit: int) -> list[dict]:
+        """Plate index items whose normalized plate starts with ``prefix``, in plate order."""
+        normalized = normalize_plate(prefix)
+        if not normalized:
+            return []
+
+        items = await to_thread(
+            lambda: self.table.query(
+                KeyConditionExpression=Key("PK").eq(PLATE_INDEX_PK) & Key("SK").begins_with(normalized),
+                Limit=limit,
+            ).get("Items", [])
+        )
+        return cast(list[dict], items)
+
+    async def backfill_plate_index(
+        self,
+        total_segments: int,
+        checkpoint: ScanCheckpoint | None = None,
+        limiter: CapacityLimiter | None = None,
+    ) -> int:
+        """
+        Write plate index items for every vehicle in the table.
+
+        Each write is conditioned on the vehicle still existing, so a vehicle deleted
+        while the backfill runs does not leave an index item behind. Safe to re-run.
+        """
+        indexed = 0
+        async for page in parallel_scan(
+            self.table,
+            total_segments,
+            checkpoint,
+            limiter,
+            FilterExpression=Attr("SK").begins_with("VEHICLE#"),
+        ):
+            written = await asyncio.gather(*(self._index_one(item) for item in page.items))
+            indexed += sum(written)
+        return indexed
+
+    async def _index_one(self, item: dict) -> bool:
+        user_id = item["PK"].removeprefix("USER#")
+        vehicle = Vehicle(**cast(dict, item))
+        try:
+            await to_thread(lambda: self._index_plate(item, vehicle, user_id))
+        except self.table.meta.client.exceptions.TransactionCanceledException:
+            logger.info("vehicle deleted during plate backfill", extra={"pk": item["PK"], "sk": item["SK"]})
+            return False
+        return True
+
+    def _index_plate(self, item: dict, vehicle: Vehicle, user_id: str):
+        self.table.meta.client.transact_write_items(
+            TransactItems=[
+                {
+                    "ConditionCheck": {
+                        "TableName": TABLE,
+                        "Key": {"PK": item["PK"], "SK": item["SK"]},
+                        "ConditionExpression": "attribute_exists(PK)",
+                    }
+                },
+                {
+                    "Put": {
+                        "TableName": TABLE,
+                        "Item": plate_index_item(vehicle, user_id),
+                    }
+                },
+            ]
+        )
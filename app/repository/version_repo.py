@@ -0,0 +1,82 @@
+from asyncio import to_thread
+from typing import Annotated, cast
+
+from boto3.dynamodb.conditions import Key
+from fastapi import Depends
+from mypy_boto3_dynamodb.service_resource import DynamoDBServiceResource
+from mypy_boto3_dynamodb.type_defs import TransactWriteItemTypeDef, UpdateTypeDef
+
+from app.constants import TABLE
+from app.dependencies import get_db
+from app.repository.circuit_breaker import serve_stale
+from app.metrics.dynamodb import instrument_repository
+
+VERSION_PK = "VERSION"
+BUILDINGS_SCOPE = "BUILDINGS"
+OFFICES_SCOPE = "OFFICES"
+
+
+def building_scope(building_id: str) -> str:
+    return f"BUILDING#{building_id}"
+
+
+def _version_update(scope: str) -> UpdateTypeDef:
+    return UpdateTypeDef(
+        Key={
+            "PK": VERSION_PK,
+            "SK": scope,
+        },
+        UpdateExpression="ADD Version :one",
+        ExpressionAttributeValues={
+            ":one": 1,
+        },
+        TableName=TABLE,
+    )
+
+
+def version_bump(scope: str) -> TransactWriteItemTypeDef:
+    return {"Update": _version_update(scope)}
+
+
+def bump_versions(client, *scopes: str) -> None:
+    """Bump version counters outside a transaction, for write paths that are not transactional."""
+    for scope in scopes:
+        client.update_item(**_version_update(scope))
+
+
+@instrument_repository
+class VersionRepository:
+    def __init__(self, db: Annotated[DynamoDBServiceResource, Depends(get_db)]):
+        self.db = db
+        self.table = db.Table(TABLE)
+
+    @serve_stale
+    async def get_version(self, scope: str) -> int:
+        item = await to_thread(
+            lambda: self.table.get_item(
+                Key={
+                    "PK": VERSION_PK,
+                    "SK": scope,
+                },
+                ProjectionExpression="Version",
+            ).get("Item")
+        )
+
+        if item is None:
+            return 0
+
+        return int(cast(dict, item).get("Version", 0))
+
+    @serve_stale
+    async def get_versions(self) -> dict[str, int]:
+        items = await to_thread(
+            lambda: self.table.query(
+                KeyConditionExpression=Key("PK").eq(VERSION_PK),
+                ProjectionExpression="SK, Version",
+            ).get("Items", [])
+        )
+
+        return {str(i["SK"]): int(i.get("Version", 0)) for i in cast(list[dict], items)}
+
+    async def bump(self, *scopes: str):
+        await to_thread(lambda: bump_versions(self.table.meta.client, *scopes))
@@ -0,0 +1,89 @@
+import datetime
+import threading
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query, Request
+from starlette.responses import PlainTextResponse
+
+from app.constants import (
+    ACTIVE_PARKINGS_MAX_PAGE_SIZE,
+    ACTIVE_PARKINGS_PAGE_SIZE,
+    PLATE_SEARCH_LIMIT,
+    PLATE_SEARCH_MAX_LIMIT,
+    PROFILER_DEFAULT_INTERVAL_MS,
+    PROFILER_MAX_SECONDS,
+)
+from app.dependencies import get_user
+from app.dto.login import UserJWT
+from app.dto.parking import ActiveParkingsPageDTO
+from app.dto.utilization import UtilizationResponseDTO
+from app.dto.vehicle import PlateSearchResultDTO
+from app.metrics import profiler
+from app.metrics.loop_monitor import LoopMonitor
+from app.models.roles import Roles
+from app.repository.circuit_breaker import dynamodb_breaker
+from app.services.parking import ParkingService
+from app.services.utilization import UtilizationService
+from app.services.vehicle import VehicleService
+from app.utils.serialization import dto_response
+
+router = APIRouter()
+
+
+@router.get("/diagnostics")
+async def get_diagnostics(
+        request: Request,
+        current_user: Annotated[UserJWT, Depends(get_user([Roles.ADMIN]))],
+):
+    monitor: LoopMonitor | None = getattr(request.app.state, "loop_monitor", None)
+    snapshot = monitor.snapshot() if monitor is not None else {"running": False, "worst_stalls": []}
+
+    return {**snapshot, "dynamodb_breaker": dynamodb_breaker.snapshot()}
+
+
+@router.get("/profile", response_class=PlainTextResponse)
+async def get_profile(
+        current_user: Annotated[UserJWT, Depends(get_user([Roles.ADMIN]))],
+        seconds: Annotated[float, Query(gt=0, le=PROFILER_MAX_SECONDS)] = 5,
+        interval_ms: Annotated[float, Query(ge=1, le=1000)] = PROFILER_DEFAULT_INTERVAL_MS,
+        loop_only: bool = False,
+):
+    # this handler runs on the event loop thread, so its ident is the loop's
+    thread_ids = {threading.get_ident()} if loop_only else None
+    samples = await profiler.profile(seconds, interval_ms / 1000, thread_ids)
+
+    return PlainTextResponse(content=profiler.render_collapsed(samples))
+
+
+@router.get("/buildings/{building_id}/active-parkings")
+async def get_active_parkings(
+        building_id: str,
+        current_user: Annotated[UserJWT, Depends(get_user([Roles.ADMIN]))],
+        parking_service: Annotated[ParkingService, Depends(ParkingService)],
+        limit: Annotated[int, Query(ge=1, le=ACTIVE_PARKINGS_MAX_PAGE_SIZE)] = ACTIVE_PARKINGS_PAGE_SIZE,
+        cursor: str | None = None,
+):
+    page = await parking_service.get_active_parkings(building_id=building_id, limit=limit, cursor=cursor)
+    return dto_response(page, ActiveParkingsPageDTO)
+
+
+@router.get("/vehicles")
+async def search_vehicles(
+        plate: Annotated[str, Query(min_length=1, max_length=20)],
+        current_user: Annotated[UserJWT, Depends(get_user([Roles.ADMIN]))],
+        vehicle_service: Annotated[VehicleService, Depends(VehicleService)],
+        limit: Annotated[int, Query(ge=1, le=PLATE_SEARCH_MAX_LIMIT)] = PLATE_SEARCH_LIMIT,
+):
+    return dto_response(await vehicle_service.search_by_plate(prefix=plate, limit=limit), list[PlateSearchResultDTO])
+
+
+@router.get("/buildings/{building_id}/utilization")
+async def get_utilization(
+        building_id: str,
+        start: datetime.date,
+        end: datetime.date,
+        current_user: Annotated[UserJWT, Depends(get_user([Roles.ADMIN]))],
+        utilization_service: Annotated[UtilizationService, Depends(UtilizationService)],
+):
+    heatmap = await utilization_service.get_heatmap(building_id=building_id, start=start, end=end)
+    return dto_response(heatmap, UtilizationResponseDTO)
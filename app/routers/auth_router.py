@@ -1,3 +1,4 @@
+import logging
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, Response, status
@@ -8,6 +9,8 @@ from app.dto.login import JwtDTO, LoginDTO
 from app.dto.register import RegisterDTO
 from app.services.auth import AuthService
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 
@@ -16,7 +19,7 @@ async def login(
     request: LoginDTO,
     auth_service: Annotated[AuthService, Depends(AuthService)]
 ):
-    print(request)
+    logger.debug("login attempt", extra={"email": request.email})
     token = await auth_service.login(request)
     return JwtDTO(jwt=token)
 
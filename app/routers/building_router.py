@@ -1,16 +1,24 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from starlette import status
-from starlette.responses import JSONResponse
 
 from app.dependencies import get_user
-from app.dto.building import AddBuildingRequestDTO, AddFloorRequestDTO
+from app.dto.building import (
+    AddBuildingRequestDTO,
+    AddFloorRequestDTO,
+    BuildingResponseDTO,
+    FloorResponseDTO,
+    SlotResponseDTO,
+)
 from app.dto.login import UserJWT
 from app.models.roles import Roles
 from app.services.building import BuildingService
 from app.services.office import OfficeService
+from app.services.version import VersionService
 from app.dto.office import AddOfficeRequestDTO
+from app.utils.etag import etag_matches, not_modified, set_etag
+from app.utils.serialization import ORJSONResponse, dto_response
 
 router = APIRouter()
 
@@ -23,7 +31,7 @@ async def add_building(
 ):
     await building_service.add_building(req)
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_201_CREATED,
         content={"message": "Building added successfully"},
     )
@@ -31,10 +39,18 @@ async def add_building(
 
 @router.get("/")
 async def get_buildings(
+        request: Request,
+        response: Response,
         current_user: Annotated[UserJWT, Depends(get_user([Roles.ADMIN]))],
         building_service: Annotated[BuildingService, Depends(BuildingService)],
+        version_service: Annotated[VersionService, Depends(VersionService)],
 ):
-    return await building_service.get_buildings()
+    etag = await version_service.get_buildings_etag()
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+
+    set_etag(response, etag)
+    return dto_response(await building_service.get_buildings(), list[BuildingResponseDTO], response)
 
 
 @router.post("/{building_id}/floors")
@@ -46,7 +62,7 @@ async def add_floor(
 ):
     await building_service.add_floor(building_id=building_id, req=req)
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_201_CREATED,
         content={"message": "Floor added successfully"},
     )
@@ -55,20 +71,37 @@ async def add_floor(
 @router.get("/{building_id}/floors")
 async def get_floors(
         building_id: str,
+        request: Request,
+        response: Response,
         current_user: Annotated[UserJWT, Depends(get_user([Roles.ADMIN]))],
         building_service: Annotated[BuildingService, Depends(BuildingService)],
+        version_service: Annotated[VersionService, Depends(VersionService)],
 ):
-    return await building_service.get_floors(building_id=building_id)
+    etag = await version_service.get_building_etag(building_id, "floors")
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+
+    set_etag(response, etag)
+    return dto_response(await building_service.get_floors(building_id=building_id), list[FloorResponseDTO], response)
 
 
 @router.get("/{building_id}/floors/{floor_id}/slots")
 async def get_slots(
     building_id: str,
     floor_id: int,
+    request: Request,
+    response: Response,
     current_user: Annotated[UserJWT, Depends(get_user([Roles.ADMIN]))],
     building_service: Annotated[BuildingService, Depends(BuildingService)],
+    version_service: Annotated[VersionService, Depends(VersionService)],
 ):
-    return await building_service.get_slots(building_id=building_id, floor_number=floor_id)
+    etag = await version_service.get_building_etag(building_id, "slots", floor_id)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+
+    set_etag(response, etag)
+    slots = await building_service.get_slots(building_id=building_id, floor_number=floor_id)
+    return dto_response(slots, list[SlotResponseDTO], response)
 
 
 @router.post("/{building_id}/offices", tags=["offices"])
@@ -80,7 +113,7 @@ async def add_office(
 ):
     office_id = await office_service.add_office(building_id=building_id, req=req)
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_201_CREATED,
         content={"officeId": office_id},
     )
@@ -95,7 +128,7 @@ async def delete_office(
 ):
     await office_service.delete_office(building_id=building_id, office_id=office_id)
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_200_OK,
         content={"message": "Office deleted successfully"},
     )
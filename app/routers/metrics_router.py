@@ -0,0 +1,14 @@
+from fastapi import APIRouter
+from starlette.responses import PlainTextResponse
+
+from app.metrics import registry
+
+router = APIRouter()
+
+
+@router.get("/metrics", tags=["health"], response_class=PlainTextResponse)
+async def get_metrics():
+    return PlainTextResponse(
+        content=registry.render(),
+        media_type="text/plain; version=0.0.4",
+    )
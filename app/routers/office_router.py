@@ -1,14 +1,26 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 
+from app.dto.office import OfficeResponseDTO
 from app.services.office import OfficeService
+from app.services.version import VersionService
+from app.utils.etag import etag_matches, not_modified, set_etag
+from app.utils.serialization import dto_response
 
 router = APIRouter()
 
 
 @router.get("/")
 async def get_all_offices(
+        request: Request,
+        response: Response,
         office_service: Annotated[OfficeService, Depends(OfficeService)],
+        version_service: Annotated[VersionService, Depends(VersionService)],
 ):
-    return await office_service.get_offices()
+    etag = await version_service.get_offices_etag()
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+
+    set_etag(response, etag)
+    return dto_response(await office_service.get_offices(), list[OfficeResponseDTO], response)
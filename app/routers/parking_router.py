@@ -1,17 +1,23 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, Query, Response
 from starlette import status
-from starlette.responses import JSONResponse
+from starlette.responses import StreamingResponse
+
+from app.constants import PARKINGS_MAX_PAGE_SIZE
 
 from app.dependencies import get_user
 from app.dto.login import UserJWT
-from app.dto.parking import ParkRequestDTO
+from app.dto.parking import ParkRequestDTO, ParkingHistoryResponseDTO
 from app.models.roles import Roles
 from app.services.parking import ParkingService
+from app.utils.serialization import ORJSONResponse, dto_response, serializer
 
 router = APIRouter()
 
+NDJSON = "application/x-ndjson"
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
 
 @router.post("/")
 async def park_vehicle(
@@ -21,7 +27,7 @@ async def park_vehicle(
 ):
     ticket_id = await parking_service.park(user_id=current_user.id, user_email=current_user.email, req=req)
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_201_CREATED,
         content={"ticketId": ticket_id},
     )
@@ -29,12 +35,29 @@ async def park_vehicle(
 
 @router.get("/")
 async def get_parkings(
+        response: Response,
         current_user: Annotated[UserJWT, Depends(get_user([Roles.CUSTOMER]))],
         parking_service: Annotated[ParkingService, Depends(ParkingService)],
         start_time: int | None = None,
         end_time: int | None = None,
+        limit: Annotated[int | None, Query(ge=1, le=PARKINGS_MAX_PAGE_SIZE)] = None,
+        cursor: str | None = None,
+        accept: Annotated[str | None, Header()] = None,
 ):
-    return await parking_service.get_parkings(user_id=current_user.id, start_time=start_time, end_time=end_time)
+    # NDJSON clients get the whole range, one line per session, written as pages are read
+    if accept and NDJSON in accept:
+        items = parking_service.stream_parkings(user_id=current_user.id, start_time=start_time, end_time=end_time)
+        line = serializer(ParkingHistoryResponseDTO)
+        return StreamingResponse((line.dump_json(item, by_alias=True) + b"\n" async for item in items), media_type=NDJSON)
+
+    # without limit or cursor: the whole range in one response, as before pagination
+    parkings, next_cursor = await parking_service.get_parkings(
+        user_id=current_user.id, start_time=start_time, end_time=end_time, limit=limit, cursor=cursor
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+    return dto_response(parkings, list[ParkingHistoryResponseDTO], response)
 
 
 @router.patch("/{numberplate}/unpark")
@@ -45,7 +68,7 @@ async def unpark_vehicle(
 ):
     await parking_service.unpark(user_id=current_user.id, numberplate=numberplate)
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_200_OK,
         content={"message": "Vehicle unparked successfully"},
     )
@@ -1,15 +1,15 @@
 from typing import Annotated
 
 from starlette import status
-from starlette.responses import JSONResponse
 
-from app.dto.vehicle import AddVehicleRequestDTO
+from app.dto.vehicle import AddVehicleRequestDTO, VehicleResponseDTO
 from fastapi import APIRouter, Depends
 
 from app.dto.login import UserJWT
 from app.models.roles import Roles
 from app.services.vehicle import VehicleService
 from app.dependencies import get_user
+from app.utils.serialization import ORJSONResponse, dto_response
 
 router = APIRouter()
 
@@ -18,7 +18,7 @@ async def get_vehicles(
         vehicle_service: Annotated[VehicleService, Depends(VehicleService)],
         current_user: Annotated[UserJWT, Depends(get_user([Roles.CUSTOMER]))]):
     vehicles = await vehicle_service.get_vehicles_by_user(current_user.id)
-    return vehicles
+    return dto_response(vehicles, list[VehicleResponseDTO])
 
 @router.post("/")
 async def add_vehicle(
@@ -31,7 +31,7 @@ async def add_vehicle(
         user_id=current_user.id
     )
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_201_CREATED,
         content={
             "message": "Vehicle added successfully",
@@ -45,7 +45,7 @@ async def delete_vehicle(
         vehicle_service: Annotated[VehicleService, Depends(VehicleService)]):
     await vehicle_service.delete_vehicle(number_plate=numberplate, user_id=current_user.id)
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_200_OK,
         content={
             "message": "Vehicle deleted successfully",
@@ -1,4 +1,3 @@
-from functools import lru_cache
 from typing import Annotated, Dict
 
 from fastapi import Depends
@@ -22,15 +21,12 @@ class BillingService:
         self.billing_repo = billing_repo
         self.building_repo = building_repo
 
-    @lru_cache(maxsize=128)
-    async def _get_building_name(self, building_id: str) -> str:
-        building = await self.building_repo.get_building_by_id(building_id)
-        return building.name
-
     async def _bill_to_response(self, *, bill: Bill, user_email: str) -> BillResponseDTO:
+        buildings = await self.building_repo.get_buildings_by_ids([i.building_id for i in bill.parking_history])
+
         history: list[BillParkingHistoryDTO] = []
         for item in bill.parking_history:
-            building_name = await self._get_building_name(item.building_id)
+            building_name = buildings[item.building_id].name
             history.append(
                 BillParkingHistoryDTO.from_raw(
                     ticket_id=item.ticket_id,
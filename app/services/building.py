@@ -69,12 +69,13 @@ class BuildingService:
         await self.building_repo.get_building_by_id(building_id)
 
         floors = await self.floor_repo.get_floors(building_id)
+        offices = await self.office_repo.get_offices_by_ids([f.office_id for f in floors if f.office_id])
         floor_responses: list[FloorResponseDTO] = []
 
         for floor in floors:
             assigned_office = None
-            if floor.office_id:
-                office = await self.office_repo.get_office_by_id(floor.office_id)
+            office = offices.get(floor.office_id) if floor.office_id else None
+            if office is not None:
                 assigned_office = office.office_name
 
             floor_responses.append(
@@ -96,34 +97,35 @@ class BuildingService:
         if not any(f.floor_number == floor_number for f in floors):
             raise WebException(status_code=status.HTTP_404_NOT_FOUND, message="Floor not found", error_code=DB_ERROR)
 
-        slots = await self.slot_repo.get_slots_by_floor(
+        grid = await self.slot_repo.get_floor_grid(
             Floor(building_id=building_id, FloorNumber=floor_number)
         )
 
         slot_responses: list[SlotResponseDTO] = []
 
-        for slot in slots:
+        for position, slot_id in enumerate(grid.slot_ids):
             parking_status = None
-            if slot.occupied_by is not None:
+            occupant = grid.occupants.get(position)
+            if occupant is not None:
                 parked_at_iso = (
-                    datetime.datetime.fromtimestamp(slot.occupied_by.start_time, tz=datetime.timezone.utc)
+                    datetime.datetime.fromtimestamp(occupant.start_time, tz=datetime.timezone.utc)
                     .isoformat()
                     .replace("+00:00", "Z")
                 )
                 parking_status = ParkingStatusResponseDTO(
-                    numberPlate=slot.occupied_by.number_plate,
+                    numberPlate=occupant.number_plate,
                     parkedAt=parked_at_iso,
-                    userName=slot.occupied_by.username,
-                    userEmail=slot.occupied_by.email,
+                    userName=occupant.username,
+                    userEmail=occupant.email,
                 )
 
             slot_responses.append(
                 SlotResponseDTO(
                     buildingId=building_id,
                     floorNumber=floor_number,
-                    slotNumber=slot.slot_id,
-                    slotType=slot.slot_type.value,
-                    isAssigned=slot.is_assigned,
+                    slotNumber=slot_id,
+                    slotType=grid.slot_type(position).value,
+                    isAssigned=grid.is_assigned(position),
                     parkingStatus=parking_status,
                 )
             )
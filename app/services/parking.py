@@ -1,22 +1,34 @@
+import logging
 from dns.rdtypes.util import priority_processing_order
 from pydantic import ValidationError
 import datetime
 import uuid
-from typing import Annotated
+from typing import Annotated, AsyncIterator
 
 from fastapi import Depends
 
 from starlette import  status
-from app.dto.parking import ParkRequestDTO, ParkingHistoryResponseDTO
+from app.constants import PARKINGS_PAGE_SIZE, PARKINGS_STREAM_PAGE_SIZE
+from app.dto.parking import (
+    ActiveParkingResponseDTO,
+    ActiveParkingsPageDTO,
+    ParkRequestDTO,
+    ParkingHistoryResponseDTO,
+)
 from app.errors.web_exception import WebException, DB_ERROR, CONFLICT_ERROR
+from app.models.building import Building
 from app.models.parking_history import ParkingHistory
 from app.models.slot import OccupantDetails
 from app.repository.building_repo import BuildingRepository
 from app.repository.parking_repo import ParkingRepository
 from app.repository.slot_repo import SlotRepository
 from app.repository.vehicle_repo import VehicleRepository
+from app.utils.pagination import decode_cursor, encode_cursor
 from app.utils.singleton import singleton
 
+logger = logging.getLogger(__name__)
+
+
 class ParkingService:
     def __init__(
             self,
@@ -62,7 +74,7 @@ class ParkingService:
         try:
             await self.parking_repo.unpark_by_numberplate(user_id, numberplate)
         except ValidationError as e:
-            print(e.errors())
+            logger.error("invalid parking item on unpark", extra={"user_id": user_id, "errors": e.errors()})
             raise
 
         # Clear slot occupancy for assigned slot
@@ -76,31 +88,102 @@ class ParkingService:
         #         is_occupied=False,
         #     )
 
-    async def get_parkings(self, user_id: str, start_time: int | None = None, end_time: int | None = None) -> list[ParkingHistoryResponseDTO]:
+    async def get_parkings(
+            self,
+            user_id: str,
+            start_time: int | None = None,
+            end_time: int | None = None,
+            limit: int | None = None,
+            cursor: str | None = None,
+    ) -> tuple[list[ParkingHistoryResponseDTO], str | None]:
+        """
+        One page of the user's history, newest first, and the cursor of the next page.
+
+        Without a limit or a cursor the whole range is returned with no cursor,
+        as it was before the history was paginated.
+        """
+        if limit is None and cursor is None:
+            return [r async for r in self.stream_parkings(user_id, start_time, end_time)], None
+
+        # a cursor only continues the listing it came from
+        scope = f"parkings:{user_id}:{start_time}:{end_time}"
+        start_time, end_time = self._history_range(start_time, end_time)
+
+        records, position = await self.parking_repo.get_parking_history_page(
+            user_id, start_time, end_time, limit=limit or PARKINGS_PAGE_SIZE, position=decode_cursor(cursor, scope)
+        )
+
+        return await self._to_responses(records), encode_cursor(position, scope)
+
+    async def stream_parkings(
+            self,
+            user_id: str,
+            start_time: int | None = None,
+            end_time: int | None = None,
+    ) -> AsyncIterator[ParkingHistoryResponseDTO]:
+        """The user's whole history, newest first, read and yielded a page at a time."""
+        start_time, end_time = self._history_range(start_time, end_time)
+        position = None
+        buildings: dict[str, Building] = {}
+
+        while True:
+            records, position = await self.parking_repo.get_parking_history_page(
+                user_id, start_time, end_time, limit=PARKINGS_STREAM_PAGE_SIZE, position=position
+            )
+            for response in await self._to_responses(records, buildings):
+                yield response
+            if position is None:
+                return
+
+    @staticmethod
+    def _history_range(start_time: int | None, end_time: int | None) -> tuple[int, int]:
         if start_time is None:
             start_time = 0
         if end_time is None:
             end_time = int(datetime.datetime.now(tz=datetime.timezone.utc).timestamp())
+        return start_time, end_time
 
-        records = await self.parking_repo.get_parking_history(user_id, start_time, end_time)
-
-        responses: list[ParkingHistoryResponseDTO] = []
-        for record in records:
-            building = await self.building_repo.get_building_by_id(record.building_id)
-
-            responses.append(
-                ParkingHistoryResponseDTO.from_model(
-                    ticket_id=record.parking_id,
-                    number_plate=record.numberplate,
-                    building_id=record.building_id,
-                    building_name=building.name,
-                    floor_number=record.floor_number,
-                    slot_number=record.slot_id,
-                    start_time=record.start_time,
-                    end_time=record.end_time,
-                    vehicle_type=str(record.vehicle_type) if record.vehicle_type else "",
-                )
+    async def _to_responses(
+            self,
+            records: list[ParkingHistory],
+            buildings: dict[str, Building] | None = None,
+    ) -> list[ParkingHistoryResponseDTO]:
+        # ``buildings`` carries names already looked up for earlier pages of a stream
+        buildings = buildings if buildings is not None else {}
+        missing = [r.building_id for r in records if r.building_id not in buildings]
+        buildings.update(await self.building_repo.get_buildings_by_ids(missing))
+
+        return [
+            ParkingHistoryResponseDTO.from_model(
+                ticket_id=record.parking_id,
+                number_plate=record.numberplate,
+                building_id=record.building_id,
+                building_name=buildings[record.building_id].name,
+                floor_number=record.floor_number,
+                slot_number=record.slot_id,
+                start_time=record.start_time,
+                end_time=record.end_time,
+                vehicle_type=str(record.vehicle_type) if record.vehicle_type else "",
             )
-        responses.sort(key=lambda x: x.start_time, reverse=True)
-
-        return responses
+            for record in records
+        ]
+
+    async def get_active_parkings(self, building_id: str, limit: int, cursor: str | None = None) -> ActiveParkingsPageDTO:
+        scope = f"active-parkings:{building_id}"
+        parkings, last_key = await self.parking_repo.get_active_parkings(building_id, limit, decode_cursor(cursor, scope))
+
+        return ActiveParkingsPageDTO(
+            Items=[
+                ActiveParkingResponseDTO.from_model(
+                    ticket_id=p.parking_id,
+                    user_id=p.user_id,
+                    number_plate=p.numberplate,
+                    floor_number=p.floor_number,
+                    slot_number=p.slot_id,
+                    start_time=p.start_time,
+                    vehicle_type=str(p.vehicle_type) if p.vehicle_type else "",
+                )
+                for p in parkings
+            ],
+            NextCursor=encode_cursor(last_key, scope),
+        )
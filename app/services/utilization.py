@@ -0,0 +1,49 @@
+import datetime
+from collections import defaultdict
+from typing import Annotated
+
+import numpy as np
+from fastapi import Depends
+from starlette import status
+
+from app.constants import UTILIZATION_MAX_DAYS
+from app.dto.utilization import FloorHeatmapDTO, UtilizationResponseDTO
+from app.errors.web_exception import VALIDATION_ERROR, WebException
+from app.repository.rollup_repo import ARRIVALS_DTYPE, OCCUPIED_DTYPE, RollupRepository, decode_hours
+from app.utils.occupancy import HOUR
+
+
+class UtilizationService:
+    def __init__(self, rollup_repo: Annotated[RollupRepository, Depends(RollupRepository)]):
+        self.rollup_repo = rollup_repo
+
+    async def get_heatmap(self, building_id: str, start: datetime.date, end: datetime.date) -> UtilizationResponseDTO:
+        days = (end - start).days + 1
+        if days < 1 or days > UTILIZATION_MAX_DAYS:
+            raise WebException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                message=f"Date range must be 1 to {UTILIZATION_MAX_DAYS} days, start first",
+                error_code=VALIDATION_ERROR,
+            )
+
+        by_floor: dict[int, list[dict]] = defaultdict(list)
+        for rollup in await self.rollup_repo.get_rollups(building_id, start, end):
+            by_floor[int(rollup["FloorNumber"])].append(rollup)
+
+        floors = []
+        for floor_number in sorted(by_floor):
+            rollups = sorted(by_floor[floor_number], key=lambda r: r["Day"])
+            capacity = int(rollups[-1]["Capacity"])
+            occupancy = np.stack([decode_hours(r["OccupiedSeconds"], OCCUPIED_DTYPE) for r in rollups]) / HOUR
+            utilization = occupancy / capacity if capacity else np.zeros_like(occupancy)
+
+            floors.append(FloorHeatmapDTO(
+                FloorNumber=floor_number,
+                Capacity=capacity,
+                Days=[r["Day"] for r in rollups],
+                Occupancy=occupancy.round(2).tolist(),
+                Utilization=utilization.round(4).tolist(),
+                Arrivals=np.stack([decode_hours(r["Arrivals"], ARRIVALS_DTYPE) for r in rollups]).tolist(),
+            ))
+
+        return UtilizationResponseDTO(BuildingId=building_id, Start=start.isoformat(), End=end.isoformat(), Floors=floors)
@@ -1,6 +1,6 @@
 from app.models.vehicle import AssignedSlot, VehicleType
 from uuid import uuid4
-from app.errors.web_exception import CONFLICT_ERROR, DB_ERROR
+from app.errors.web_exception import CONFLICT_ERROR, DB_ERROR, VALIDATION_ERROR
 from app.errors.web_exception import WebException
 from app.models.floor import Floor
 from app.dto.vehicle import AddVehicleRequestDTO
@@ -9,12 +9,12 @@ from starlette import status
 
 from fastapi.params import Depends
 
-from app.dto.vehicle import VehicleResponseDTO
+from app.dto.vehicle import PlateSearchResultDTO, VehicleResponseDTO
 from app.models.vehicle import Vehicle
 from app.repository.building_repo import BuildingRepository
 from app.repository.office_repo import OfficeRepository
 from app.repository.slot_repo import SlotRepository
-from app.repository.vehicle_repo import VehicleRepository
+from app.repository.vehicle_repo import VehicleRepository, normalize_plate
 from app.utils.singleton import singleton
 
 class VehicleService:
@@ -33,6 +33,10 @@ class VehicleService:
     async def get_vehicles_by_user(self, user_id:str)->list[VehicleResponseDTO]:
         vehicles = await self.vehicle_repo.get_vehicles_by_user_id(user_id)
 
+        buildings = await self.building_repo.get_buildings_by_ids(
+            [v.assigned_slot.building_id for v in vehicles if v.assigned_slot is not None]
+        )
+
         vehicle_response: list[VehicleResponseDTO] = []
         for v in vehicles:
             if v.assigned_slot is None:
@@ -48,7 +52,7 @@ class VehicleService:
                     )
                 )
             else:
-                building = await self.building_repo.get_building_by_id(v.assigned_slot.building_id)
+                building = buildings[v.assigned_slot.building_id]
                 vehicle_response.append(
                     VehicleResponseDTO(
                         number_plate=v.number_plate,
@@ -107,4 +111,23 @@ class VehicleService:
         if vehicle is None:
             raise WebException(status_code=status.HTTP_404_NOT_FOUND, message="Vehicle not found", error_code=DB_ERROR)
 
-        await self.vehicle_repo.delete_vehicle(user_id, number_plate)
\ No newline at end of file
+        await self.vehicle_repo.delete_vehicle(user_id, number_plate)
+
+    async def search_by_plate(self, prefix: str, limit: int) -> list[PlateSearchResultDTO]:
+        if not normalize_plate(prefix):
+            raise WebException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                message="Numberplate search needs at least one letter or digit",
+                error_code=VALIDATION_ERROR,
+            )
+
+        items = await self.vehicle_repo.search_by_plate(prefix, limit)
+
+        return [
+            PlateSearchResultDTO(
+                number_plate=item["Numberplate"],
+                vehicle_type=item["VehicleType"],
+                user_id=item["UserId"],
+            )
+            for item in items
+        ]
@@ -0,0 +1,35 @@
+from typing import Annotated
+
+from fastapi import Depends
+
+from app.repository.version_repo import (
+    BUILDINGS_SCOPE,
+    OFFICES_SCOPE,
+    VersionRepository,
+    building_scope,
+)
+from app.utils.etag import make_etag
+
+
+class VersionService:
+    def __init__(self, version_repo: Annotated[VersionRepository, Depends(VersionRepository)]):
+        self.version_repo = version_repo
+
+    async def get_buildings_etag(self) -> str:
+        # the building list changes with its own counter and with every building's
+        # availability, so fold all counters into one tag instead of a global hot item
+        versions = await self.version_repo.get_versions()
+        relevant = sorted(
+            (scope, version)
+            for scope, version in versions.items()
+            if scope == BUILDINGS_SCOPE or scope.startswith("BUILDING#")
+        )
+        return make_etag("buildings", *(f"{s}={v}" for s, v in relevant))
+
+    async def get_building_etag(self, building_id: str, *parts: object) -> str:
+        version = await self.version_repo.get_version(building_scope(building_id))
+        return make_etag("building", building_id, version, *parts)
+
+    async def get_offices_etag(self) -> str:
+        version = await self.version_repo.get_version(OFFICES_SCOPE)
+        return make_etag("offices", version)
@@ -0,0 +1,167 @@
+"""
+Admission control: per-user rate limits and per-route-class concurrency caps.
+
+AdmissionMiddleware decides whether to run a request before routing, and so
+before any repository work. Two checks apply, in this order:
+
+- every route class (see route_class) has a cap on requests in flight in this
+  worker. A full class is a 503, so a flood of one kind of request (say history
+  reads) cannot take all the DynamoDB capacity from parks and unparks. A request
+  shed here does not use up a rate-limit token.
+- every caller has a token bucket (RATE_LIMIT_PER_SECOND refill, RATE_LIMIT_BURST
+  capacity), keyed by the ``id`` in its bearer token, or by client address when
+  the request carries no valid token. An empty bucket is a 429.
+
+Both responses carry Retry-After. The clock is injectable, so tests drive the
+buckets without sleeping.
+"""
+import math
+import time
+from collections import OrderedDict
+from typing import Callable
+
+from starlette import status
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.constants import (
+    ADMISSION_CONCURRENCY_LIMITS,
+    ADMISSION_EXEMPT_PATHS,
+    RATE_LIMIT_BURST,
+    RATE_LIMIT_MAX_CALLERS,
+    RATE_LIMIT_PER_SECOND,
+)
+from app.errors.web_exception import OVERLOADED_ERROR, RATE_LIMITED_ERROR
+from app.metrics import admission_rejections
+from app.utils.jwt_utils import decode_user_jwt
+from app.utils.serialization import ORJSONResponse
+
+
+class TokenBuckets:
+    """
+    One token bucket per caller, least recently seen dropped first past ``max_callers``.
+
+    A dropped caller comes back with a full bucket, which only ever errs in its favour.
+    """
+
+    def __init__(
+        self,
+        rate: float = RATE_LIMIT_PER_SECOND,
+        burst: float = RATE_LIMIT_BURST,
+        max_callers: int = RATE_LIMIT_MAX_CALLERS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.max_callers = max_callers
+        self._clock = clock
+        # caller -> (tokens, time they were counted)
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def take(self, caller: str) -> float:
+        """Take a token for ``caller``; 0 if admitted, else the seconds until a token is available."""
+        now = self._clock()
+        tokens, counted_at = self._buckets.pop(caller, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - counted_at) * self.rate)
+
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / self.rate
+
+        self._buckets[caller] = (tokens, now)
+        while len(self._buckets) > self.max_callers:
+            self._buckets.popitem(last=False)
+        return wait
+
+
+def route_class(method: str, path: str) -> str | None:
+    """The concurrency class of a request, or None for paths admission control skips."""
+    if path in ADMISSION_EXEMPT_PATHS:
+        return None
+    if path.startswith("/admin/"):
+        return "admin"
+    if method in ("GET", "HEAD"):
+        return "read"
+    return "write"
+
+
+def _caller(scope: Scope) -> str:
+    authorization = Headers(scope=scope).get("authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() == "bearer" and token:
+        try:
+            return f"user:{decode_user_jwt(token).id}"
+        except Exception:
+            # the route's own auth dependency rejects the token; until then it counts against the address
+            pass
+    return f"addr:{_client_address(scope)}"
+
+
+def _client_address(scope: Scope) -> str:
+    # behind the load balancer every connection comes from its address, so the client is
+    # the first X-Forwarded-For entry (the proxies the Dockerfile trusts for --proxy-headers)
+    forwarded = Headers(scope=scope).get("x-forwarded-for", "")
+    address = forwarded.split(",")[0].strip()
+    if address:
+        return address
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+class AdmissionMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        buckets: TokenBuckets | None = None,
+        concurrency_limits: dict[str, int] | None = None,
+    ):
+        self.app = app
+        self.buckets = buckets if buckets is not None else TokenBuckets()
+        self.concurrency_limits = concurrency_limits if concurrency_limits is not None else ADMISSION_CONCURRENCY_LIMITS
+        self.in_flight = {name: 0 for name in self.concurrency_limits}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        kind = route_class(scope["method"], scope["path"]) if scope["type"] == "http" else None
+        if kind is None:
+            await self.app(scope, receive, send)
+            return
+
+        limit = self.concurrency_limits.get(kind)
+        if limit is not None and self.in_flight[kind] >= limit:
+            admission_rejections.inc(kind, "overloaded")
+            await self._reject(
+                status.HTTP_503_SERVICE_UNAVAILABLE, "Server is busy", OVERLOADED_ERROR, 1, scope, receive, send
+            )
+            return
+
+        wait = self.buckets.take(_caller(scope))
+        if wait > 0:
+            admission_rejections.inc(kind, "rate_limited")
+            await self._reject(
+                status.HTTP_429_TOO_MANY_REQUESTS, "Too many requests", RATE_LIMITED_ERROR, wait, scope, receive, send
+            )
+            return
+
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        self.in_flight[kind] += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.in_flight[kind] -= 1
+
+    @staticmethod
+    async def _reject(status_code: int, message: str, error_code: int, retry_after: float, scope, receive, send):
+        response = ORJSONResponse(
+            status_code=status_code,
+            content={"message": message, "code": error_code},
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+        await response(scope, receive, send)
@@ -0,0 +1,228 @@
+"""
+Response compression with Accept-Encoding negotiation.
+
+CompressionMiddleware compresses JSON and NDJSON responses with brotli when the
+client accepts it and the brotli package is installed, otherwise with gzip.
+Responses smaller than COMPRESSION_MIN_SIZE are sent as they are, since the
+framing costs more than it saves.
+
+A response that carries an ETag is the same document for as long as the ETag is
+(see app.utils.etag), so its compressed body is kept in a PrecompressedCache
+under the path, query, ETag and encoding. The compressed copy goes out under
+its own ETag (see encoded_etag), since its bytes differ from the identity one. Clients polling the building list or a
+floor's slots without If-None-Match then get the cached bytes instead of paying
+for compression again. ETags here name a document whoever asks for it, which is
+what makes sharing entries between callers safe.
+
+Streamed responses (the NDJSON parkings stream) are compressed chunk by chunk,
+flushing after each chunk so clients can read lines as they arrive; they are
+never cached.
+"""
+import gzip
+import zlib
+from collections import OrderedDict
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.constants import (
+    COMPRESSION_BROTLI_QUALITY,
+    COMPRESSION_CACHE_BYTES,
+    COMPRESSION_GZIP_LEVEL,
+    COMPRESSION_MIN_SIZE,
+)
+from app.metrics import compressed_responses
+from app.utils.etag import encoded_etag
+
+try:
+    import brotli
+except ImportError:  # optional: without it only gzip is offered
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+
+def supported_encodings() -> tuple[str, ...]:
+    """Encodings this process can produce, most preferred first."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate(accept_encoding: str | None) -> str | None:
+    """The encoding to use for an Accept-Encoding header, or None for identity."""
+    if not accept_encoding:
+        return None
+
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name.strip().lower()] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in supported_encodings():
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        # ties go to the earlier, preferred encoding
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        assert brotli is not None, "negotiate offers br only when brotli is installed"
+        return brotli.compress(body, quality=COMPRESSION_BROTLI_QUALITY)
+    # mtime=0 so the same body always compresses to the same bytes
+    return gzip.compress(body, compresslevel=COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+class _StreamCompressor:
+    def __init__(self, encoding: str):
+        self._brotli = None
+        self._zlib = None
+        if encoding == "br":
+            assert brotli is not None, "negotiate offers br only when brotli is installed"
+            self._brotli = brotli.Compressor(quality=COMPRESSION_BROTLI_QUALITY)
+        else:
+            # wbits 16 + MAX_WBITS writes a gzip header and trailer
+            self._zlib = zlib.compressobj(COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def chunk(self, data: bytes) -> bytes:
+        if self._brotli is not None:
+            return self._brotli.process(data) + self._brotli.flush()
+        assert self._zlib is not None
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self._brotli is not None:
+            return self._brotli.finish()
+        assert self._zlib is not None
+        return self._zlib.flush()
+
+
+class PrecompressedCache:
+    """Compressed bodies of ETagged responses, least recently used evicted first, bounded by total size."""
+
+    def __init__(self, max_bytes: int = COMPRESSION_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: OrderedDict[tuple, bytes] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: tuple) -> bytes | None:
+        body = self._entries.get(key)
+        if body is not None:
+            self._entries.move_to_end(key)
+        return body
+
+    def put(self, key: tuple, body: bytes):
+        if len(body) > self.max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.size -= len(previous)
+        self._entries[key] = body
+        self.size += len(body)
+        while self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= len(evicted)
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MIN_SIZE, cache: PrecompressedCache | None = None):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.cache = cache if cache is not None else PrecompressedCache()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding"))
+        start: Message | None = None
+        stream: _StreamCompressor | None = None
+        compressible = False
+
+        async def send_wrapper(message: Message):
+            nonlocal start, stream, compressible
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message.get("headers", []))
+                compressible = (
+                    200 <= message["status"] < 300
+                    and "content-encoding" not in headers
+                    and headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+                )
+                if compressible:
+                    MutableHeaders(scope=message).add_vary_header("Accept-Encoding")
+                    # hold the start until the first body message shows whether to compress
+                    start = message
+                    return
+                await send(message)
+                return
+
+            if message["type"] != "http.response.body" or not compressible:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if start is not None:
+                headers = MutableHeaders(scope=start)
+                if encoding is None or (not more_body and len(body) < self.minimum_size):
+                    await send(start)
+                    start = None
+                    compressible = False
+                    await send(message)
+                    return
+
+                headers["Content-Encoding"] = encoding
+                etag = headers.get("etag")
+                if etag is not None:
+                    headers["ETag"] = encoded_etag(etag, encoding)
+                if more_body:
+                    del headers["Content-Length"]
+                    stream = _StreamCompressor(encoding)
+                    compressed_responses.inc(encoding, "stream")
+                else:
+                    body = self._compress_whole(scope, etag, body, encoding)
+                    headers["Content-Length"] = str(len(body))
+                await send(start)
+                start = None
+                if stream is None:
+                    await send({"type": "http.response.body", "body": body, "more_body": False})
+                    return
+
+            # the start went out compressed and streaming, so the compressor exists
+            assert stream is not None
+            data = stream.chunk(body)
+            if not more_body:
+                data += stream.finish()
+            await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _compress_whole(self, scope: Scope, etag: str | None, body: bytes, encoding: str) -> bytes:
+        if etag is None:
+            compressed_responses.inc(encoding, "compressed")
+            return compress(body, encoding)
+
+        key = (scope["path"], scope.get("query_string", b""), etag, encoding)
+        cached = self.cache.get(key)
+        if cached is not None:
+            compressed_responses.inc(encoding, "cache")
+            return cached
+
+        compressed_responses.inc(encoding, "compressed")
+        compressed = compress(body, encoding)
+        self.cache.put(key, compressed)
+        return compressed
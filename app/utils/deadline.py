@@ -0,0 +1,188 @@
+"""
+Request deadlines, carried into every DynamoDB call.
+
+DeadlineMiddleware gives each request a deadline: now plus the seconds in the
+X-Request-Timeout header (capped at REQUEST_DEADLINE_MAX_SECONDS), or else the
+route's default from REQUEST_DEADLINE_ROUTE_SECONDS or REQUEST_DEADLINE_SECONDS.
+The deadline lives in a context variable, so it follows the request through
+services and repositories and into the to_thread workers that run boto3 calls,
+with nothing passed explicitly.
+
+The request runs under an asyncio timeout for the same deadline; when it passes,
+whatever is still awaited is cancelled and the client gets a 504. Streamed
+responses (the NDJSON parkings stream) would not fit one deadline however long
+the history, so each chunk sent renews it: a stream may run as long as it keeps
+producing a chunk within the deadline, which bounds each page read rather than
+the whole stream. A boto3 call
+already on a worker thread cannot be interrupted, so botocore hooks stop the
+work around it instead:
+
+- before-call refuses to start a call once the deadline has passed,
+- before-send refuses to send another attempt,
+- needs-retry refuses a retry when less than DEADLINE_MIN_ATTEMPT_SECONDS is left.
+
+Each attempt is itself bounded by the client's connect and read timeouts
+(DYNAMODB_CONNECT_TIMEOUT, DYNAMODB_READ_TIMEOUT); botocore only takes those per
+client, so they are caps sized well under the default deadline rather than
+being cut to each request's remaining time.
+"""
+import asyncio
+import logging
+import time
+from contextvars import ContextVar
+
+from botocore.config import Config
+from starlette import status
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.constants import (
+    DEADLINE_MIN_ATTEMPT_SECONDS,
+    DYNAMODB_CONNECT_TIMEOUT,
+    DYNAMODB_MAX_ATTEMPTS,
+    DYNAMODB_READ_TIMEOUT,
+    REQUEST_DEADLINE_HEADER,
+    REQUEST_DEADLINE_MAX_SECONDS,
+    REQUEST_DEADLINE_ROUTE_SECONDS,
+    REQUEST_DEADLINE_SECONDS,
+)
+from app.errors.web_exception import DEADLINE_ERROR
+from app.metrics import deadline_exceeded
+from app.utils.serialization import ORJSONResponse
+
+logger = logging.getLogger(__name__)
+
+_THROTTLING_ERRORS = {"ProvisionedThroughputExceededException", "ThrottlingException", "RequestLimitExceeded"}
+
+# time.monotonic() by which the current request must finish; None outside requests
+request_deadline: ContextVar[float | None] = ContextVar("request_deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    def __init__(self, stage: str):
+        super().__init__(f"request deadline passed ({stage})")
+        self.stage = stage
+
+
+def remaining() -> float | None:
+    """Seconds left before the current request's deadline, or None without one."""
+    deadline = request_deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def check_deadline(stage: str, margin: float = 0.0):
+    """Raise DeadlineExceeded if fewer than ``margin`` seconds are left."""
+    left = remaining()
+    if left is not None and left <= margin:
+        deadline_exceeded.inc(stage)
+        raise DeadlineExceeded(stage)
+
+
+def dynamodb_config() -> Config:
+    return Config(
+        connect_timeout=DYNAMODB_CONNECT_TIMEOUT,
+        read_timeout=DYNAMODB_READ_TIMEOUT,
+        retries={"mode": "standard", "total_max_attempts": DYNAMODB_MAX_ATTEMPTS},
+    )
+
+
+def _before_call(**kwargs):
+    check_deadline("before-call")
+
+
+def _before_send(**kwargs):
+    check_deadline("before-send")
+
+
+def _needs_retry(response, caught_exception, **kwargs):
+    if caught_exception is None:
+        if response is None:
+            return None
+        http_response, parsed = response
+        retryable = (
+            http_response.status_code >= 500
+            or parsed.get("Error", {}).get("Code") in _THROTTLING_ERRORS
+        )
+        if not retryable:
+            return None
+    check_deadline("retry", margin=DEADLINE_MIN_ATTEMPT_SECONDS)
+    return None
+
+
+def install_deadline_hooks(client):
+    """Stop DynamoDB calls, attempts and retries of ``client`` that would run past the request deadline."""
+    events = client.meta.events
+    events.register("before-call.dynamodb", _before_call, unique_id="deadline-before-call")
+    events.register("before-send.dynamodb", _before_send, unique_id="deadline-before-send")
+    # first, so a retry is refused before botocore's own handler schedules it
+    events.register_first("needs-retry.dynamodb", _needs_retry, unique_id="deadline-needs-retry")
+
+
+def route_deadline(path: str) -> float:
+    for prefix, seconds in REQUEST_DEADLINE_ROUTE_SECONDS.items():
+        if path.startswith(prefix):
+            return seconds
+    return REQUEST_DEADLINE_SECONDS
+
+
+def _requested_timeout(scope: Scope) -> float | None:
+    value = Headers(scope=scope).get(REQUEST_DEADLINE_HEADER)
+    if value is None:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        return None
+    if not seconds > 0:
+        return None
+    return min(seconds, REQUEST_DEADLINE_MAX_SECONDS)
+
+
+class DeadlineMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timeout = _requested_timeout(scope) or route_deadline(scope["path"])
+        token = request_deadline.set(time.monotonic() + timeout)
+        started = False
+        # created before the wrapper that reschedules it; entered around the app below
+        timer = asyncio.timeout(timeout)
+
+        async def send_wrapper(message: Message):
+            nonlocal started
+            if message["type"] == "http.response.start":
+                started = True
+            if message["type"] != "http.response.body" or not message.get("more_body", False):
+                await send(message)
+                return
+
+            # a streamed body gets the deadline afresh for each chunk rather than once for the
+            # whole stream, and a client slow to read a chunk does not count against it
+            timer.reschedule(None)
+            await send(message)
+            request_deadline.set(time.monotonic() + timeout)
+            timer.reschedule(asyncio.get_running_loop().time() + timeout)
+
+        try:
+            async with timer:
+                await self.app(scope, receive, send_wrapper)
+        except (TimeoutError, DeadlineExceeded) as exc:
+            if isinstance(exc, TimeoutError):
+                deadline_exceeded.inc("request")
+            if started:
+                # too late for a 504; raising makes the server drop the connection, so the
+                # client sees a broken response rather than a complete-looking short one
+                logger.warning("request deadline passed while streaming", extra={"path": scope["path"]})
+                raise
+            response = ORJSONResponse(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                content={"message": "Request deadline exceeded", "code": DEADLINE_ERROR},
+            )
+            await response(scope, receive, send)
+        finally:
+            request_deadline.reset(token)
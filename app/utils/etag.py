@@ -0,0 +1,54 @@
+import hashlib
+
+from starlette import status
+from starlette.responses import Response
+
+CACHE_CONTROL = "private, no-cache"
+# content codings app.utils.compression can add to a response, each with its own ETag suffix
+ETAG_ENCODINGS = ("br", "gzip")
+
+
+def make_etag(*parts: object) -> str:
+    digest = hashlib.sha1("|".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+    return f'"{digest[:20]}"'
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """The ETag of the same document sent with Content-Encoding ``encoding``; its bytes differ, so its tag does too."""
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def _unencoded(etag: str) -> str:
+    for encoding in ETAG_ENCODINGS:
+        suffix = f'-{encoding}"'
+        if etag.endswith(suffix):
+            return etag[:-len(suffix)] + '"'
+    return etag
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        # If-None-Match uses weak comparison, so W/"x" matches "x", and so does the
+        # tag of a compressed copy ("x-gzip"): it is the same document
+        if _unencoded(candidate.removeprefix("W/")) == etag:
+            return True
+
+    return False
+
+
+def not_modified(etag: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL},
+    )
+
+
+def set_etag(response: Response, etag: str):
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
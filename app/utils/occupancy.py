@@ -0,0 +1,41 @@
+"""
+Hourly occupancy of parking sessions, computed with NumPy.
+
+For sorted session starts s and ends e, the slot-seconds occupied up to time t are
+
+    C(t) = sum(t - s_i for s_i <= t) - sum(t - e_i for e_i <= t)
+
+and both sums come from a searchsorted plus a prefix sum, so evaluating C at every
+hour edge of a range and differencing gives occupied seconds per hour in
+O((n + hours) log n), however long or overlapping the sessions are.
+"""
+import numpy as np
+
+HOUR = 3600
+
+
+def hour_edges(range_start: int, hours: int) -> np.ndarray:
+    return range_start + HOUR * np.arange(hours + 1, dtype=np.int64)
+
+
+def _covered_until(points: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    # sum(t - p for p <= t) at each edge t; points must be sorted
+    counts = np.searchsorted(points, edges, side="right")
+    prefix = np.concatenate(([0], np.cumsum(points, dtype=np.int64)))
+    return counts * edges - prefix[counts]
+
+
+def occupied_seconds(starts, ends, range_start: int, hours: int) -> np.ndarray:
+    """Slot-seconds occupied in each hour of [range_start, range_start + hours * 3600)."""
+    starts = np.asarray(starts, dtype=np.int64)
+    ends = np.maximum(np.asarray(ends, dtype=np.int64), starts)
+    edges = hour_edges(range_start, hours)
+
+    covered = _covered_until(np.sort(starts), edges) - _covered_until(np.sort(ends), edges)
+    return np.diff(covered)
+
+
+def arrivals(starts, range_start: int, hours: int) -> np.ndarray:
+    """Sessions starting in each hour of the range."""
+    edges = hour_edges(range_start, hours)
+    return np.diff(np.searchsorted(np.sort(np.asarray(starts, dtype=np.int64)), edges, side="left"))
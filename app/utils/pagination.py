@@ -0,0 +1,63 @@
+import base64
+import hashlib
+import hmac
+import json
+from decimal import Decimal
+
+from starlette import status
+
+from app.constants import JWT_SECRET
+from app.errors.web_exception import VALIDATION_ERROR, WebException
+
+_SIGNATURE_BYTES = 12
+# cursors get their own key, derived from the JWT secret, so a cursor signature is never valid as anything else
+_CURSOR_KEY = hmac.new(JWT_SECRET.encode("utf-8"), b"parking-cursor", hashlib.sha256).digest()
+
+
+def _sign(scope: str, payload: bytes) -> bytes:
+    message = scope.encode("utf-8") + b"\0" + payload
+    return hmac.new(_CURSOR_KEY, message, hashlib.sha256).digest()[:_SIGNATURE_BYTES]
+
+
+def _default(value):
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    raise TypeError(f"cannot encode {type(value).__name__} in a cursor")
+
+
+def encode_cursor(last_evaluated_key: dict | None, scope: str) -> str | None:
+    """
+    Turn a LastEvaluatedKey into an opaque, URL-safe page token.
+
+    The token is signed together with ``scope``, which names the listing and
+    whose it is (say ``parkings:<user id>``). Clients cannot edit a token to
+    start a read from an arbitrary key, and a token from one user or endpoint
+    is rejected by another instead of reaching DynamoDB as a foreign key.
+    """
+    if not last_evaluated_key:
+        return None
+
+    payload = json.dumps(last_evaluated_key, default=_default, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    return base64.urlsafe_b64encode(_sign(scope, payload) + payload).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str | None, scope: str) -> dict | None:
+    """The ExclusiveStartKey for a token from encode_cursor; a malformed, tampered or foreign token is a 400."""
+    if not cursor:
+        return None
+
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        signature, payload = raw[:_SIGNATURE_BYTES], raw[_SIGNATURE_BYTES:]
+        if not hmac.compare_digest(signature, _sign(scope, payload)):
+            raise ValueError("bad signature")
+        key = json.loads(payload)
+        if not isinstance(key, dict):
+            raise ValueError("not a key")
+        return key
+    except ValueError:
+        raise WebException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            message="Invalid pagination cursor",
+            error_code=VALIDATION_ERROR,
+        )
@@ -0,0 +1,42 @@
+"""
+Response serialization.
+
+Routes that return DTOs normally go through FastAPI's jsonable_encoder, which
+walks every model and field in Python before the JSON is written. List routes
+instead return ``dto_response(items, list[SomeDTO], response)``: one TypeAdapter
+per response type is built on first use and then serializes straight to JSON
+bytes in pydantic-core, with aliases, as jsonable_encoder would.
+
+Everything else (dict contents, error bodies) is rendered by ORJSONResponse, the
+app's default response class.
+"""
+from functools import cache
+from typing import Any
+
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
+from starlette.responses import Response
+
+__all__ = ["ORJSONResponse", "dto_response", "serializer"]
+
+
+@cache
+def serializer(response_type: Any) -> TypeAdapter:
+    return TypeAdapter(response_type)
+
+
+def dto_response(content: Any, response_type: Any, response: Response | None = None, status_code: int = 200) -> Response:
+    """
+    A JSON response for ``content`` serialized as ``response_type``.
+
+    Headers already set on the route's injected ``response`` (ETag, cursors) are
+    carried over, since FastAPI drops them when a route returns its own Response.
+    """
+    rendered = Response(
+        content=serializer(response_type).dump_json(content, by_alias=True),
+        status_code=status_code,
+        media_type="application/json",
+    )
+    if response is not None:
+        rendered.headers.raw.extend(h for h in response.headers.raw if h[0] != b"content-length")
+    return rendered
@@ -0,0 +1,56 @@
+import asyncio
+import contextvars
+from collections import Counter
+from functools import wraps
+from typing import Any, Awaitable, Callable, Coroutine, TypeVar
+
+T = TypeVar("T")
+
+_in_flight: dict[tuple, asyncio.Task] = {}
+
+# per-method counters: "calls" is every invocation, "coalesced" the ones that
+# piggybacked on an identical request already in flight
+single_flight_calls: Counter[str] = Counter()
+single_flight_coalesced: Counter[str] = Counter()
+
+
+def single_flight(fn: Callable[..., Coroutine[Any, Any, T]]) -> Callable[..., Awaitable[T]]:
+    """
+    Share one in-flight call between concurrent identical invocations of a repository method.
+
+    The key is the method name, the repository's DynamoDB resource and the arguments
+    (``self`` itself is ignored because repositories are built per request). Followers get
+    the leader's result object, so callers must treat it as read-only.
+
+    The shared call runs in its own task, shielded from whichever caller is cancelled, and
+    in an empty context: it belongs to no one request, so the leader's deadline, capacity
+    tally and stale-read marks must not apply to it.
+    """
+    name = fn.__qualname__
+
+    @wraps(fn)
+    async def wrapper(self, *args: Any, **kwargs: Any) -> T:
+        key = (name, id(self.db), args, frozenset(kwargs.items()))
+        single_flight_calls[name] += 1
+
+        task = _in_flight.get(key)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(fn(self, *args, **kwargs), context=contextvars.Context())
+            _in_flight[key] = task
+            task.add_done_callback(lambda _: _in_flight.pop(key, None))
+        else:
+            single_flight_coalesced[name] += 1
+
+        return await asyncio.shield(task)
+
+    return wrapper
+
+
+def single_flight_stats() -> dict[str, dict[str, int]]:
+    return {
+        name: {
+            "calls": calls,
+            "coalesced": single_flight_coalesced[name],
+        }
+        for name, calls in single_flight_calls.items()
+    }
@@ -0,0 +1,111 @@
+"""
+Fast model construction for items this service wrote itself.
+
+Repositories turn DynamoDB items into models with ``from_item(Model, item, **extra)``
+instead of ``Model(**item, **extra)``. With TRUSTED_REPOSITORY_READS on, a
+function generated once per model (and set of extra fields) reads each field's
+attribute and applies only the conversions DynamoDB needs (Decimal to int, str
+to Enum, nested dicts to nested models), then fills in the instance's
+``__dict__`` directly. That skips pydantic validation, and also model_construct,
+which is slower than validating. An item the generated function cannot read
+(a missing attribute, a value int() or an Enum rejects) is validated normally,
+so such items still raise ValidationError. Values that convert but would fail
+validation (a str field holding a number, 1.5 for an int) are not caught, which
+is why this is only for items the repositories wrote.
+
+With the flag off every item is validated in full.
+"""
+import enum
+import types
+import typing
+from functools import cache
+from typing import Any, Callable, TypeVar
+
+from pydantic import BaseModel
+from pydantic_core import PydanticUndefined
+
+from app.constants import TRUSTED_REPOSITORY_READS
+
+M = TypeVar("M", bound=BaseModel)
+
+
+def _optional(convert: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    return lambda value: None if value is None else convert(value)
+
+
+def _coercer(annotation: Any) -> Callable[[Any], Any] | None:
+    """A conversion for one field's annotation, or None when values are used as they are."""
+    args = typing.get_args(annotation)
+    if typing.get_origin(annotation) in (typing.Union, types.UnionType):
+        inner = [a for a in args if a is not type(None)]
+        if len(inner) == 1:
+            convert = _coercer(inner[0])
+            return _optional(convert) if convert else None
+        return None
+    if annotation is int:
+        return int
+    if annotation is float:
+        return float
+    if isinstance(annotation, type) and issubclass(annotation, enum.Enum):
+        return annotation
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return converter(annotation)
+    return None
+
+
+@cache
+def converter(model: type[M], extra_fields: tuple[str, ...] = ()) -> Callable[..., M]:
+    """
+    Generate ``build(item, extra=None)`` for ``model``.
+
+    Fields named in ``extra_fields`` are taken from ``extra`` by field name; the
+    rest from ``item`` by alias. The generated body is one dict literal, e.g.
+    ``"slot_id": convert_3(item["SlotId"])``, since a loop over the fields costs
+    about as much as pydantic's own validation.
+    """
+    namespace: dict[str, Any] = {"model": model, "new": object.__new__, "set_attr": object.__setattr__}
+    entries = []
+    for i, (name, field) in enumerate(model.model_fields.items()):
+        alias = field.alias or name
+        if name in extra_fields:
+            value = f"extra[{name!r}]"
+        elif field.default_factory is not None:
+            namespace[f"factory_{i}"] = field.default_factory
+            value = f"(item[{alias!r}] if {alias!r} in item else factory_{i}())"
+        elif field.default is not PydanticUndefined:
+            namespace[f"default_{i}"] = field.default
+            value = f"item.get({alias!r}, default_{i})"
+        else:
+            value = f"item[{alias!r}]"
+
+        convert = None if name in extra_fields else _coercer(field.annotation)
+        if convert is not None:
+            namespace[f"convert_{i}"] = convert
+            value = f"convert_{i}({value})"
+        entries.append(f"        {name!r}: {value},")
+
+    if model.__private_attributes__ or model.model_config.get("extra") == "allow":
+        # these need pydantic's own bookkeeping; no model in app/models has either
+        construct = ["    return model.model_construct(**values)"]
+    else:
+        construct = [
+            "    instance = new(model)",
+            "    set_attr(instance, '__dict__', values)",
+            "    set_attr(instance, '__pydantic_fields_set__', set(values))",
+            "    set_attr(instance, '__pydantic_extra__', None)",
+            "    set_attr(instance, '__pydantic_private__', None)",
+            "    return instance",
+        ]
+    source = "\n".join(["def build(item, extra=None):", "    values = {", *entries, "    }", *construct])
+    exec(compile(source, f"<trusted converter for {model.__name__}>", "exec"), namespace)
+    return namespace["build"]
+
+
+def from_item(model: type[M], item: dict, **extra: Any) -> M:
+    """``model`` built from a DynamoDB item; fields in ``extra`` (by field name) take precedence."""
+    if TRUSTED_REPOSITORY_READS:
+        try:
+            return converter(model, tuple(extra))(item, extra)
+        except (KeyError, ValueError, TypeError, AttributeError):
+            pass
+    return model(**item, **extra)
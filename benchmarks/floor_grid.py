@@ -0,0 +1,67 @@
+"""
+Memory and time for holding many floors of slots.
+
+Builds ``--floors`` floors of SLOT_LAYOUT slots (a third of them occupied) from
+table-shaped items, once as lists of Slot models and once as FloorGrids, and
+reports the memory each keeps alive and how long building them took.
+
+    python -m benchmarks.floor_grid --floors 500
+"""
+import argparse
+import time
+import tracemalloc
+from decimal import Decimal
+
+from app.constants import SLOT_LAYOUT
+from app.models.floor_grid import FloorGrid
+from app.models.slot import Slot
+from app.utils.trusted_model import from_item
+
+
+def _items(floor_number: int) -> list[dict]:
+    return [
+        {
+            "PK": "BUILDING#b1",
+            "SK": f"FLOOR#{floor_number}#SLOT#{i}",
+            "SlotId": Decimal(i),
+            "SlotType": "FourWheeler" if c == "1" else "TwoWheeler",
+            "IsAssigned": i % 2 == 0,
+            "IsOccupied": i % 3 == 0,
+            "OccupiedBy": {
+                "Username": "user", "NumberPlate": f"KA01AB{i:04d}", "Email": "u@example.com",
+                "StartTime": Decimal(1735689600),
+            } if i % 3 == 0 else None,
+        }
+        for i, c in enumerate(SLOT_LAYOUT)
+    ]
+
+
+def _measure(build, floors: list[list[dict]]) -> tuple[float, float]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    kept = [build(number, items) for number, items in enumerate(floors)]
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return size, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--floors", type=int, default=500)
+    args = parser.parse_args()
+
+    floors = [_items(n) for n in range(args.floors)]
+    slot_lists = _measure(
+        lambda number, items: [from_item(Slot, item, building_id="b1", floor_number=number) for item in items], floors
+    )
+    grids = _measure(lambda number, items: FloorGrid.from_items("b1", number, items), floors)
+
+    print(f"{'representation':<16}{'memory (KiB)':>14}{'build (ms)':>12}")
+    for name, (size, elapsed) in (("list[Slot]", slot_lists), ("FloorGrid", grids)):
+        print(f"{name:<16}{size / 1024:>14.1f}{elapsed * 1e3:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Microbenchmark for the JWT verification cache.
+
+Measures the cost of the ``get_user`` dependency on its own and the overhead of a
+full authenticated request (against a route that does no other work) with the
+token cache enabled and disabled.
+
+    python -m benchmarks.jwt_cache --iterations 20000
+"""
+import argparse
+import asyncio
+import time
+
+import jwt
+from fastapi import Depends, FastAPI
+from fastapi.security import HTTPAuthorizationCredentials
+from fastapi.testclient import TestClient
+
+from app.constants import JWT_ALGORITHM, JWT_SECRET
+from app.dependencies import get_user
+from app.models.roles import Roles
+from app.utils.jwt_utils import token_cache
+
+
+def _token() -> str:
+    now = int(time.time())
+    return jwt.encode(
+        {
+            "email": "bench@example.com",
+            "id": "bench-user",
+            "role": 0,
+            "officeId": "office-1",
+            "exp": now + 3600,
+            "iat": now,
+        },
+        JWT_SECRET,
+        algorithm=JWT_ALGORITHM,
+    )
+
+
+def _bench_dependency(token: str, iterations: int) -> float:
+    dependency = get_user([Roles.CUSTOMER])
+    creds = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    async def run():
+        start = time.perf_counter()
+        for _ in range(iterations):
+            await dependency(creds)
+        return time.perf_counter() - start
+
+    return asyncio.run(run()) / iterations
+
+
+def _bench_request(token: str, iterations: int) -> float:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping(user=Depends(get_user([Roles.CUSTOMER]))):
+        return None
+
+    headers = {"Authorization": f"Bearer {token}"}
+    with TestClient(app) as client:
+        for _ in range(100):
+            client.get("/ping", headers=headers)
+        start = time.perf_counter()
+        for _ in range(iterations):
+            client.get("/ping", headers=headers)
+        return (time.perf_counter() - start) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    token = _token()
+    results = {}
+    for enabled in (False, True):
+        token_cache.clear()
+        token_cache.enabled = enabled
+        label = "cached" if enabled else "uncached"
+        results[label] = (
+            _bench_dependency(token, args.iterations),
+            _bench_request(token, max(args.iterations // 10, 100)),
+        )
+    token_cache.enabled = token_cache.maxsize > 0
+
+    print(f"{'mode':<10}{'get_user (us)':>16}{'request (us)':>16}")
+    for label, (dep, req) in results.items():
+        print(f"{label:<10}{dep * 1e6:>16.2f}{req * 1e6:>16.2f}")
+
+    dep_saved = results["uncached"][0] - results["cached"][0]
+    req_saved = results["uncached"][1] - results["cached"][1]
+    print(f"saved per request: {dep_saved * 1e6:.2f}us in get_user, {req_saved * 1e6:.2f}us end to end")
+
+
+if __name__ == "__main__":
+    main()
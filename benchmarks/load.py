@@ -0,0 +1,294 @@
+"""
+Throughput and latency benchmark for the parking API.
+
+Seeds an in-memory (moto) DynamoDB table through the repositories, then drives the
+FastAPI app in-process with a pool of async HTTP clients. Each scenario gets an
+open-loop Poisson arrival process at its own rate, so a slow endpoint shows up as
+latency and backlog rather than being hidden by a closed loop.
+
+    python -m benchmarks.load --duration 20 --rate park=20 --rate get_parkings=50 \\
+        --output bench-results.json --compare baseline.json
+
+Reports p50/p95/p99 latency, achieved throughput and error counts per scenario and
+writes them to JSON. With --compare, p95 or throughput regressions beyond
+--tolerance are flagged and the exit status is 1.
+
+moto keeps the whole table in process and its transaction code is not thread-safe,
+so a few concurrent park/unpark calls can fail with a RuntimeError; they are
+counted as errors. --executor-workers bounds the to_thread pool, and 1 makes
+runs fully serialised and reproducible. Absolute numbers reflect moto, not
+DynamoDB: compare runs against each other, not against production.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+
+import httpx
+from moto import mock_aws
+
+from benchmarks.seed import SEED_PASSWORD, SeedResult, SeededUser, create_table, seed
+
+SCENARIOS = ("park", "unpark", "get_parkings", "get_bill", "login")
+DEFAULT_RATES = {"park": 10.0, "unpark": 10.0, "get_parkings": 20.0, "get_bill": 10.0, "login": 5.0}
+BILL_MONTH = (2025, 1)
+
+
+@dataclass
+class ScenarioStats:
+    latencies: list[float] = field(default_factory=list)
+    errors: dict[str, int] = field(default_factory=dict)
+    skipped: int = 0
+
+    def record(self, latency: float, status: int | str):
+        if isinstance(status, int) and status < 400:
+            self.latencies.append(latency)
+        else:
+            self.errors[str(status)] = self.errors.get(str(status), 0) + 1
+
+    def summary(self, duration: float) -> dict:
+        ordered = sorted(self.latencies)
+        return {
+            "requests": len(ordered),
+            "throughput_rps": round(len(ordered) / duration, 2),
+            "p50_ms": _percentile_ms(ordered, 50),
+            "p95_ms": _percentile_ms(ordered, 95),
+            "p99_ms": _percentile_ms(ordered, 99),
+            "max_ms": round(ordered[-1] * 1000, 3) if ordered else None,
+            "errors": self.errors,
+            "skipped": self.skipped,
+        }
+
+
+def _percentile_ms(ordered: list[float], pct: float) -> float | None:
+    if not ordered:
+        return None
+    # nearest-rank percentile
+    index = min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))
+    return round(ordered[index] * 1000, 3)
+
+
+class Workload:
+    """Per-scenario request builders; park/unpark hand users between an idle and a parked pool."""
+
+    def __init__(self, seeded: SeedResult):
+        self.seeded = seeded
+        self.idle: asyncio.Queue[SeededUser] = asyncio.Queue()
+        self.parked: asyncio.Queue[SeededUser] = asyncio.Queue()
+        for user in seeded.users:
+            self.idle.put_nowait(user)
+
+    async def park(self, client: httpx.AsyncClient) -> int | None:
+        try:
+            user = self.idle.get_nowait()
+        except asyncio.QueueEmpty:
+            return None
+        response = await client.post(
+            "/parkings/", json={"numberplate": user.numberplate}, headers=_auth(user.token)
+        )
+        (self.parked if response.status_code < 400 else self.idle).put_nowait(user)
+        return response.status_code
+
+    async def unpark(self, client: httpx.AsyncClient) -> int | None:
+        try:
+            user = self.parked.get_nowait()
+        except asyncio.QueueEmpty:
+            return None
+        response = await client.patch(f"/parkings/{user.numberplate}/unpark", headers=_auth(user.token))
+        (self.idle if response.status_code < 400 else self.parked).put_nowait(user)
+        return response.status_code
+
+    async def get_parkings(self, client: httpx.AsyncClient) -> int:
+        user = random.choice(self.seeded.users)
+        response = await client.get("/parkings/", headers=_auth(user.token))
+        return response.status_code
+
+    async def get_bill(self, client: httpx.AsyncClient) -> int:
+        user = random.choice(self.seeded.users)
+        year, month = BILL_MONTH
+        response = await client.get(f"/billing?month={month}&year={year}", headers=_auth(user.token))
+        return response.status_code
+
+    async def login(self, client: httpx.AsyncClient) -> int:
+        user = random.choice(self.seeded.users)
+        response = await client.post("/auth/login", json={"email": user.email, "password": SEED_PASSWORD})
+        return response.status_code
+
+
+def _auth(token: str) -> dict[str, str]:
+    return {"Authorization": f"Bearer {token}"}
+
+
+async def _drive(
+    name: str,
+    rate: float,
+    duration: float,
+    workload: Workload,
+    clients: list[httpx.AsyncClient],
+    stats: ScenarioStats,
+    concurrency: asyncio.Semaphore,
+):
+    action = getattr(workload, name)
+    in_flight: set[asyncio.Task] = set()
+
+    async def one(client: httpx.AsyncClient):
+        async with concurrency:
+            start = time.perf_counter()
+            try:
+                status = await action(client)
+            except Exception as exc:
+                stats.record(time.perf_counter() - start, type(exc).__name__)
+                if stats.errors[type(exc).__name__] == 1:
+                    print(f"{name}: {exc!r}", file=sys.stderr)
+                return
+            if status is None:
+                stats.skipped += 1
+            else:
+                stats.record(time.perf_counter() - start, status)
+
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        task = asyncio.create_task(one(random.choice(clients)))
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+        await asyncio.sleep(random.expovariate(rate))
+
+    if in_flight:
+        await asyncio.gather(*in_flight)
+
+
+async def run(args) -> dict:
+    import boto3
+
+    from app.dependencies import install_dynamodb_hooks
+    from app.main import app
+
+    random.seed(args.seed)
+    if args.executor_workers:
+        from concurrent.futures import ThreadPoolExecutor
+
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=args.executor_workers))
+    db = boto3.resource("dynamodb", region_name="us-east-1")
+    create_table(db)
+    install_dynamodb_hooks(db.meta.client)
+
+    seed_start = time.perf_counter()
+    seeded = await seed(db, args.buildings, args.floors, args.users, BILL_MONTH)
+    seed_seconds = time.perf_counter() - seed_start
+
+    app.state.db = db
+    transport = httpx.ASGITransport(app=app)
+    clients = [
+        httpx.AsyncClient(transport=transport, base_url="http://bench")
+        for _ in range(args.clients)
+    ]
+    concurrency = asyncio.Semaphore(args.max_in_flight)
+    stats = {name: ScenarioStats() for name in args.rates}
+    # park and unpark hand users between the same pools, so all drivers share one workload
+    workload = Workload(seeded)
+
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(
+            _drive(name, rate, args.duration, workload, clients, stats[name], concurrency)
+            for name, rate in args.rates.items()
+            if rate > 0
+        ))
+    finally:
+        for client in clients:
+            await client.aclose()
+    elapsed = time.perf_counter() - start
+
+    return {
+        "meta": {
+            "timestamp": int(time.time()),
+            "python": platform.python_version(),
+            "backend": "moto",
+            "duration_s": round(elapsed, 2),
+            "seed_s": round(seed_seconds, 2),
+            "buildings": args.buildings,
+            "floors": args.floors,
+            "users": args.users,
+            "clients": args.clients,
+            "executor_workers": args.executor_workers,
+            "rates": args.rates,
+            "pid": os.getpid(),
+        },
+        "scenarios": {name: s.summary(elapsed) for name, s in stats.items()},
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    regressions = []
+    for name, now in current["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if not before:
+            continue
+        if before.get("p95_ms") and now.get("p95_ms") and now["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {before['p95_ms']}ms -> {now['p95_ms']}ms")
+        if before.get("throughput_rps") and now["throughput_rps"] < before["throughput_rps"] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {before['throughput_rps']} -> {now['throughput_rps']} rps")
+    return regressions
+
+
+def _parse_rates(values: list[str] | None) -> dict[str, float]:
+    rates = dict(DEFAULT_RATES)
+    for value in values or []:
+        name, _, rate = value.partition("=")
+        if name not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"unknown scenario {name!r}, expected one of {SCENARIOS}")
+        rates[name] = float(rate)
+    return rates
+
+
+def _print_report(result: dict):
+    print(f"{'scenario':<14}{'reqs':>7}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}  errors")
+    for name, s in result["scenarios"].items():
+        print(
+            f"{name:<14}{s['requests']:>7}{s['throughput_rps']:>9}"
+            f"{str(s['p50_ms']):>10}{str(s['p95_ms']):>10}{str(s['p99_ms']):>10}  {s['errors'] or '-'}"
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--buildings", type=int, default=2)
+    parser.add_argument("--floors", type=int, default=2)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--clients", type=int, default=8, help="number of pooled async HTTP clients")
+    parser.add_argument("--max-in-flight", type=int, default=64)
+    parser.add_argument("--executor-workers", type=int, help="size of the to_thread pool (default: asyncio's)")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of load per scenario")
+    parser.add_argument("--rate", action="append", metavar="SCENARIO=RPS", help="arrival rate, repeatable")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", default="bench-results.json")
+    parser.add_argument("--compare", metavar="BASELINE_JSON")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative regression")
+    args = parser.parse_args(argv)
+    args.rates = _parse_rates(args.rate)
+
+    with mock_aws():
+        result = asyncio.run(run(args))
+
+    _print_report(result)
+    with open(args.output, "w") as f:
+        json.dump(result, f, indent=2)
+    print(f"results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(result, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+"""
+Seed a DynamoDB table (real or moto) through the application's repositories.
+
+Creates buildings with floors, one office per floor, and customers with one
+vehicle each, assigned to a slot on their office's floor. Bills have no writer
+in the application, so a bill per user is put directly for the get_bill scenario.
+"""
+import asyncio
+import time
+import uuid
+from dataclasses import dataclass, field
+
+import bcrypt
+import jwt
+
+from app.constants import JWT_ALGORITHM, JWT_SECRET, SLOT_LAYOUT, TABLE
+from app.db_schemas import TABLE_DEFINITION
+from app.dto.office import AddOfficeRequestDTO
+from app.dto.vehicle import AddVehicleRequestDTO
+from app.models.building import Building
+from app.models.user import User
+from app.repository.building_repo import BuildingRepository
+from app.repository.floor_repo import FloorRepository
+from app.repository.office_repo import OfficeRepository
+from app.repository.slot_repo import SlotRepository
+from app.repository.user_repo import UserRepository
+from app.repository.vehicle_repo import VehicleRepository
+from app.services.office import OfficeService
+from app.services.vehicle import VehicleService
+
+SEED_PASSWORD = "bench123"
+
+
+@dataclass
+class SeededUser:
+    user_id: str
+    email: str
+    office_id: str
+    numberplate: str
+    token: str
+
+
+@dataclass
+class SeedResult:
+    building_ids: list[str] = field(default_factory=list)
+    office_ids: list[str] = field(default_factory=list)
+    users: list[SeededUser] = field(default_factory=list)
+    admin_token: str = ""
+
+
+def create_table(db):
+    return db.create_table(**TABLE_DEFINITION)
+
+
+def make_token(user_id: str, email: str, office_id: str, role: int = 0) -> str:
+    now = int(time.time())
+    return jwt.encode(
+        {
+            "email": email,
+            "id": user_id,
+            "role": role,
+            "officeId": office_id,
+            "exp": now + 24 * 3600,
+            "iat": now,
+        },
+        JWT_SECRET,
+        algorithm=JWT_ALGORITHM,
+    )
+
+
+async def seed(db, buildings: int, floors: int, users: int, bill_month: tuple[int, int]) -> SeedResult:
+    result = SeedResult()
+    building_repo = BuildingRepository(db=db)
+    floor_repo = FloorRepository(db=db)
+    office_repo = OfficeRepository(db=db)
+    slot_repo = SlotRepository(db=db)
+    user_repo = UserRepository(db=db)
+    vehicle_repo = VehicleRepository(db=db)
+    office_service = OfficeService(office_repo=office_repo, building_repo=building_repo, floor_repo=floor_repo)
+    vehicle_service = VehicleService(
+        vehicle_repo=vehicle_repo,
+        building_repo=building_repo,
+        office_repo=office_repo,
+        slot_repo=slot_repo,
+    )
+
+    for b in range(buildings):
+        building_id = str(uuid.uuid4())
+        await building_repo.add_building(Building(BuildingId=building_id, BuildingName=f"Building {b}"))
+        result.building_ids.append(building_id)
+        for floor_number in range(1, floors + 1):
+            await floor_repo.add_floor(building_id=building_id, floor_number=floor_number)
+            office_id = await office_service.add_office(
+                building_id=building_id,
+                req=AddOfficeRequestDTO(office_name=f"Office {b}-{floor_number}", floor_number=floor_number),
+            )
+            result.office_ids.append(office_id)
+
+    capacity = len(result.office_ids) * len(SLOT_LAYOUT)
+    if users > capacity:
+        raise ValueError(f"{users} users do not fit in {capacity} slots; add buildings or floors")
+
+    # cheap bcrypt rounds: seeding cost is not what is being measured, login verifies whatever is stored
+    password_hash = bcrypt.hashpw(SEED_PASSWORD.encode("utf-8"), bcrypt.gensalt(rounds=4)).decode("utf-8")
+    year, month = bill_month
+
+    for u in range(users):
+        office_id = result.office_ids[u % len(result.office_ids)]
+        user = User(
+            Id=str(uuid.uuid4()),
+            Username=f"user{u}",
+            Email=f"user{u}@bench.example.com",
+            PasswordHash=password_hash,
+            OfficeId=office_id,
+        )
+        await user_repo.save_user(user)
+
+        numberplate = f"BENCH{u:05d}"
+        await vehicle_service.add_vehicle(
+            vehicle=AddVehicleRequestDTO(numberplate=numberplate, type=u % 2),
+            user_id=user.user_id,
+            office_id=office_id,
+        )
+
+        await asyncio.to_thread(
+            lambda: db.Table(TABLE).put_item(
+                Item={
+                    "PK": f"USER#{user.user_id}",
+                    "SK": f"BILL#{year}#{month}",
+                    "BillingMonth": month,
+                    "BillingYear": year,
+                    "TotalAmount": 0,
+                    "BillDate": f"{year}-{month:02d}-28",
+                    "ParkingHistory": [],
+                }
+            )
+        )
+
+        result.users.append(SeededUser(
+            user_id=user.user_id,
+            email=user.email,
+            office_id=office_id,
+            numberplate=numberplate,
+            token=make_token(user.user_id, user.email, office_id),
+        ))
+
+    result.admin_token = make_token("bench-admin", "admin@bench.example.com", result.office_ids[0], role=1)
+    return result
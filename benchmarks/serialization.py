@@ -0,0 +1,107 @@
+"""
+Microbenchmark for response encoding.
+
+Times turning each list endpoint's DTOs into response bytes, the old way
+(jsonable_encoder then the standard json module, as FastAPI does for a route
+without a response model) and the new way (dto_response: a cached TypeAdapter
+writing JSON in pydantic-core). Payloads are sized like a busy user or building.
+
+    python -m benchmarks.serialization --iterations 2000
+"""
+import argparse
+import datetime
+import json
+import time
+
+from fastapi.encoders import jsonable_encoder
+from starlette.responses import JSONResponse
+
+from app.constants import PARKINGS_PAGE_SIZE, SLOT_LAYOUT
+from app.dto.building import FloorResponseDTO, ParkingStatusResponseDTO, SlotResponseDTO
+from app.dto.parking import ParkingHistoryResponseDTO
+from app.dto.utilization import FloorHeatmapDTO, UtilizationResponseDTO
+from app.dto.vehicle import VehicleResponseDTO
+from app.utils.serialization import dto_response
+
+
+def _payloads() -> dict[str, tuple[object, object]]:
+    slots = [
+        SlotResponseDTO(
+            buildingId="b1",
+            floorNumber=1,
+            slotNumber=i,
+            slotType="FourWheeler" if c == "1" else "TwoWheeler",
+            isAssigned=i % 2 == 0,
+            parkingStatus=ParkingStatusResponseDTO(
+                numberPlate=f"KA01AB{i:04d}", parkedAt="2025-01-01T09:00:00Z", userName="user", userEmail="u@example.com",
+            ) if i % 3 == 0 else None,
+        )
+        for i, c in enumerate(SLOT_LAYOUT)
+    ]
+    parkings = [
+        ParkingHistoryResponseDTO.from_model(
+            ticket_id=f"ticket-{i}", number_plate="KA01AB1234", building_id="b1", building_name="HQ",
+            floor_number=1, slot_number=i % 30, start_time=1735689600 + i * 3600, end_time=1735693200 + i * 3600,
+            vehicle_type="FourWheeler",
+        )
+        for i in range(PARKINGS_PAGE_SIZE)
+    ]
+    vehicles = [
+        VehicleResponseDTO(
+            number_plate=f"KA01AB{i:04d}", vehicle_type="FourWheeler", is_parked=False, assigned_building_name="HQ",
+            assigned_building_id="b1", assigned_floor_number=1, assigned_slot_number=i,
+        )
+        for i in range(3)
+    ]
+    floors = [
+        FloorResponseDTO(buildingId="b1", floorNumber=i, totalSlots=30, availableSlots=12, assignedOffice=f"office-{i}")
+        for i in range(10)
+    ]
+    days = [(datetime.date(2025, 1, 1) + datetime.timedelta(days=d)).isoformat() for d in range(31)]
+    utilization = UtilizationResponseDTO(
+        BuildingId="b1", Start=days[0], End=days[-1],
+        Floors=[
+            FloorHeatmapDTO(
+                FloorNumber=f, Capacity=30, Days=days,
+                Occupancy=[[h / 2 for h in range(24)] for _ in days],
+                Utilization=[[h / 48 for h in range(24)] for _ in days],
+                Arrivals=[[h % 5 for h in range(24)] for _ in days],
+            )
+            for f in range(5)
+        ],
+    )
+    return {
+        "GET /buildings/{id}/floors/{n}/slots": (slots, list[SlotResponseDTO]),
+        "GET /parkings/": (parkings, list[ParkingHistoryResponseDTO]),
+        "GET /vehicles/": (vehicles, list[VehicleResponseDTO]),
+        "GET /buildings/{id}/floors": (floors, list[FloorResponseDTO]),
+        "GET /admin/buildings/{id}/utilization": (utilization, UtilizationResponseDTO),
+    }
+
+
+def _time(fn, iterations: int) -> float:
+    for _ in range(min(iterations, 50)):
+        fn()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'endpoint':<40}{'before (us)':>14}{'after (us)':>14}{'speedup':>10}")
+    for endpoint, (content, response_type) in _payloads().items():
+        # both paths must produce the same document
+        assert json.loads(JSONResponse(jsonable_encoder(content)).body) == json.loads(dto_response(content, response_type).body)
+
+        before = _time(lambda: JSONResponse(jsonable_encoder(content)), args.iterations)
+        after = _time(lambda: dto_response(content, response_type), args.iterations)
+        print(f"{endpoint:<40}{before * 1e6:>14.1f}{after * 1e6:>14.1f}{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
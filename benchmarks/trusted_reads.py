@@ -0,0 +1,101 @@
+"""
+Microbenchmark for building repository models from DynamoDB items.
+
+Times turning items shaped like the table's (numbers as Decimal) into models
+with full pydantic validation and with from_item's trusted converter, for a
+large parking history, a floor of slots and a page of vehicles.
+
+    python -m benchmarks.trusted_reads --items 10000 --iterations 20
+"""
+import argparse
+import time
+from decimal import Decimal
+from unittest.mock import patch
+
+from app.constants import SLOT_LAYOUT
+from app.models.parking_history import ParkingHistory
+from app.models.slot import Slot
+from app.models.vehicle import Vehicle
+from app.utils.trusted_model import from_item
+
+
+def _items(count: int) -> dict[str, tuple[type, list[dict], dict]]:
+    history = [
+        {
+            "PK": "USER#u1",
+            "SK": f"PARKING#202501#{1735689600 + i * 3600}",
+            "ParkingId": f"ticket-{i}",
+            "Numberplate": "KA01AB1234",
+            "BuildingId": "b1",
+            "FloorNumber": Decimal(1 + i % 5),
+            "SlotId": Decimal(i % 30),
+            "StartTime": Decimal(1735689600 + i * 3600),
+            "EndTime": Decimal(1735693200 + i * 3600),
+            "VehicleType": "FourWheeler",
+        }
+        for i in range(count)
+    ]
+    slots = [
+        {
+            "PK": "BUILDING#b1",
+            "SK": f"FLOOR#1#SLOT#{i}",
+            "SlotId": Decimal(i),
+            "SlotType": "FourWheeler" if c == "1" else "TwoWheeler",
+            "IsAssigned": i % 2 == 0,
+            "IsOccupied": i % 3 == 0,
+            "OccupiedBy": {
+                "Username": "user", "NumberPlate": f"KA01AB{i:04d}", "Email": "u@example.com",
+                "StartTime": Decimal(1735689600),
+            } if i % 3 == 0 else None,
+        }
+        for i, c in enumerate(SLOT_LAYOUT)
+    ]
+    vehicles = [
+        {
+            "PK": "USER#u1",
+            "SK": f"VEHICLE#KA01AB{i:04d}",
+            "VehicleId": f"v{i}",
+            "Numberplate": f"KA01AB{i:04d}",
+            "VehicleType": "FourWheeler",
+            "IsParked": False,
+            "AssignedSlot": {"BuildingId": "b1", "FloorNumber": Decimal(1), "SlotId": Decimal(i)},
+        }
+        for i in range(3)
+    ]
+    return {
+        f"parking history ({count} items)": (ParkingHistory, history, {"user_id": "u1"}),
+        f"slots ({len(slots)} items)": (Slot, slots, {"building_id": "b1", "floor_number": 1}),
+        "vehicles (3 items)": (Vehicle, vehicles, {}),
+    }
+
+
+def _time(fn, iterations: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=10_000)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    def build(model, items, extra):
+        return [from_item(model, item, **extra) for item in items]
+
+    print(f"{'read':<32}{'validated (ms)':>16}{'trusted (ms)':>16}{'speedup':>10}")
+    for name, (model, items, extra) in _items(args.items).items():
+        with patch("app.utils.trusted_model.TRUSTED_REPOSITORY_READS", False):
+            validated = build(model, items, extra)
+            before = _time(lambda: build(model, items, extra), args.iterations)
+        # both paths must produce the same models
+        assert build(model, items, extra) == validated
+        after = _time(lambda: build(model, items, extra), args.iterations)
+        print(f"{name:<32}{before * 1e3:>16.3f}{after * 1e3:>16.3f}{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
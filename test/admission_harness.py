@@ -0,0 +1,100 @@
+"""
+Deterministic driver for AdmissionMiddleware.
+
+    harness = AdmissionHarness(rate=1, burst=2, concurrency_limits={"read": 1})
+    harness.get("/parkings/", user="u1").status_code          # 200
+    harness.clock.advance(1.0)                                # refill one token
+
+    async with harness.holding("/parkings/", user="u1"):      # one read stays in flight
+        (await harness.aget("/parkings/", user="u2")).status_code   # 503
+
+Requests go to a stub app that answers 200 and, for ``holding``, waits until the
+block exits, so concurrency is controlled by the test rather than by timing.
+Bearer tokens are real JWTs for the given user id.
+"""
+import asyncio
+import datetime
+from contextlib import asynccontextmanager
+
+import httpx
+import jwt
+
+from app.constants import JWT_ALGORITHM, JWT_SECRET
+from app.utils.admission import AdmissionMiddleware, TokenBuckets
+
+
+class FakeClock:
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+def user_token(user_id: str) -> str:
+    now = datetime.datetime.now(tz=datetime.timezone.utc)
+    return jwt.encode({
+        "email": f"{user_id}@example.com",
+        "id": user_id,
+        "role": 0,
+        "officeId": "o1",
+        "iat": int(now.timestamp()),
+        "exp": int((now + datetime.timedelta(hours=1)).timestamp()),
+    }, JWT_SECRET, algorithm=JWT_ALGORITHM)
+
+
+class AdmissionHarness:
+    def __init__(self, rate: float = 1000, burst: float = 1000, concurrency_limits: dict[str, int] | None = None):
+        self.clock = FakeClock()
+        self.calls = 0
+        self._gates: dict[str, asyncio.Event] = {}
+        self.middleware = AdmissionMiddleware(
+            self._app,
+            buckets=TokenBuckets(rate=rate, burst=burst, clock=self.clock),
+            concurrency_limits=concurrency_limits or {},
+        )
+
+    async def _app(self, scope, receive, send):
+        self.calls += 1
+        gate = self._gates.get(dict(scope["headers"]).get(b"x-gate", b"").decode())
+        if gate is not None:
+            await gate.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/plain")]})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    @staticmethod
+    def _headers(user: str | None, extra: dict | None = None) -> dict:
+        headers = {"Authorization": f"Bearer {user_token(user)}"} if user else {}
+        return {**headers, **(extra or {})}
+
+    async def arequest(self, method: str, path: str, user: str | None = None, headers: dict | None = None):
+        transport = httpx.ASGITransport(app=self.middleware)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.request(method, path, headers=self._headers(user, headers))
+
+    async def aget(self, path: str, user: str | None = None):
+        return await self.arequest("GET", path, user)
+
+    def get(self, path: str, user: str | None = None):
+        return asyncio.run(self.aget(path, user))
+
+    def post(self, path: str, user: str | None = None):
+        return asyncio.run(self.arequest("POST", path, user))
+
+    @asynccontextmanager
+    async def holding(self, path: str, user: str | None = None, method: str = "GET"):
+        """Keep one request to ``path`` in flight for the duration of the block."""
+        name = str(len(self._gates))
+        gate = self._gates[name] = asyncio.Event()
+        calls = self.calls
+        request = asyncio.create_task(self.arequest(method, path, user, headers={"X-Gate": name}))
+        while self.calls == calls and not request.done():
+            await asyncio.sleep(0)
+        try:
+            yield request
+        finally:
+            gate.set()
+            await request
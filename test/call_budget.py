@@ -0,0 +1,53 @@
+"""
+Test-time DynamoDB call counting.
+
+    with count_dynamodb_calls(db.meta.client) as calls:
+        client.get("/parkings/", headers=...)
+    calls.assert_within(total=2, Query=1, BatchGetItem=1)
+
+The counter hooks botocore's ``before-call`` event, so every operation that
+would go over the wire is seen, whichever repository or helper issued it.
+Retries of the same call are not counted twice.
+"""
+import itertools
+from collections import Counter
+from contextlib import contextmanager
+
+_ids = itertools.count()
+
+
+class DynamoDBCalls:
+    def __init__(self):
+        self.by_operation: Counter[str] = Counter()
+
+    def _record(self, model, **kwargs):
+        self.by_operation[model.name] += 1
+
+    @property
+    def total(self) -> int:
+        return sum(self.by_operation.values())
+
+    def assert_within(self, total: int | None = None, **per_operation: int):
+        """Fail if the total, or any named operation, went over its budget; unnamed operations are not allowed."""
+        problems = []
+        if total is not None and self.total > total:
+            problems.append(f"{self.total} calls, budget {total}")
+        for operation, count in sorted(self.by_operation.items()):
+            budget = per_operation.get(operation, 0)
+            if count > budget:
+                problems.append(f"{operation}: {count} calls, budget {budget}")
+        if problems:
+            raise AssertionError(
+                "DynamoDB call budget exceeded: " + "; ".join(problems) + f" (made {dict(self.by_operation)})"
+            )
+
+
+@contextmanager
+def count_dynamodb_calls(client):
+    calls = DynamoDBCalls()
+    unique_id = f"call-budget-{next(_ids)}"
+    client.meta.events.register("before-call.dynamodb", calls._record, unique_id=unique_id)
+    try:
+        yield calls
+    finally:
+        client.meta.events.unregister("before-call.dynamodb", unique_id=unique_id)
@@ -0,0 +1,131 @@
+import datetime
+import time
+import unittest
+from unittest.mock import AsyncMock
+
+import jwt
+from fastapi.testclient import TestClient
+
+from app.dto.parking import ActiveParkingResponseDTO, ActiveParkingsPageDTO
+from app.dto.utilization import UtilizationResponseDTO
+from app.dto.vehicle import PlateSearchResultDTO
+from app.main import app
+from app.models.roles import Roles
+from app.services.parking import ParkingService
+from app.services.utilization import UtilizationService
+from app.services.vehicle import VehicleService
+
+
+class TestAdminRouter(unittest.TestCase):
+
+    def setUp(self):
+        self.client = TestClient(app)
+        self.parking_service_mock = AsyncMock(spec=ParkingService)
+        self.vehicle_service_mock = AsyncMock(spec=VehicleService)
+        app.dependency_overrides[ParkingService] = lambda: self.parking_service_mock
+        self.utilization_service_mock = AsyncMock(spec=UtilizationService)
+        app.dependency_overrides[VehicleService] = lambda: self.vehicle_service_mock
+        app.dependency_overrides[UtilizationService] = lambda: self.utilization_service_mock
+
+    def tearDown(self):
+        app.dependency_overrides.clear()
+        self.client.close()
+
+    def _auth_headers(self, role: Roles = Roles.ADMIN):
+        now = int(time.time())
+        token = jwt.encode(
+            {
+                "email": "admin@example.com",
+                "id": "admin_1",
+                "role": 1 if role == Roles.ADMIN else 0,
+                "officeId": "office_1",
+                "exp": now + 3600,
+                "iat": now,
+            },
+            "asdfasasdfasdf",
+            algorithm="HS256",
+        )
+        return {"Authorization": f"Bearer {token}"}
+
+    def test_get_active_parkings(self):
+        self.parking_service_mock.get_active_parkings.return_value = ActiveParkingsPageDTO(
+            Items=[
+                ActiveParkingResponseDTO.from_model(
+                    ticket_id="t1",
+                    user_id="user_1",
+                    number_plate="ABC123",
+                    floor_number=1,
+                    slot_number=2,
+                    start_time=0,
+                    vehicle_type="TwoWheeler",
+                )
+            ],
+            NextCursor="next",
+        )
+
+        response = self.client.get(
+            "/admin/buildings/b1/active-parkings?limit=1&cursor=abc",
+            headers=self._auth_headers(),
+        )
+
+        assert response.status_code == 200
+        assert response.json()["NextCursor"] == "next"
+        assert response.json()["Items"][0]["StartTime"] == "1970-01-01T00:00:00Z"
+        self.parking_service_mock.get_active_parkings.assert_awaited_once_with(building_id="b1", limit=1, cursor="abc")
+
+    def test_get_active_parkings_requires_admin(self):
+        response = self.client.get("/admin/buildings/b1/active-parkings", headers=self._auth_headers(Roles.CUSTOMER))
+
+        assert response.status_code == 401
+
+    def test_get_active_parkings_limit_is_bounded(self):
+        response = self.client.get("/admin/buildings/b1/active-parkings?limit=0", headers=self._auth_headers())
+
+        assert response.status_code == 422
+
+
+    def test_search_vehicles(self):
+        self.vehicle_service_mock.search_by_plate.return_value = [
+            PlateSearchResultDTO(number_plate="KA01AB1234", vehicle_type="FourWheeler", user_id="user_1"),
+        ]
+
+        response = self.client.get("/admin/vehicles?plate=ka01&limit=5", headers=self._auth_headers())
+
+        assert response.status_code == 200
+        assert response.json() == [{"number_plate": "KA01AB1234", "vehicle_type": "FourWheeler", "user_id": "user_1"}]
+        self.vehicle_service_mock.search_by_plate.assert_awaited_once_with(prefix="ka01", limit=5)
+
+    def test_search_vehicles_requires_admin(self):
+        response = self.client.get("/admin/vehicles?plate=ka01", headers=self._auth_headers(Roles.CUSTOMER))
+
+        assert response.status_code == 401
+
+    def test_search_vehicles_requires_plate(self):
+        response = self.client.get("/admin/vehicles", headers=self._auth_headers())
+
+        assert response.status_code == 422
+
+    def test_get_utilization(self):
+        self.utilization_service_mock.get_heatmap.return_value = UtilizationResponseDTO(
+            BuildingId="b1", Start="2025-01-01", End="2025-01-07", Floors=[],
+        )
+
+        response = self.client.get("/admin/buildings/b1/utilization?start=2025-01-01&end=2025-01-07", headers=self._auth_headers())
+
+        assert response.status_code == 200
+        assert response.json()["BuildingId"] == "b1"
+        self.utilization_service_mock.get_heatmap.assert_awaited_once_with(
+            building_id="b1", start=datetime.date(2025, 1, 1), end=datetime.date(2025, 1, 7)
+        )
+
+    def test_get_utilization_requires_admin_and_dates(self):
+        customer = self.client.get(
+            "/admin/buildings/b1/utilization?start=2025-01-01&end=2025-01-07", headers=self._auth_headers(Roles.CUSTOMER)
+        )
+        missing = self.client.get("/admin/buildings/b1/utilization?start=2025-01-01", headers=self._auth_headers())
+
+        assert customer.status_code == 401
+        assert missing.status_code == 422
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from app.errors.web_exception import OVERLOADED_ERROR, RATE_LIMITED_ERROR
+from app.main import app
+from app.utils.admission import TokenBuckets, route_class
+from test.admission_harness import AdmissionHarness, FakeClock
+
+
+class TestTokenBuckets(unittest.TestCase):
+
+    def test_burst_then_refill(self):
+        clock = FakeClock()
+        buckets = TokenBuckets(rate=2, burst=3, clock=clock)
+
+        self.assertEqual([buckets.take("u") for _ in range(3)], [0, 0, 0])
+        self.assertAlmostEqual(buckets.take("u"), 0.5)
+
+        clock.advance(0.5)
+        self.assertEqual(buckets.take("u"), 0)
+        clock.advance(100)
+        self.assertEqual([buckets.take("u") for _ in range(3)], [0, 0, 0])
+        self.assertGreater(buckets.take("u"), 0)
+
+    def test_callers_are_independent_and_bounded(self):
+        buckets = TokenBuckets(rate=1, burst=1, max_callers=2, clock=FakeClock())
+
+        self.assertEqual(buckets.take("a"), 0)
+        self.assertEqual(buckets.take("b"), 0)
+        self.assertGreater(buckets.take("a"), 0)
+        buckets.take("c")
+
+        self.assertEqual(len(buckets), 2)
+        # "b" was least recently seen, so it was dropped and starts again with a full bucket
+        self.assertEqual(buckets.take("b"), 0)
+
+
+class TestRouteClass(unittest.TestCase):
+
+    def test_classes(self):
+        self.assertEqual(route_class("GET", "/parkings/"), "read")
+        self.assertEqual(route_class("POST", "/parkings/"), "write")
+        self.assertEqual(route_class("PATCH", "/parkings/KA01/unpark"), "write")
+        self.assertEqual(route_class("GET", "/admin/vehicles"), "admin")
+        self.assertIsNone(route_class("GET", "/health"))
+        self.assertIsNone(route_class("GET", "/metrics"))
+
+
+class TestAdmissionMiddleware(unittest.TestCase):
+
+    def test_rate_limit_per_user(self):
+        harness = AdmissionHarness(rate=1, burst=2)
+
+        self.assertEqual(harness.post("/parkings/", user="u1").status_code, 200)
+        self.assertEqual(harness.post("/parkings/", user="u1").status_code, 200)
+        limited = harness.post("/parkings/", user="u1")
+
+        self.assertEqual(limited.status_code, 429)
+        self.assertEqual(limited.headers["retry-after"], "1")
+        self.assertEqual(limited.json()["code"], RATE_LIMITED_ERROR)
+        self.assertEqual(harness.calls, 2)
+        self.assertEqual(harness.get("/parkings/", user="u2").status_code, 200)
+
+        harness.clock.advance(1)
+        self.assertEqual(harness.get("/parkings/", user="u1").status_code, 200)
+
+    def test_retry_after_rounds_up_the_wait(self):
+        harness = AdmissionHarness(rate=0.25, burst=1)
+        harness.get("/parkings/", user="u1")
+
+        self.assertEqual(harness.get("/parkings/", user="u1").headers["retry-after"], "4")
+
+    def test_requests_without_a_valid_token_are_limited_by_address(self):
+        harness = AdmissionHarness(rate=1, burst=1)
+
+        self.assertEqual(harness.post("/auth/login").status_code, 200)
+        self.assertEqual(harness.post("/auth/login").status_code, 429)
+        self.assertEqual(asyncio.run(harness.arequest("GET", "/parkings/", headers={"Authorization": "Bearer junk"})).status_code, 429)
+        self.assertEqual(harness.get("/parkings/", user="u1").status_code, 200)
+
+    def test_forwarded_clients_have_their_own_buckets(self):
+        harness = AdmissionHarness(rate=1, burst=1)
+
+        def login(address: str):
+            return asyncio.run(harness.arequest("POST", "/auth/login", headers={"X-Forwarded-For": f"{address}, 10.0.0.1"}))
+
+        self.assertEqual(login("203.0.113.7").status_code, 200)
+        self.assertEqual(login("203.0.113.8").status_code, 200)
+        self.assertEqual(login("203.0.113.7").status_code, 429)
+
+    def test_exempt_paths_are_not_limited(self):
+        harness = AdmissionHarness(rate=1, burst=1)
+
+        self.assertEqual([harness.get("/health").status_code for _ in range(3)], [200, 200, 200])
+
+    def test_concurrency_cap_per_route_class(self):
+        harness = AdmissionHarness(concurrency_limits={"read": 1, "write": 1})
+
+        async def scenario():
+            async with harness.holding("/parkings/", user="u1"):
+                busy = await harness.aget("/vehicles/", user="u2")
+                write = await harness.arequest("POST", "/parkings/", user="u2")
+            after = await harness.aget("/vehicles/", user="u2")
+            return busy, write, after
+
+        busy, write, after = asyncio.run(scenario())
+
+        self.assertEqual(busy.status_code, 503)
+        self.assertEqual(busy.headers["retry-after"], "1")
+        self.assertEqual(busy.json()["code"], OVERLOADED_ERROR)
+        self.assertEqual(write.status_code, 200)
+        self.assertEqual(after.status_code, 200)
+        self.assertEqual(harness.middleware.in_flight, {"read": 0, "write": 0})
+
+    def test_shed_requests_do_not_use_up_tokens(self):
+        harness = AdmissionHarness(rate=1, burst=2, concurrency_limits={"read": 1})
+
+        async def scenario():
+            async with harness.holding("/parkings/", user="u1"):
+                busy = [(await harness.aget("/vehicles/", user="u2")).status_code for _ in range(3)]
+            after = [(await harness.aget("/vehicles/", user="u2")).status_code for _ in range(2)]
+            return busy, after
+
+        busy, after = asyncio.run(scenario())
+
+        self.assertEqual(busy, [503, 503, 503])
+        self.assertEqual(after, [200, 200])
+
+
+class TestAppAdmission(unittest.TestCase):
+
+    def test_app_rejects_before_routing(self):
+        with TestClient(app) as client, patch.object(TokenBuckets, "take", return_value=4.2):
+            # app.state.db is not set, so reaching the route would fail with a 500 instead
+            response = client.get("/parkings/", headers={"Authorization": "Bearer junk"})
+            health = client.get("/health")
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.headers["retry-after"], "5")
+        self.assertEqual(health.status_code, 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
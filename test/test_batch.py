@@ -0,0 +1,70 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from app.constants import BATCH_GET_BACKOFF_MAX_SECONDS, BATCH_GET_MAX_ATTEMPTS, TABLE
+from app.repository.batch import UnprocessedKeysError, backoff, batch_get
+
+
+def key(n: int) -> dict:
+    return {"PK": "BUILDING", "SK": f"BUILDING#b{n}"}
+
+
+def response(items: list[dict], unprocessed: list[dict]) -> dict:
+    result: dict = {"Responses": {TABLE: items}}
+    if unprocessed:
+        result["UnprocessedKeys"] = {TABLE: {"Keys": unprocessed}}
+    return result
+
+
+class TestBatchGet(unittest.TestCase):
+
+    def test_unprocessed_keys_are_retried_after_a_backoff(self):
+        db = MagicMock()
+        db.batch_get_item.side_effect = [
+            response([key(1)], [key(2), key(3)]),
+            response([key(2)], [key(3)]),
+            response([key(3)], []),
+        ]
+        sleeps: list[float] = []
+
+        items = batch_get(db, [key(1), key(2), key(3)], sleep=sleeps.append)
+
+        self.assertEqual(items, [key(1), key(2), key(3)])
+        self.assertEqual(db.batch_get_item.call_count, 3)
+        self.assertEqual(len(sleeps), 2)
+        retried = db.batch_get_item.call_args_list[2].kwargs["RequestItems"][TABLE]["Keys"]
+        self.assertEqual(retried, [key(3)])
+
+    def test_gives_up_after_max_attempts(self):
+        db = MagicMock()
+        db.batch_get_item.return_value = response([], [key(1)])
+        sleeps: list[float] = []
+
+        with self.assertRaises(UnprocessedKeysError) as raised:
+            batch_get(db, [key(1)], sleep=sleeps.append)
+
+        self.assertEqual(raised.exception.remaining, 1)
+        self.assertEqual(db.batch_get_item.call_count, BATCH_GET_MAX_ATTEMPTS)
+        self.assertEqual(len(sleeps), BATCH_GET_MAX_ATTEMPTS - 1)
+
+    def test_no_wait_when_nothing_is_unprocessed(self):
+        db = MagicMock()
+        db.batch_get_item.return_value = response([key(1)], [])
+        sleeps: list[float] = []
+
+        batch_get(db, [key(1), key(1)], sleep=sleeps.append)
+
+        self.assertEqual(sleeps, [])
+        self.assertEqual(db.batch_get_item.call_args.kwargs["RequestItems"][TABLE]["Keys"], [key(1)])
+
+    def test_backoff_doubles_up_to_the_cap(self):
+        with patch("app.repository.batch.random.uniform", side_effect=lambda low, high: high):
+            waits = [backoff(attempt) for attempt in range(1, 12)]
+
+        self.assertEqual(waits[1], 2 * waits[0])
+        self.assertEqual(waits[-1], BATCH_GET_BACKOFF_MAX_SECONDS)
+        self.assertEqual(waits, sorted(waits))
+
+
+if __name__ == "__main__":
+    unittest.main()
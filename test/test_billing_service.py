@@ -89,14 +89,14 @@ class TestBillingService(unittest.TestCase):
             ParkingHistory=history,
         )
         self.billing_repo.get_bill.return_value = bill
-        self.building_repo.get_building_by_id.return_value = Building(
-            BuildingId="b1", BuildingName="HQ", TotalFloors=2, TotalSlots=10, AvailableSlots=5
-        )
+        self.building_repo.get_buildings_by_ids.return_value = {
+            "b1": Building(BuildingId="b1", BuildingName="HQ", TotalFloors=2, TotalSlots=10, AvailableSlots=5)
+        }
 
         response = asyncio.run(self.service.get_bill("user_1", "user@example.com", 1, 2025))
 
         self.billing_repo.get_bill.assert_awaited_once_with("user_1", 1, 2025)
-        self.building_repo.get_building_by_id.assert_awaited_once_with("b1")
+        self.building_repo.get_buildings_by_ids.assert_awaited_once_with(["b1", "b1"])
         self.assertEqual(len(response.parking_history), 2)
         self.assertEqual(response.parking_history[0].building_name, "HQ")
         self.assertEqual(response.user_email, "user@example.com")
@@ -8,10 +8,13 @@ from app.constants import TABLE
 from app.errors.web_exception import WebException
 
 
-@mock_aws
 class TestBuildingRepository(unittest.IsolatedAsyncioTestCase):
 
-    def setUp(self):
+    async def asyncSetUp(self):
+        self.mock_aws = mock_aws()
+        self.mock_aws.start()
+        self.addCleanup(self.mock_aws.stop)
+
         self.dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
 
         self.table = self.dynamodb.create_table(
@@ -63,6 +66,26 @@ class TestBuildingRepository(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(context.exception.status_code, 404)
         self.assertIn("not found", context.exception.message.lower())
 
+    async def test_get_buildings_by_ids(self):
+        for building_id in ("bldg001", "bldg002", "bldg003"):
+            self.table.put_item(Item={
+                "PK": "BUILDING",
+                "SK": f"BUILDING#{building_id}",
+                "BuildingId": building_id,
+                "BuildingName": f"Building {building_id}",
+            })
+
+        result = await self.repo.get_buildings_by_ids(["bldg001", "bldg003", "bldg001"])
+
+        self.assertEqual(set(result), {"bldg001", "bldg003"})
+        self.assertEqual(result["bldg003"].name, "Building bldg003")
+
+    async def test_get_buildings_by_ids_missing_raises(self):
+        with self.assertRaises(WebException) as context:
+            await self.repo.get_buildings_by_ids(["nonexistent"])
+
+        self.assertEqual(context.exception.status_code, 404)
+
     async def test_get_buildings_empty(self):
         result = await self.repo.get_buildings()
         
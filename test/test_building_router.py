@@ -4,10 +4,12 @@ import unittest
 from unittest.mock import AsyncMock
 from fastapi.testclient import TestClient
 
+from app.dto.building import BuildingResponseDTO, FloorResponseDTO, SlotResponseDTO
 from app.main import app
 from app.models.roles import Roles
 from app.services.building import BuildingService
 from app.services.office import OfficeService
+from app.services.version import VersionService
 
 
 class TestBuildingRouter(unittest.TestCase):
@@ -16,8 +18,12 @@ class TestBuildingRouter(unittest.TestCase):
         self.client = TestClient(app)
         self.building_service_mock = AsyncMock(spec=BuildingService)
         self.office_service_mock = AsyncMock(spec=OfficeService)
+        self.version_service_mock = AsyncMock(spec=VersionService)
+        self.version_service_mock.get_buildings_etag.return_value = '"buildings-v1"'
+        self.version_service_mock.get_building_etag.return_value = '"building-v1"'
         app.dependency_overrides[BuildingService] = lambda: self.building_service_mock
         app.dependency_overrides[OfficeService] = lambda: self.office_service_mock
+        app.dependency_overrides[VersionService] = lambda: self.version_service_mock
 
     def tearDown(self):
         app.dependency_overrides.clear()
@@ -50,14 +56,35 @@ class TestBuildingRouter(unittest.TestCase):
         assert response.json() == {"message": "Building added successfully"}
 
     def test_get_buildings(self):
-        self.building_service_mock.get_buildings.return_value = [
-            {"buildingId": "b1", "name": "HQ", "availableSlots": 5, "totalSlots": 10, "totalFloors": 2}
-        ]
+        buildings = [{"buildingId": "b1", "name": "HQ", "availableSlots": 5, "totalSlots": 10, "totalFloors": 2}]
+        self.building_service_mock.get_buildings.return_value = [BuildingResponseDTO(**b) for b in buildings]
 
         response = self.client.get("/buildings/", headers=self._auth_headers())
 
         assert response.status_code == 200
-        assert response.json() == self.building_service_mock.get_buildings.return_value
+        assert response.json() == buildings
+        assert response.headers["etag"] == '"buildings-v1"'
+
+    def test_get_buildings_not_modified(self):
+        response = self.client.get(
+            "/buildings/",
+            headers={**self._auth_headers(), "If-None-Match": '"buildings-v1"'},
+        )
+
+        assert response.status_code == 304
+        assert response.headers["etag"] == '"buildings-v1"'
+        self.building_service_mock.get_buildings.assert_not_awaited()
+
+    def test_get_buildings_stale_etag(self):
+        self.building_service_mock.get_buildings.return_value = []
+
+        response = self.client.get(
+            "/buildings/",
+            headers={**self._auth_headers(), "If-None-Match": '"buildings-v0"'},
+        )
+
+        assert response.status_code == 200
+        self.building_service_mock.get_buildings.assert_awaited_once()
 
     def test_add_floor(self):
         response = self.client.post(
@@ -70,17 +97,27 @@ class TestBuildingRouter(unittest.TestCase):
         assert response.json() == {"message": "Floor added successfully"}
 
     def test_get_floors(self):
-        self.building_service_mock.get_floors.return_value = [
-            {"buildingId": "b1", "floorNumber": 1, "totalSlots": 5, "availableSlots": 3, "assignedOffice": None}
-        ]
+        floors = [{"buildingId": "b1", "floorNumber": 1, "totalSlots": 5, "availableSlots": 3, "assignedOffice": None}]
+        self.building_service_mock.get_floors.return_value = [FloorResponseDTO(**f) for f in floors]
 
         response = self.client.get("/buildings/b1/floors", headers=self._auth_headers())
 
         assert response.status_code == 200
-        assert response.json() == self.building_service_mock.get_floors.return_value
+        assert response.json() == floors
+        assert response.headers["etag"] == '"building-v1"'
+        self.version_service_mock.get_building_etag.assert_awaited_once_with("b1", "floors")
+
+    def test_get_floors_not_modified(self):
+        response = self.client.get(
+            "/buildings/b1/floors",
+            headers={**self._auth_headers(), "If-None-Match": 'W/"building-v1"'},
+        )
+
+        assert response.status_code == 304
+        self.building_service_mock.get_floors.assert_not_awaited()
 
     def test_get_slots(self):
-        self.building_service_mock.get_slots.return_value = [
+        slots = [
             {
                 "buildingId": "b1",
                 "floorNumber": 1,
@@ -90,11 +127,22 @@ class TestBuildingRouter(unittest.TestCase):
                 "parkingStatus": None,
             }
         ]
+        self.building_service_mock.get_slots.return_value = [SlotResponseDTO(**s) for s in slots]
 
         response = self.client.get("/buildings/b1/floors/1/slots", headers=self._auth_headers())
 
         assert response.status_code == 200
-        assert response.json() == self.building_service_mock.get_slots.return_value
+        assert response.json() == slots
+        self.version_service_mock.get_building_etag.assert_awaited_once_with("b1", "slots", 1)
+
+    def test_get_slots_not_modified(self):
+        response = self.client.get(
+            "/buildings/b1/floors/1/slots",
+            headers={**self._auth_headers(), "If-None-Match": '"building-v1"'},
+        )
+
+        assert response.status_code == 304
+        self.building_service_mock.get_slots.assert_not_awaited()
 
     def test_add_office(self):
         self.office_service_mock.add_office.return_value = "office_123"
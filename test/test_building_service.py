@@ -1,13 +1,15 @@
 import asyncio
 import unittest
+from decimal import Decimal
 from unittest.mock import AsyncMock
 
 from app.dto.building import AddBuildingRequestDTO, AddFloorRequestDTO
 from app.errors.web_exception import DB_ERROR, WebException
 from app.models.building import Building
 from app.models.floor import Floor
+from app.models.floor_grid import FloorGrid
 from app.models.office import Office
-from app.models.slot import OccupantDetails, Slot, SlotType
+from app.models.slot import SlotType
 from app.repository.building_repo import BuildingRepository
 from app.repository.floor_repo import FloorRepository
 from app.repository.office_repo import OfficeRepository
@@ -44,28 +46,24 @@ class TestBuildingService(unittest.TestCase):
         self.assertEqual(ctx.exception.status_code, 404)
         self.assertEqual(ctx.exception.error_code, DB_ERROR)
         self.floor_repo.get_floors.assert_awaited_once_with("b1")
-        self.slot_repo.get_slots_by_floor.assert_not_awaited()
+        self.slot_repo.get_floor_grid.assert_not_awaited()
 
     def test_get_slots_returns_parking_status(self):
         self.building_repo.get_building_by_id.return_value = Building(
             BuildingId="b1", BuildingName="HQ", TotalFloors=1, TotalSlots=10, AvailableSlots=10
         )
         self.floor_repo.get_floors.return_value = [Floor(building_id="b1", FloorNumber=1)]
-        occupant = OccupantDetails(Username="John", NumberPlate="ABC123", Email="john@example.com", StartTime=0)
-        slot = Slot(
-            building_id="b1",
-            floor_number=1,
-            SlotId=5,
-            SlotType=SlotType.TWO_WHEELER,
-            IsAssigned=True,
-            IsOccupied=True,
-            OccupiedBy=occupant,
-        )
-        self.slot_repo.get_slots_by_floor.return_value = [slot]
+        self.slot_repo.get_floor_grid.return_value = FloorGrid.from_items("b1", 1, [{
+            "SlotId": Decimal(5),
+            "SlotType": SlotType.TWO_WHEELER.value,
+            "IsAssigned": True,
+            "IsOccupied": True,
+            "OccupiedBy": {"Username": "John", "NumberPlate": "ABC123", "Email": "john@example.com", "StartTime": Decimal(0)},
+        }])
 
         slots = asyncio.run(self.service.get_slots("b1", 1))
 
-        self.slot_repo.get_slots_by_floor.assert_awaited()
+        self.slot_repo.get_floor_grid.assert_awaited()
         self.assertEqual(len(slots), 1)
         slot_response = slots[0]
         self.assertEqual(slot_response.building_id, "b1")
@@ -83,14 +81,14 @@ class TestBuildingService(unittest.TestCase):
             BuildingId="b1", BuildingName="HQ", TotalFloors=2, TotalSlots=10, AvailableSlots=5
         )
         self.floor_repo.get_floors.return_value = [Floor(building_id="b1", FloorNumber=2, OfficeId="office_1")]
-        self.office_repo.get_office_by_id.return_value = Office(
-            OfficeName="Marketing", BuildingId="b1", FloorNumber=2, OfficeId="office_1"
-        )
+        self.office_repo.get_offices_by_ids.return_value = {
+            "office_1": Office(OfficeName="Marketing", BuildingId="b1", FloorNumber=2, OfficeId="office_1")
+        }
 
         floors = asyncio.run(self.service.get_floors("b1"))
 
         self.floor_repo.get_floors.assert_awaited_once_with("b1")
-        self.office_repo.get_office_by_id.assert_awaited_once_with("office_1")
+        self.office_repo.get_offices_by_ids.assert_awaited_once_with(["office_1"])
         self.assertEqual(len(floors), 1)
         self.assertEqual(floors[0].assigned_office, "Marketing")
 
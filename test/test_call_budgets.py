@@ -0,0 +1,274 @@
+import asyncio
+import datetime
+import unittest
+
+import boto3
+from fastapi.testclient import TestClient
+from moto import mock_aws
+
+from app.constants import PARKINGS_STREAM_PAGE_SIZE
+from app.main import app
+from app.repository.parking_repo import closed_parking_sk
+from app.repository.rollup_repo import RollupRepository
+from benchmarks.seed import SEED_PASSWORD, create_table, seed
+from test.call_budget import count_dynamodb_calls
+
+# DynamoDB calls each route may make, per operation. Read budgets must not grow
+# with the size of a user's history, a bill, or a building; the *_does_not_grow_* tests
+# check that by repeating a request after adding data.
+BUDGETS = {
+    "POST /auth/login": {"GetItem": 1},
+    "POST /auth/register": {"Query": 1, "TransactWriteItems": 1},
+    "GET /vehicles/": {"Query": 1, "BatchGetItem": 1},
+    "POST /vehicles/": {"Query": 2, "GetItem": 1, "TransactWriteItems": 2},
+    # open-session checks and history reads take one extra Query for legacy
+    # PARKING#<epoch> items while PARKING_HISTORY_LEGACY_READS is on
+    "DELETE /vehicles/{numberplate}": {"GetItem": 1, "Query": 2, "TransactWriteItems": 1},
+    "GET /buildings/": {"Query": 2},
+    "POST /buildings/": {"TransactWriteItems": 1},
+    "GET /buildings/{building_id}/floors": {"GetItem": 2, "Query": 1, "BatchGetItem": 1},
+    # one BatchWriteItem per 25 slots of SLOT_LAYOUT, then the floor, the building and two version counters
+    "POST /buildings/{building_id}/floors": {"GetItem": 1, "BatchWriteItem": 2, "TransactWriteItems": 1},
+    "GET /buildings/{building_id}/floors/{floor_id}/slots": {"GetItem": 2, "Query": 2},
+    "POST /buildings/{building_id}/offices": {"GetItem": 1, "Query": 1, "TransactWriteItems": 1},
+    "DELETE /buildings/{building_id}/offices/{office_id}": {"GetItem": 1, "TransactWriteItems": 1},
+    "GET /offices/": {"GetItem": 1, "Query": 1},
+    "POST /parkings/": {"GetItem": 2, "TransactWriteItems": 1},
+    "PATCH /parkings/{numberplate}/unpark": {"Query": 1, "TransactWriteItems": 1},
+    # for a history of up to PARKINGS_STREAM_PAGE_SIZE sessions: without a limit the whole
+    # range is read, one Query per page; building names are still looked up once
+    "GET /parkings/": {"Query": 2, "BatchGetItem": 1},
+    "GET /billing": {"GetItem": 1, "BatchGetItem": 1},
+    "GET /metrics": {},
+    "GET /health": {},
+    "GET /admin/diagnostics": {},
+    "GET /admin/profile": {},
+    "GET /admin/buildings/{building_id}/active-parkings": {"Query": 1},
+    "GET /admin/vehicles": {"Query": 1},
+    "GET /admin/buildings/{building_id}/utilization": {"Query": 1},
+}
+
+
+@mock_aws
+class TestCallBudgets(unittest.TestCase):
+
+    def setUp(self):
+        self.dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
+        self.table = create_table(self.dynamodb)
+        self.seeded = asyncio.run(seed(self.dynamodb, buildings=2, floors=2, users=2, bill_month=(2025, 1)))
+        self.user = self.seeded.users[0]
+        self.building_id = self.seeded.building_ids[0]
+        app.state.db = self.dynamodb
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        self.client.close()
+        del app.state.db
+        self.table.delete()
+
+    def _user_headers(self):
+        return {"Authorization": f"Bearer {self.user.token}"}
+
+    def _admin_headers(self):
+        return {"Authorization": f"Bearer {self.seeded.admin_token}"}
+
+    def _request(self, route: str, method: str, url: str, **kwargs):
+        with count_dynamodb_calls(self.dynamodb.meta.client) as calls:
+            response = self.client.request(method, url, **kwargs)
+
+        assert response.status_code < 400, response.text
+        calls.assert_within(**BUDGETS[route])
+        return calls
+
+    def _add_history(self, count: int):
+        with self.table.batch_writer() as batch:
+            for i in range(count):
+                batch.put_item(Item={
+                    "PK": f"USER#{self.user.user_id}",
+                    "SK": closed_parking_sk(1_700_000_000 + i),
+                    "ParkingId": f"p{i}",
+                    "Numberplate": self.user.numberplate,
+                    "BuildingId": self.seeded.building_ids[i % 2],
+                    "FloorNumber": 1,
+                    "SlotId": 1,
+                    "StartTime": 1_700_000_000 + i,
+                    "EndTime": 1_700_000_100 + i,
+                    "VehicleType": "TwoWheeler",
+                })
+
+    def test_every_route_has_a_budget(self):
+        routes = {
+            f"{method} {route.path}"
+            for route in app.routes
+            if hasattr(route, "methods") and route.include_in_schema
+            for method in route.methods
+        }
+
+        self.assertEqual(routes - BUDGETS.keys(), set())
+
+    def test_auth(self):
+        self._request("POST /auth/login", "POST", "/auth/login", json={
+            "email": self.user.email,
+            "password": SEED_PASSWORD,
+        })
+        self._request("POST /auth/register", "POST", "/auth/register", json={
+            "email": "new@bench.example.com",
+            "name": "newuser",
+            "officeId": self.user.office_id,
+            "password": "secret",
+        })
+
+    def test_vehicles(self):
+        headers = self._user_headers()
+
+        self._request("POST /vehicles/", "POST", "/vehicles/", headers=headers, json={"numberplate": "NEW001", "type": 1})
+        self._request("GET /vehicles/", "GET", "/vehicles/", headers=headers)
+        self._request("GET /admin/vehicles", "GET", "/admin/vehicles?plate=new0", headers=self._admin_headers())
+        self._request("DELETE /vehicles/{numberplate}", "DELETE", "/vehicles/NEW001", headers=headers)
+
+    def test_buildings(self):
+        headers = self._admin_headers()
+        base = f"/buildings/{self.building_id}"
+
+        self._request("GET /buildings/", "GET", "/buildings/", headers=headers)
+        self._request("POST /buildings/", "POST", "/buildings/", headers=headers, json={"buildingName": "Annex"})
+        self._request(
+            "POST /buildings/{building_id}/floors", "POST", f"{base}/floors", headers=headers, json={"floor_number": 3}
+        )
+        self._request("GET /buildings/{building_id}/floors", "GET", f"{base}/floors", headers=headers)
+        self._request(
+            "GET /buildings/{building_id}/floors/{floor_id}/slots", "GET", f"{base}/floors/1/slots", headers=headers
+        )
+
+    def test_offices(self):
+        headers = self._admin_headers()
+        base = f"/buildings/{self.building_id}/offices"
+        self.client.post(f"/buildings/{self.building_id}/floors", headers=headers, json={"floor_number": 3})
+
+        self._request("GET /offices/", "GET", "/offices/", headers=headers)
+        self._request(
+            "POST /buildings/{building_id}/offices",
+            "POST",
+            base,
+            headers=headers,
+            json={"office_name": "Annex", "floor_number": 3},
+        )
+        office_id = self.seeded.office_ids[0]
+        self._request(
+            "DELETE /buildings/{building_id}/offices/{office_id}",
+            "DELETE",
+            f"{base}/{office_id}",
+            headers=headers,
+        )
+
+    def test_parkings(self):
+        headers = self._user_headers()
+
+        self._request("POST /parkings/", "POST", "/parkings/", headers=headers, json={"numberplate": self.user.numberplate})
+        self._request(
+            "PATCH /parkings/{numberplate}/unpark", "PATCH", f"/parkings/{self.user.numberplate}/unpark", headers=headers
+        )
+
+    def test_active_parkings(self):
+        self.client.post("/parkings/", headers=self._user_headers(), json={"numberplate": self.user.numberplate})
+        url = f"/admin/buildings/{self.building_id}/active-parkings"
+
+        calls = self._request("GET /admin/buildings/{building_id}/active-parkings", "GET", url, headers=self._admin_headers())
+
+        self.assertEqual(calls.total, 1)
+
+    def test_utilization(self):
+        self._add_history(5)
+        asyncio.run(RollupRepository(db=self.dynamodb).build_rollups(
+            datetime.date(2023, 11, 14), datetime.date(2023, 11, 20), total_segments=1
+        ))
+        url = f"/admin/buildings/{self.building_id}/utilization?start=2023-11-14&end=2023-11-20"
+
+        self._request("GET /admin/buildings/{building_id}/utilization", "GET", url, headers=self._admin_headers())
+
+    def test_get_parkings_reads_one_query_per_page(self):
+        self._add_history(2)
+        small = self._request("GET /parkings/", "GET", "/parkings/", headers=self._user_headers())
+        # one page of the new layout, then the legacy range
+        self.assertEqual(small.by_operation["Query"], 2)
+
+        self._add_history(2 * PARKINGS_STREAM_PAGE_SIZE + 50)
+        with count_dynamodb_calls(self.dynamodb.meta.client) as large:
+            response = self.client.get("/parkings/", headers=self._user_headers())
+
+        self.assertEqual(len(response.json()), 2 * PARKINGS_STREAM_PAGE_SIZE + 50)
+        # two more pages of the new layout; the legacy range is still queried once, at the end
+        self.assertEqual(large.by_operation["Query"], small.by_operation["Query"] + 2)
+        self.assertEqual(large.by_operation["BatchGetItem"], small.by_operation["BatchGetItem"])
+        self.assertEqual(large.by_operation.keys(), {"Query", "BatchGetItem"})
+
+    def test_parkings_pages_and_stream(self):
+        self._add_history(5)
+        headers = self._user_headers()
+
+        calls = self._request("GET /parkings/", "GET", "/parkings/?limit=2", headers=headers)
+        self.assertEqual(calls.by_operation["Query"], 1)
+
+        with count_dynamodb_calls(self.dynamodb.meta.client) as stream_calls:
+            response = self.client.get("/parkings/", headers={**headers, "Accept": "application/x-ndjson"})
+        self.assertEqual(len(response.text.splitlines()), 5)
+        stream_calls.assert_within(**BUDGETS["GET /parkings/"])
+
+    def test_get_bill_does_not_grow_with_history(self):
+        def put_bill(entries: int):
+            self.table.put_item(Item={
+                "PK": f"USER#{self.user.user_id}",
+                "SK": "BILL#2025#1",
+                "BillingMonth": 1,
+                "BillingYear": 2025,
+                "TotalAmount": 0,
+                "BillDate": "2025-01-28",
+                "ParkingHistory": [
+                    {
+                        "TicketId": f"t{i}",
+                        "NumberPlate": self.user.numberplate,
+                        "BuildingId": self.seeded.building_ids[i % 2],
+                        "BuildingName": "",
+                        "FloorNumber": 1,
+                        "SlotNumber": 1,
+                        "VehicleType": "TwoWheeler",
+                        "StartTime": i,
+                        "EndTime": i + 1,
+                    }
+                    for i in range(entries)
+                ],
+            })
+
+        put_bill(2)
+        small = self._request("GET /billing", "GET", "/billing?month=1&year=2025", headers=self._user_headers())
+
+        put_bill(60)
+        large = self._request("GET /billing", "GET", "/billing?month=1&year=2025", headers=self._user_headers())
+
+        self.assertEqual(small.by_operation, large.by_operation)
+
+    def test_get_floors_does_not_grow_with_floors(self):
+        headers = self._admin_headers()
+        url = f"/buildings/{self.building_id}/floors"
+        small = self._request("GET /buildings/{building_id}/floors", "GET", url, headers=headers)
+
+        for floor_number in range(3, 8):
+            self.client.post(url, headers=headers, json={"floor_number": floor_number})
+            self.client.post(
+                f"/buildings/{self.building_id}/offices",
+                headers=headers,
+                json={"office_name": f"Office {floor_number}", "floor_number": floor_number},
+            )
+        large = self._request("GET /buildings/{building_id}/floors", "GET", url, headers=headers)
+
+        self.assertEqual(small.by_operation, large.by_operation)
+
+    def test_metrics_and_health(self):
+        self._request("GET /metrics", "GET", "/metrics")
+        self._request("GET /health", "GET", "/health")
+        self._request("GET /admin/diagnostics", "GET", "/admin/diagnostics", headers=self._admin_headers())
+        self._request("GET /admin/profile", "GET", "/admin/profile?seconds=0.05", headers=self._admin_headers())
+
+
+if __name__ == "__main__":
+    unittest.main()
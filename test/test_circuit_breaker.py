@@ -0,0 +1,233 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+
+import boto3
+from botocore.exceptions import ClientError, EndpointConnectionError
+from fastapi.testclient import TestClient
+from moto import mock_aws
+
+from app.errors.web_exception import UNAVAILABLE_ERROR
+from app.main import app
+from app.repository import circuit_breaker
+from app.repository.batch import UnprocessedKeysError
+from app.repository.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    STALE_HEADER,
+    CircuitBreaker,
+    CircuitOpenError,
+    install_circuit_breaker,
+    is_unavailable,
+    serve_stale,
+)
+from benchmarks.seed import create_table, seed
+from test.admission_harness import FakeClock
+
+
+def _breaker(clock: FakeClock, **kwargs) -> CircuitBreaker:
+    options = dict(
+        window_seconds=10, min_calls=4, error_rate=0.5, slow_call_seconds=1.0, slow_call_rate=0.75,
+        open_seconds=5, half_open_probes=2, clock=clock,
+    )
+    return CircuitBreaker(**{**options, **kwargs})
+
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = _breaker(self.clock)
+
+    def _calls(self, *outcomes: bool, duration: float = 0.01):
+        for failed in outcomes:
+            self.assertFalse(self.breaker.before_call())
+            self.breaker.record(duration, failed)
+
+    def test_opens_on_error_rate_after_min_calls(self):
+        self._calls(True, True, True)
+        self.assertEqual(self.breaker.state, CLOSED)
+
+        self._calls(False)
+
+        self.assertEqual(self.breaker.state, OPEN)
+        with self.assertRaises(CircuitOpenError) as ctx:
+            self.breaker.before_call()
+        self.assertEqual(ctx.exception.retry_after, 5)
+
+    def test_old_calls_leave_the_window(self):
+        self._calls(True, True)
+        self.clock.advance(11)
+        self._calls(False, False, True)
+
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    def test_opens_on_slow_calls(self):
+        self._calls(False, False, False, duration=1.5)
+        self.assertEqual(self.breaker.state, CLOSED)
+
+        self._calls(False, duration=1.5)
+
+        self.assertEqual(self.breaker.state, OPEN)
+
+    def test_half_open_probes_close_the_breaker(self):
+        self._calls(True, True, True, True)
+        self.clock.advance(5)
+
+        first, second = self.breaker.before_call(), self.breaker.before_call()
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        self.assertTrue(first and second)
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+
+        self.breaker.record(0.01, False, probe=True)
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        self.breaker.record(0.01, False, probe=True)
+
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.assertFalse(self.breaker.before_call())
+
+    def test_failed_probe_reopens(self):
+        self._calls(True, True, True, True)
+        self.clock.advance(5)
+        self.assertTrue(self.breaker.before_call())
+
+        self.breaker.record(0.01, True, probe=True)
+
+        self.assertEqual(self.breaker.state, OPEN)
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+
+    def test_unavailable_errors(self):
+        throttled = ClientError({"Error": {"Code": "ThrottlingException"}, "ResponseMetadata": {"HTTPStatusCode": 400}}, "Query")
+        server = ClientError({"Error": {"Code": "InternalServerError"}, "ResponseMetadata": {"HTTPStatusCode": 500}}, "Query")
+        conditional = ClientError(
+            {"Error": {"Code": "ConditionalCheckFailedException"}, "ResponseMetadata": {"HTTPStatusCode": 400}}, "PutItem"
+        )
+
+        self.assertTrue(is_unavailable(throttled))
+        self.assertTrue(is_unavailable(server))
+        self.assertTrue(is_unavailable(EndpointConnectionError(endpoint_url="http://x")))
+        self.assertTrue(is_unavailable(CircuitOpenError(1)))
+        self.assertFalse(is_unavailable(conditional))
+        self.assertFalse(is_unavailable(ValueError()))
+
+
+class _Repo:
+    def __init__(self):
+        self.error: Exception | None = None
+        self.calls = 0
+
+    @serve_stale
+    async def read(self, ids: list[str]) -> list[str]:
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return [f"{i}-{self.calls}" for i in ids]
+
+
+class TestServeStale(unittest.TestCase):
+
+    def test_last_good_result_while_unavailable(self):
+        repo = _Repo()
+        fresh = asyncio.run(repo.read(["a"]))
+
+        repo.error = CircuitOpenError(3)
+        self.assertEqual(asyncio.run(repo.read(["a"])), fresh)
+        with self.assertRaises(CircuitOpenError):
+            asyncio.run(repo.read(["b"]))
+
+    def test_other_errors_are_raised(self):
+        repo = _Repo()
+        asyncio.run(repo.read(["a"]))
+
+        repo.error = ValueError("bad request")
+        with self.assertRaises(ValueError):
+            asyncio.run(repo.read(["a"]))
+
+
+@mock_aws
+class TestBreakerInApp(unittest.TestCase):
+
+    def setUp(self):
+        self.dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
+        self.table = create_table(self.dynamodb)
+        self.seeded = asyncio.run(seed(self.dynamodb, buildings=1, floors=1, users=1, bill_month=(2025, 1)))
+        self.clock = FakeClock()
+        self.breaker = _breaker(self.clock)
+        install_circuit_breaker(self.dynamodb.meta.client, self.breaker)
+        app.state.db = self.dynamodb
+        self.client = TestClient(app)
+        self.headers = {"Authorization": f"Bearer {self.seeded.admin_token}"}
+
+    def tearDown(self):
+        self.client.close()
+        del app.state.db
+        events = self.dynamodb.meta.client.meta.events
+        for event, unique_id in (
+            ("before-call.dynamodb", "breaker-before-call"),
+            ("after-call.dynamodb", "breaker-after-call"),
+            ("after-call-error.dynamodb", "breaker-after-call-error"),
+        ):
+            events.unregister(event, unique_id=unique_id)
+        self.table.delete()
+
+    def _trip(self):
+        for _ in range(4):
+            self.breaker.record(0.01, True)
+        self.assertEqual(self.breaker.state, OPEN)
+
+    def test_cached_reads_are_served_stale(self):
+        fresh = self.client.get("/buildings/", headers=self.headers)
+        self.assertIn("etag", fresh.headers)
+        self.assertEqual(self.breaker.snapshot()["recent_calls"], 2)
+        self._trip()
+
+        stale = self.client.get("/buildings/", headers=self.headers)
+
+        self.assertEqual(stale.status_code, 200)
+        self.assertEqual(stale.json(), fresh.json())
+        self.assertIn("BuildingRepository.get_buildings", stale.headers[STALE_HEADER])
+        self.assertNotIn("etag", stale.headers)
+        self.assertEqual(stale.headers["cache-control"], "no-store")
+
+    def test_writes_and_uncached_reads_fail_fast(self):
+        self._trip()
+        self.clock.advance(2)
+
+        write = self.client.post("/buildings/", headers=self.headers, json={"buildingName": "Annex"})
+        read = self.client.get("/parkings/", headers={"Authorization": f"Bearer {self.seeded.users[0].token}"})
+
+        for response in (write, read):
+            self.assertEqual(response.status_code, 503)
+            self.assertEqual(response.headers["retry-after"], "3")
+            self.assertEqual(response.json()["code"], UNAVAILABLE_ERROR)
+
+    def test_recovers_through_half_open_probes(self):
+        self._trip()
+        self.clock.advance(5)
+
+        self.assertEqual(self.client.get("/buildings/", headers=self.headers).status_code, 200)
+
+        self.assertEqual(self.breaker.state, CLOSED)
+
+
+class TestFailureClassification(unittest.TestCase):
+
+    def test_failed(self):
+        ok = SimpleNamespace(status_code=200)
+        bad_request = SimpleNamespace(status_code=400)
+        server_error = SimpleNamespace(status_code=500)
+
+        self.assertFalse(circuit_breaker._failed(ok, {}))
+        self.assertFalse(circuit_breaker._failed(bad_request, {"Error": {"Code": "ConditionalCheckFailedException"}}))
+        self.assertTrue(circuit_breaker._failed(bad_request, {"Error": {"Code": "ProvisionedThroughputExceededException"}}))
+        self.assertTrue(circuit_breaker._failed(server_error, {}))
+
+    def test_throttled_batch_read_is_unavailable(self):
+        self.assertTrue(circuit_breaker.is_unavailable(UnprocessedKeysError(3)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,169 @@
+import gzip
+import unittest
+import zlib
+from unittest.mock import patch
+
+from fastapi import FastAPI, Response
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.main import app as main_app
+from app.utils import compression
+from app.utils.compression import CompressionMiddleware, PrecompressedCache, negotiate
+from app.utils.etag import etag_matches
+from app.utils.serialization import ORJSONResponse
+
+BIG = [{"slotNumber": i, "slotType": "TwoWheeler", "isAssigned": False} for i in range(200)]
+
+
+def _app(cache: PrecompressedCache) -> FastAPI:
+    app = FastAPI(default_response_class=ORJSONResponse)
+    app.add_middleware(CompressionMiddleware, minimum_size=500, cache=cache)
+
+    @app.get("/big")
+    def big(response: Response):
+        response.headers["ETag"] = '"v1"'
+        return BIG
+
+    @app.get("/small")
+    def small():
+        return {"status": "ok"}
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse((f'{{"line":{i}}}\n' * 50 for i in range(3)), media_type="application/x-ndjson")
+
+    @app.get("/not-modified")
+    def not_modified():
+        return Response(status_code=304, headers={"ETag": '"v1"'})
+
+    return app
+
+
+class TestNegotiate(unittest.TestCase):
+
+    def test_prefers_brotli_then_gzip(self):
+        with patch.object(compression, "brotli", object()):
+            self.assertEqual(negotiate("gzip, deflate, br"), "br")
+            self.assertEqual(negotiate("gzip;q=1, br;q=0.5"), "gzip")
+            self.assertEqual(negotiate("*"), "br")
+        with patch.object(compression, "brotli", None):
+            self.assertEqual(negotiate("gzip, br"), "gzip")
+            self.assertIsNone(negotiate("br"))
+
+    def test_identity(self):
+        self.assertIsNone(negotiate(None))
+        self.assertIsNone(negotiate("identity"))
+        self.assertIsNone(negotiate("gzip;q=0"))
+        self.assertIsNone(negotiate("deflate"))
+
+
+class TestCompressionMiddleware(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = PrecompressedCache()
+        self.client = TestClient(_app(self.cache))
+
+    def _get(self, path: str, accept_encoding: str = "gzip"):
+        return self.client.get(path, headers={"Accept-Encoding": accept_encoding})
+
+    def test_large_responses_are_gzipped(self):
+        response = self._get("/big")
+
+        self.assertEqual(response.headers["content-encoding"], "gzip")
+        self.assertEqual(response.headers["vary"], "Accept-Encoding")
+        self.assertEqual(response.json(), BIG)
+        self.assertLess(int(response.headers["content-length"]), len(response.content))
+
+    @unittest.skipIf(compression.brotli is None, "brotli is not installed")
+    def test_brotli_when_accepted(self):
+        response = self._get("/big", "br, gzip")
+
+        self.assertEqual(response.headers["content-encoding"], "br")
+        self.assertEqual(response.json(), BIG)
+
+    def test_small_and_unaccepted_responses_are_not_compressed(self):
+        small = self._get("/small")
+        identity = self._get("/big", "identity")
+
+        self.assertNotIn("content-encoding", small.headers)
+        self.assertEqual(small.headers["vary"], "Accept-Encoding")
+        self.assertNotIn("content-encoding", identity.headers)
+        self.assertEqual(identity.json(), BIG)
+
+    def test_etagged_responses_are_compressed_once(self):
+        with patch.object(compression, "compress", wraps=compression.compress) as compress:
+            first = self._get("/big")
+            second = self._get("/big")
+
+        compress.assert_called_once()
+        self.assertEqual(len(self.cache), 1)
+        self.assertEqual(first.content, second.content)
+
+    def test_compressed_copies_have_their_own_etag(self):
+        gzipped = self._get("/big")
+        identity = self._get("/big", "identity")
+
+        self.assertEqual(gzipped.headers["etag"], '"v1-gzip"')
+        self.assertEqual(identity.headers["etag"], '"v1"')
+        # either tag revalidates the document
+        self.assertTrue(etag_matches(gzipped.headers["etag"], '"v1"'))
+        self.assertTrue(etag_matches('W/"v1-br"', '"v1"'))
+        self.assertFalse(etag_matches('"v0-gzip"', '"v1"'))
+
+    def test_streams_are_compressed_per_chunk(self):
+        response = self._get("/stream")
+
+        self.assertEqual(response.headers["content-encoding"], "gzip")
+        self.assertNotIn("content-length", response.headers)
+        self.assertEqual(len(response.text.splitlines()), 150)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_not_modified_passes_through(self):
+        response = self._get("/not-modified")
+
+        self.assertEqual(response.status_code, 304)
+        self.assertNotIn("content-encoding", response.headers)
+
+    def test_gzip_output_is_deterministic(self):
+        body = b'{"a":1}' * 100
+
+        self.assertEqual(compression.compress(body, "gzip"), compression.compress(body, "gzip"))
+        self.assertEqual(gzip.decompress(compression.compress(body, "gzip")), body)
+
+    def test_stream_compressor_flushes_every_chunk(self):
+        stream = compression._StreamCompressor("gzip")
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+        self.assertEqual(decompressor.decompress(stream.chunk(b'{"line":1}\n')), b'{"line":1}\n')
+        self.assertEqual(decompressor.decompress(stream.chunk(b'{"line":2}\n') + stream.finish()), b'{"line":2}\n')
+
+
+class TestPrecompressedCache(unittest.TestCase):
+
+    def test_evicts_least_recently_used_by_size(self):
+        cache = PrecompressedCache(max_bytes=10)
+        cache.put(("a",), b"1234")
+        cache.put(("b",), b"1234")
+        cache.get(("a",))
+        cache.put(("c",), b"1234")
+
+        self.assertIsNone(cache.get(("b",)))
+        self.assertEqual(cache.get(("a",)), b"1234")
+        self.assertEqual(cache.size, 8)
+
+    def test_skips_bodies_larger_than_the_cache(self):
+        cache = PrecompressedCache(max_bytes=3)
+        cache.put(("a",), b"1234")
+
+        self.assertEqual(len(cache), 0)
+
+
+class TestAppCompression(unittest.TestCase):
+
+    def test_app_compresses_responses(self):
+        self.assertIn(CompressionMiddleware, [m.cls for m in main_app.user_middleware])
+
+
+if __name__ == "__main__":
+    unittest.main()
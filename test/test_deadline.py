@@ -0,0 +1,229 @@
+import asyncio
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import boto3
+import httpx
+from fastapi.testclient import TestClient
+from moto import mock_aws
+
+from app.constants import PROFILER_MAX_SECONDS, REQUEST_DEADLINE_MAX_SECONDS, REQUEST_DEADLINE_SECONDS
+from app.dto.parking import ParkingHistoryResponseDTO
+from app.errors.web_exception import DEADLINE_ERROR
+from app.main import app
+from app.services.building import BuildingService
+from app.services.parking import ParkingService
+from app.utils import deadline
+from app.utils.deadline import (
+    DeadlineExceeded,
+    DeadlineMiddleware,
+    check_deadline,
+    install_deadline_hooks,
+    request_deadline,
+    route_deadline,
+)
+from benchmarks.seed import create_table, seed
+
+
+def _run(app, path: str = "/work", headers: dict | None = None) -> httpx.Response:
+    async def request():
+        transport = httpx.ASGITransport(app=DeadlineMiddleware(app))
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get(path, headers=headers or {})
+
+    return asyncio.run(request())
+
+
+def _sleeping_app(seconds: float, seen: list | None = None):
+    async def app(scope, receive, send):
+        if seen is not None:
+            seen.append(deadline.remaining())
+        await asyncio.sleep(seconds)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"done"})
+
+    return app
+
+
+class TestDeadlineMiddleware(unittest.TestCase):
+
+    def test_route_defaults(self):
+        self.assertEqual(route_deadline("/parkings/"), REQUEST_DEADLINE_SECONDS)
+        self.assertEqual(route_deadline("/admin/profile"), PROFILER_MAX_SECONDS + 5)
+
+    def test_header_sets_the_deadline_within_the_cap(self):
+        seen = []
+        _run(_sleeping_app(0, seen), headers={"X-Request-Timeout": "2.5"})
+        _run(_sleeping_app(0, seen), headers={"X-Request-Timeout": "100000"})
+        _run(_sleeping_app(0, seen), headers={"X-Request-Timeout": "soon"})
+
+        self.assertAlmostEqual(seen[0], 2.5, delta=0.5)
+        self.assertAlmostEqual(seen[1], REQUEST_DEADLINE_MAX_SECONDS, delta=0.5)
+        self.assertAlmostEqual(seen[2], REQUEST_DEADLINE_SECONDS, delta=0.5)
+
+    def test_work_past_the_deadline_is_cancelled(self):
+        start = time.monotonic()
+        response = _run(_sleeping_app(5), headers={"X-Request-Timeout": "0.05"})
+
+        self.assertEqual(response.status_code, 504)
+        self.assertEqual(response.json()["code"], DEADLINE_ERROR)
+        self.assertLess(time.monotonic() - start, 2)
+
+    def test_deadline_exceeded_in_the_data_layer_is_a_504(self):
+        async def app(scope, receive, send):
+            raise DeadlineExceeded("before-call")
+
+        self.assertEqual(_run(app).status_code, 504)
+
+    def test_started_responses_are_aborted(self):
+        async def app(scope, receive, send):
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b"first", "more_body": True})
+            await asyncio.sleep(5)
+
+        with self.assertRaises(TimeoutError):
+            _run(app, headers={"X-Request-Timeout": "0.05"})
+
+
+    def test_streams_renew_the_deadline_with_each_chunk(self):
+        seen = []
+
+        async def app(scope, receive, send):
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            for _ in range(6):
+                await asyncio.sleep(0.05)
+                seen.append(deadline.remaining())
+                await send({"type": "http.response.body", "body": b"line\n", "more_body": True})
+            await send({"type": "http.response.body", "body": b""})
+
+        # 0.3 s of streaming against a 0.1 s deadline
+        response = _run(app, headers={"X-Request-Timeout": "0.1"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.text, "line\n" * 6)
+        # each page read sees close to a full deadline, not what is left of the first one
+        self.assertGreater(seen[-1], 0.02)
+
+
+class TestCheckDeadline(unittest.TestCase):
+
+    def test_no_deadline_outside_requests(self):
+        self.assertIsNone(deadline.remaining())
+        check_deadline("before-call")
+
+    def test_raises_once_past_the_margin(self):
+        token = request_deadline.set(time.monotonic() + 0.01)
+        try:
+            check_deadline("before-send")
+            with self.assertRaises(DeadlineExceeded):
+                check_deadline("retry", margin=0.05)
+        finally:
+            request_deadline.reset(token)
+
+    def test_only_retryable_failures_are_refused(self):
+        token = request_deadline.set(time.monotonic())
+        try:
+            ok = (SimpleNamespace(status_code=200), {})
+            conditional = (SimpleNamespace(status_code=400), {"Error": {"Code": "ConditionalCheckFailedException"}})
+            throttled = (SimpleNamespace(status_code=400), {"Error": {"Code": "ThrottlingException"}})
+
+            self.assertIsNone(deadline._needs_retry(response=ok, caught_exception=None))
+            self.assertIsNone(deadline._needs_retry(response=conditional, caught_exception=None))
+            with self.assertRaises(DeadlineExceeded):
+                deadline._needs_retry(response=throttled, caught_exception=None)
+            with self.assertRaises(DeadlineExceeded):
+                deadline._needs_retry(response=None, caught_exception=ConnectionError())
+        finally:
+            request_deadline.reset(token)
+
+
+@mock_aws
+class TestDeadlineHooks(unittest.TestCase):
+
+    def setUp(self):
+        self.dynamodb = boto3.resource("dynamodb", region_name="us-east-1", config=deadline.dynamodb_config())
+        self.table = create_table(self.dynamodb)
+        install_deadline_hooks(self.dynamodb.meta.client)
+
+    def tearDown(self):
+        self.table.delete()
+
+    def test_calls_after_the_deadline_are_not_made(self):
+        token = request_deadline.set(time.monotonic() - 1)
+        try:
+            with self.assertRaises(DeadlineExceeded):
+                self.table.get_item(Key={"PK": "USER", "SK": "nobody"})
+        finally:
+            request_deadline.reset(token)
+
+        self.assertNotIn("Item", self.table.get_item(Key={"PK": "USER", "SK": "nobody"}))
+
+    def test_deadline_reaches_to_thread_workers(self):
+        async def call():
+            request_deadline.set(time.monotonic() - 1)
+            await asyncio.to_thread(lambda: self.table.get_item(Key={"PK": "USER", "SK": "nobody"}))
+
+        with self.assertRaises(DeadlineExceeded):
+            asyncio.run(call())
+
+
+@mock_aws
+class TestAppDeadline(unittest.TestCase):
+
+    def setUp(self):
+        self.dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
+        self.table = create_table(self.dynamodb)
+        self.seeded = asyncio.run(seed(self.dynamodb, buildings=1, floors=1, users=1, bill_month=(2025, 1)))
+        app.state.db = self.dynamodb
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        self.client.close()
+        del app.state.db
+        self.table.delete()
+
+    def test_slow_route_times_out(self):
+        async def slow(*args, **kwargs):
+            await asyncio.sleep(5)
+
+        headers = {"Authorization": f"Bearer {self.seeded.admin_token}", "X-Request-Timeout": "0.1"}
+        with patch.object(BuildingService, "get_buildings", slow):
+            response = self.client.get("/buildings/", headers=headers)
+
+        self.assertEqual(response.status_code, 504)
+        self.assertEqual(response.json()["code"], DEADLINE_ERROR)
+
+    def test_parkings_stream_outlives_the_default_deadline(self):
+        item = ParkingHistoryResponseDTO.from_model(
+            ticket_id="t1",
+            number_plate="ABC123",
+            building_id="b1",
+            building_name="HQ",
+            floor_number=1,
+            slot_number=1,
+            start_time=1,
+            end_time=2,
+            vehicle_type="Car",
+        )
+
+        async def slow_pages(*args, **kwargs):
+            for _ in range(5):
+                await asyncio.sleep(0.1)
+                yield item
+
+        user = self.seeded.users[0]
+        headers = {"Authorization": f"Bearer {user.token}", "Accept": "application/x-ndjson"}
+        with (
+            patch.object(deadline, "REQUEST_DEADLINE_SECONDS", 0.25),
+            patch.object(ParkingService, "stream_parkings", slow_pages),
+        ):
+            response = self.client.get("/parkings/", headers=headers)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.text.splitlines()), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+from decimal import Decimal
+
+from app.models.floor_grid import FloorGrid
+from app.models.slot import OccupantDetails, Slot, SlotType
+
+
+def _item(slot_id: int, slot_type: str = "TwoWheeler", assigned: bool = False, occupant: dict | None = None) -> dict:
+    return {
+        "PK": "BUILDING#b1",
+        "SK": f"FLOOR#1#SLOT#{slot_id}",
+        "SlotId": Decimal(slot_id),
+        "SlotType": slot_type,
+        "IsAssigned": assigned,
+        "IsOccupied": occupant is not None,
+        "OccupiedBy": occupant,
+    }
+
+
+class TestFloorGrid(unittest.TestCase):
+
+    def setUp(self):
+        self.occupant = {"Username": "u", "NumberPlate": "KA01", "Email": "u@example.com", "StartTime": Decimal(7)}
+        self.grid = FloorGrid.from_items("b1", 1, [
+            _item(1, assigned=True, occupant=self.occupant),
+            _item(10, "FourWheeler"),
+            _item(2, assigned=True),
+            _item(3, "FourWheeler"),
+        ])
+
+    def test_columns_and_bitsets(self):
+        self.assertEqual(len(self.grid), 4)
+        self.assertEqual(list(self.grid.slot_ids), [1, 10, 2, 3])
+        self.assertEqual([self.grid.slot_type(p) for p in range(4)], [
+            SlotType.TWO_WHEELER, SlotType.FOUR_WHEELER, SlotType.TWO_WHEELER, SlotType.FOUR_WHEELER,
+        ])
+        self.assertEqual(self.grid.assigned, 0b0101)
+        self.assertEqual(self.grid.occupied, 0b0001)
+        self.assertEqual((self.grid.assigned_count, self.grid.occupied_count), (2, 1))
+        self.assertEqual(self.grid.occupants, {0: OccupantDetails(**self.occupant)})
+
+    def test_free_positions(self):
+        self.assertEqual(list(self.grid.free_positions()), [1, 3])
+        self.assertEqual(list(FloorGrid("b1", 1).free_positions()), [])
+
+    def test_slots_match_validated_models(self):
+        expected = [
+            Slot(building_id="b1", floor_number=1, **{k: v for k, v in item.items() if k not in ("PK", "SK")})
+            for item in [
+                _item(1, assigned=True, occupant=self.occupant),
+                _item(10, "FourWheeler"),
+                _item(2, assigned=True),
+                _item(3, "FourWheeler"),
+            ]
+        ]
+
+        self.assertEqual(self.grid.slots(), expected)
+        self.assertEqual(self.grid.slot(0).model_dump(by_alias=True), expected[0].model_dump(by_alias=True))
+
+    def test_has_no_instance_dict(self):
+        with self.assertRaises(AttributeError):
+            self.grid.extra = 1
+
+
+if __name__ == "__main__":
+    unittest.main()
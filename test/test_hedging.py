@@ -0,0 +1,164 @@
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from app.repository import hedging
+from app.repository.hedging import HedgeBudget, LatencyTracker, hedged
+
+
+class _Calls:
+    """A blocking call whose first invocation is slow (or fails) and later ones are fast."""
+
+    def __init__(self, first_delay: float = 0.0, first_error: Exception | None = None):
+        self.first_delay = first_delay
+        self.first_error = first_error
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def __call__(self) -> str:
+        with self._lock:
+            self.count += 1
+            number = self.count
+        if number == 1:
+            time.sleep(self.first_delay)
+            if self.first_error is not None:
+                raise self.first_error
+            return "primary"
+        return "hedge"
+
+
+class TestLatencyTracker(unittest.TestCase):
+
+    def test_no_threshold_until_enough_samples(self):
+        tracker = LatencyTracker(percentile=90, window=100, min_samples=10, min_delay=0.001)
+        for i in range(9):
+            tracker.record(0.01)
+        self.assertIsNone(tracker.threshold())
+
+        tracker.record(0.01)
+
+        self.assertEqual(tracker.threshold(), 0.01)
+
+    def test_threshold_is_the_percentile_of_the_window(self):
+        tracker = LatencyTracker(percentile=50, window=10, min_samples=10, min_delay=0.001)
+        for i in range(1, 11):
+            tracker.record(i / 1000)
+        self.assertAlmostEqual(tracker.threshold(), 0.006)
+
+        # recomputed every few samples, not on every call; by then only slow calls are in the window
+        for _ in range(hedging._RECOMPUTE_EVERY - 1):
+            tracker.record(1.0)
+        self.assertAlmostEqual(tracker.threshold(), 0.006)
+        tracker.record(1.0)
+        self.assertEqual(tracker.threshold(), 1.0)
+
+    def test_threshold_has_a_floor(self):
+        tracker = LatencyTracker(percentile=50, window=10, min_samples=1, min_delay=0.005)
+        tracker.record(0.0001)
+
+        self.assertEqual(tracker.threshold(), 0.005)
+
+
+class TestHedgeBudget(unittest.TestCase):
+
+    def test_earns_a_fraction_per_call_up_to_the_burst(self):
+        budget = HedgeBudget(rate=0.25, burst=2)
+        self.assertTrue(budget.spend())
+        self.assertTrue(budget.spend())
+        self.assertFalse(budget.spend())
+
+        for _ in range(3):
+            budget.earn()
+        self.assertFalse(budget.spend())
+        budget.earn()
+        self.assertTrue(budget.spend())
+
+        for _ in range(100):
+            budget.earn()
+        self.assertEqual(budget.balance, 2)
+
+
+class TestHedged(unittest.TestCase):
+
+    def setUp(self):
+        patches = [
+            patch.object(hedging, "HEDGED_READS", True),
+            patch.object(hedging, "budget", HedgeBudget(rate=0.05, burst=1)),
+            patch.dict(hedging._trackers, clear=True),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def _warm(self, name: str, seconds: float = 0.001):
+        tracker = hedging._trackers[name] = LatencyTracker(min_samples=5, min_delay=0.001)
+        for _ in range(5):
+            tracker.record(seconds)
+
+    def test_slow_primary_is_hedged(self):
+        self._warm("get")
+        calls = _Calls(first_delay=0.5)
+
+        async def timed():
+            start = time.perf_counter()
+            result = await hedged("get", calls)
+            return result, time.perf_counter() - start
+
+        result, elapsed = asyncio.run(timed())
+
+        self.assertEqual(result, "hedge")
+        self.assertEqual(calls.count, 2)
+        self.assertLess(elapsed, 0.4)
+
+    def test_fast_primary_is_not_hedged(self):
+        self._warm("get", seconds=1.0)
+        calls = _Calls()
+
+        self.assertEqual(asyncio.run(hedged("get", calls)), "primary")
+        self.assertEqual(calls.count, 1)
+
+    def test_no_hedging_without_samples(self):
+        calls = _Calls(first_delay=0.05)
+
+        self.assertEqual(asyncio.run(hedged("get", calls)), "primary")
+        self.assertEqual(calls.count, 1)
+        self.assertEqual(len(hedging._trackers["get"]._samples), 1)
+
+    def test_hedges_are_capped_by_the_budget(self):
+        self._warm("get")
+        hedging.budget.balance = 0
+
+        calls = _Calls(first_delay=0.05)
+
+        self.assertEqual(asyncio.run(hedged("get", calls)), "primary")
+        self.assertEqual(calls.count, 1)
+
+    def test_failed_primary_falls_back_to_the_hedge(self):
+        self._warm("get")
+        calls = _Calls(first_delay=0.05, first_error=RuntimeError("slow and broken"))
+
+        self.assertEqual(asyncio.run(hedged("get", calls)), "hedge")
+
+    def test_both_failing_raises(self):
+        self._warm("get")
+
+        def broken():
+            time.sleep(0.02)
+            raise RuntimeError("down")
+
+        with self.assertRaises(RuntimeError):
+            asyncio.run(hedged("get", broken))
+
+    def test_off_by_default(self):
+        self._warm("get")
+        calls = _Calls(first_delay=0.05)
+
+        with patch.object(hedging, "HEDGED_READS", False):
+            self.assertEqual(asyncio.run(hedged("get", calls)), "primary")
+        self.assertEqual(calls.count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import time
+import unittest
+from unittest.mock import patch
+
+import jwt
+from fastapi.testclient import TestClient
+
+from app.constants import JWT_ALGORITHM, JWT_SECRET
+from app.errors.web_exception import WebException
+from app.main import app
+from app.models.roles import Roles
+from app.utils.jwt_utils import TokenCache, decode_user_jwt, token_cache, validate_jwt
+
+
+def _token(role=Roles.CUSTOMER.value, exp_in=3600, user_id="user_1"):
+    now = int(time.time())
+    return jwt.encode(
+        {
+            "email": "user@example.com",
+            "id": user_id,
+            "role": role,
+            "officeId": "office_1",
+            "exp": now + exp_in,
+            "iat": now,
+        },
+        JWT_SECRET,
+        algorithm=JWT_ALGORITHM,
+    )
+
+
+class TestTokenCache(unittest.TestCase):
+
+    def setUp(self):
+        token_cache.clear()
+
+    def tearDown(self):
+        token_cache.clear()
+
+    def test_hit_returns_same_model(self):
+        token = _token()
+
+        first = decode_user_jwt(token)
+        second = decode_user_jwt(token)
+
+        self.assertIs(first, second)
+        self.assertEqual(token_cache.hits, 1)
+        self.assertEqual(token_cache.misses, 1)
+
+    def test_hit_skips_signature_check(self):
+        token = _token()
+        decode_user_jwt(token)
+
+        with patch("app.utils.jwt_utils.jwt.decode") as decode:
+            decode_user_jwt(token)
+
+        decode.assert_not_called()
+
+    def test_entry_expires_at_exp_claim(self):
+        token = _token(exp_in=60)
+        user = decode_user_jwt(token)
+
+        with patch("app.utils.jwt_utils.time.time", return_value=user.exp + 1):
+            self.assertIsNone(token_cache.get(token))
+        self.assertEqual(len(token_cache), 0)
+
+    def test_bounded_lru(self):
+        cache = TokenCache(maxsize=2)
+        users = [decode_user_jwt(_token(user_id=f"u{i}")) for i in range(3)]
+        tokens = [_token(user_id=f"u{i}") for i in range(3)]
+        for token, user in zip(tokens, users):
+            cache.put(token, user)
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get(tokens[0]))
+        self.assertIs(cache.get(tokens[2]), users[2])
+
+    def test_disabled_cache_always_misses(self):
+        cache = TokenCache(maxsize=0)
+        token = _token()
+        cache.put(token, decode_user_jwt(token))
+
+        self.assertIsNone(cache.get(token))
+
+    def test_tampered_token_is_rejected(self):
+        token = _token()
+        decode_user_jwt(token)
+
+        with self.assertRaises(WebException):
+            validate_jwt(token[:-2] + ("AA" if not token.endswith("AA") else "BB"))
+
+
+class TestCachedRoleCheck(unittest.TestCase):
+
+    def setUp(self):
+        token_cache.clear()
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        token_cache.clear()
+        self.client.close()
+
+    def test_role_is_checked_per_route_on_cache_hit(self):
+        token = _token(role=Roles.CUSTOMER.value)
+        decode_user_jwt(token)
+
+        response = self.client.get("/buildings/", headers={"Authorization": f"Bearer {token}"})
+
+        assert response.status_code == 401
+        # one hit in admission control, one in the route's auth dependency
+        assert token_cache.hits == 2
+        # the only miss is the decode above
+        assert token_cache.misses == 1
@@ -0,0 +1,34 @@
+import unittest
+
+from benchmarks.load import ScenarioStats, _percentile_ms, compare
+
+
+class TestLoadBenchmarkReport(unittest.TestCase):
+
+    def test_percentiles(self):
+        ordered = [i / 1000 for i in range(1, 101)]
+
+        self.assertEqual(_percentile_ms(ordered, 50), 50)
+        self.assertEqual(_percentile_ms(ordered, 95), 95)
+        self.assertEqual(_percentile_ms(ordered, 99), 99)
+        self.assertIsNone(_percentile_ms([], 50))
+
+    def test_errors_are_not_latency_samples(self):
+        stats = ScenarioStats()
+        stats.record(0.01, 200)
+        stats.record(0.5, 409)
+        stats.record(0.5, "RuntimeError")
+
+        summary = stats.summary(duration=1)
+
+        self.assertEqual(summary["requests"], 1)
+        self.assertEqual(summary["errors"], {"409": 1, "RuntimeError": 1})
+
+    def test_compare_flags_regressions(self):
+        baseline = {"scenarios": {"park": {"p95_ms": 10.0, "throughput_rps": 100.0}}}
+        current = {"scenarios": {"park": {"p95_ms": 13.0, "throughput_rps": 70.0}, "login": {"p95_ms": 1.0}}}
+
+        regressions = compare(current, baseline, tolerance=0.2)
+
+        self.assertEqual(len(regressions), 2)
+        self.assertEqual(compare(baseline, baseline, tolerance=0.2), [])
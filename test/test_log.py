@@ -0,0 +1,112 @@
+import io
+import json
+import logging
+import queue
+import sys
+import unittest
+
+from app.log import (
+    JsonFormatter,
+    NonBlockingQueueHandler,
+    SamplingFilter,
+    log_stats,
+    setup_logging,
+    shutdown_logging,
+)
+
+
+def _record(level=logging.INFO, msg="hello %s", args=("world",), **extra):
+    record = logging.LogRecord("app.test", level, __file__, 1, msg, args, None)
+    for key, value in extra.items():
+        setattr(record, key, value)
+    return record
+
+
+class TestJsonFormatter(unittest.TestCase):
+
+    def test_extra_fields_are_top_level(self):
+        line = JsonFormatter().format(_record(user_id="u1", reasons=[{"Code": "ConditionalCheckFailed"}]))
+
+        entry = json.loads(line)
+        self.assertEqual(entry["msg"], "hello world")
+        self.assertEqual(entry["level"], "INFO")
+        self.assertEqual(entry["logger"], "app.test")
+        self.assertEqual(entry["user_id"], "u1")
+        self.assertEqual(entry["reasons"], [{"Code": "ConditionalCheckFailed"}])
+        self.assertNotIn("args", entry)
+
+    def test_unserializable_values_fall_back_to_str(self):
+        entry = json.loads(JsonFormatter().format(_record(error=ValueError("bad"))))
+
+        self.assertEqual(entry["error"], "bad")
+
+
+class TestSampling(unittest.TestCase):
+
+    def test_debug_records_are_sampled(self):
+        before = log_stats["sampled_out"]
+        drop_all = SamplingFilter(rate=0)
+
+        self.assertFalse(drop_all.filter(_record(level=logging.DEBUG)))
+        self.assertTrue(drop_all.filter(_record(level=logging.INFO)))
+        self.assertTrue(drop_all.filter(_record(level=logging.DEBUG, sample_rate=1)))
+        self.assertEqual(log_stats["sampled_out"] - before, 1)
+
+
+class TestQueueHandler(unittest.TestCase):
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        before = log_stats["dropped"]
+        handler = NonBlockingQueueHandler(queue.Queue(maxsize=1))
+
+        handler.handle(_record())
+        handler.handle(_record())
+
+        self.assertEqual(log_stats["dropped"] - before, 1)
+
+    def test_exception_is_rendered_before_queueing(self):
+        records = queue.Queue()
+        handler = NonBlockingQueueHandler(records)
+        try:
+            raise RuntimeError("boom")
+        except RuntimeError:
+            record = logging.LogRecord("app.test", logging.ERROR, __file__, 1, "failed", None, sys.exc_info())
+        handler.handle(record)
+
+        queued = records.get_nowait()
+        self.assertIsNone(queued.exc_info)
+        self.assertIn("RuntimeError: boom", queued.exc_text)
+        self.assertIn("boom", json.loads(JsonFormatter().format(queued))["exc"])
+
+    def test_pipeline_writes_json_lines(self):
+        stream = io.StringIO()
+        setup_logging(level="INFO", stream=stream, debug_sample_rate=0)
+        try:
+            logger = logging.getLogger("app.pipeline")
+            logger.info("parked", extra={"numberplate": "ABC123"})
+            logger.debug("noisy")
+        finally:
+            shutdown_logging()
+
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(lines[0]["msg"], "parked")
+        self.assertEqual(lines[0]["numberplate"], "ABC123")
+
+
+    def test_app_debug_records_are_sampled_below_the_root_level(self):
+        stream = io.StringIO()
+        setup_logging(level="INFO", stream=stream, debug_sample_rate=1)
+        try:
+            logging.getLogger("app.pipeline").debug("sampled in")
+            logging.getLogger("botocore.endpoint").debug("library noise")
+        finally:
+            shutdown_logging()
+
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual([line["msg"] for line in lines], ["sampled in"])
+        self.assertEqual(logging.getLogger("app").level, logging.NOTSET)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import asyncio
+import time
+import unittest
+
+import jwt
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.metrics import event_loop_stalls
+from app.metrics.loop_monitor import LoopMonitor
+from app.models.roles import Roles
+
+
+def block_the_loop(seconds: float):
+    time.sleep(seconds)
+
+
+class TestLoopMonitor(unittest.IsolatedAsyncioTestCase):
+
+    async def test_stall_is_recorded_with_blocking_stack(self):
+        monitor = LoopMonitor(interval=0.01, stall_threshold=0.05, probe_interval=0.01)
+        before = event_loop_stalls.values().get((), 0)
+        monitor.start()
+        try:
+            await asyncio.sleep(0.03)
+            block_the_loop(0.2)
+            await asyncio.sleep(0.03)
+        finally:
+            await monitor.stop()
+
+        self.assertFalse(monitor.running)
+        self.assertEqual(len(monitor.stalls), 1)
+        stall = monitor.stalls[0]
+        self.assertGreaterEqual(stall.duration, 0.1)
+        self.assertTrue(any("block_the_loop" in line for line in stall.stack))
+        self.assertEqual(event_loop_stalls.values()[()] - before, 1)
+        self.assertTrue(monitor.recent_executor_wait)
+
+    def test_keeps_worst_stalls_within_window(self):
+        monitor = LoopMonitor(window_seconds=60, kept=2)
+        for duration in (0.2, 0.5, 0.1, 0.3):
+            monitor.record_stall(duration, stack=["frame"])
+        monitor.stalls[-1].at -= 120
+
+        snapshot = monitor.snapshot()
+
+        self.assertEqual([s.duration for s in monitor.stalls], [0.5, 0.3])
+        self.assertEqual([s["duration_ms"] for s in snapshot["worst_stalls"]], [500])
+
+
+class TestDiagnosticsEndpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.client = TestClient(app)
+        self.monitor = LoopMonitor()
+        self.monitor.record_stall(0.25, stack=["  File \"x.py\", line 1, in handler"])
+        app.state.loop_monitor = self.monitor
+
+    def tearDown(self):
+        del app.state.loop_monitor
+        self.client.close()
+
+    def _headers(self, role: Roles):
+        now = int(time.time())
+        token = jwt.encode(
+            {
+                "email": "admin@example.com",
+                "id": "admin_1",
+                "role": 1 if role == Roles.ADMIN else 0,
+                "officeId": "office_1",
+                "exp": now + 3600,
+                "iat": now,
+            },
+            "asdfasasdfasdf",
+            algorithm="HS256",
+        )
+        return {"Authorization": f"Bearer {token}"}
+
+    def test_admin_gets_worst_stalls(self):
+        response = self.client.get("/admin/diagnostics", headers=self._headers(Roles.ADMIN))
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["running"] is False
+        assert body["worst_stalls"][0]["duration_ms"] == 250
+        assert body["worst_stalls"][0]["stack"] == ["  File \"x.py\", line 1, in handler"]
+
+    def test_customer_is_rejected(self):
+        response = self.client.get("/admin/diagnostics", headers=self._headers(Roles.CUSTOMER))
+
+        assert response.status_code == 401
+
+
+if __name__ == "__main__":
+    unittest.main()
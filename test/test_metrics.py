@@ -0,0 +1,184 @@
+import threading
+import unittest
+
+import boto3
+from fastapi.testclient import TestClient
+from moto import mock_aws
+
+from app.constants import TABLE
+from app.main import app
+from app.metrics import (
+    dynamodb_calls,
+    repository_call_duration,
+    route_consumed_capacity,
+    transaction_cancellations,
+)
+from app.metrics.capacity import CapacityTally, install_capacity_accounting, request_capacity
+from app.metrics.dynamodb import install_dynamodb_metrics
+from app.metrics.registry import Counter, Histogram, Registry
+from app.models.building import Building
+from app.repository.building_repo import BuildingRepository
+
+
+class TestRegistry(unittest.TestCase):
+
+    def test_counter_sums_thread_shards(self):
+        counter = Counter("things_total", "Things.", ("kind",))
+
+        def work():
+            for _ in range(1000):
+                counter.inc("a")
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(counter.values(), {("a",): 8000})
+
+    def test_histogram_render(self):
+        registry = Registry()
+        histogram = registry.register(Histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0)))
+        histogram.observe(0.05, "/x")
+        histogram.observe(0.5, "/x")
+        histogram.observe(5, "/x")
+
+        text = registry.render()
+
+        self.assertIn('latency_seconds_bucket{route="/x",le="0.1"} 1', text)
+        self.assertIn('latency_seconds_bucket{route="/x",le="1"} 2', text)
+        self.assertIn('latency_seconds_bucket{route="/x",le="+Inf"} 3', text)
+        self.assertIn('latency_seconds_count{route="/x"} 3', text)
+        self.assertIn('latency_seconds_sum{route="/x"} 5.55', text)
+
+    def test_label_escaping(self):
+        registry = Registry()
+        counter = registry.register(Counter("c_total", "C.", ("v",)))
+        counter.inc('a"b')
+
+        self.assertIn('c_total{v="a\\"b"} 1', registry.render())
+
+
+class TestMetricsEndpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_request_latency_uses_route_template(self):
+        self.client.get("/health")
+        self.client.get("/does-not-exist")
+
+        text = self.client.get("/metrics").text
+
+        self.assertIn('http_request_duration_seconds_count{method="GET",route="/health",status="200"}', text)
+        self.assertIn('http_request_duration_seconds_count{method="GET",route="unmatched",status="404"}', text)
+        self.assertIn("executor_work_items", text)
+
+
+class TestDynamoDBMetrics(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.mock_aws = mock_aws()
+        self.mock_aws.start()
+        self.addCleanup(self.mock_aws.stop)
+
+        self.dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
+        self.table = self.dynamodb.create_table(
+            TableName=TABLE,
+            KeySchema=[
+                {"AttributeName": "PK", "KeyType": "HASH"},
+                {"AttributeName": "SK", "KeyType": "RANGE"},
+            ],
+            AttributeDefinitions=[
+                {"AttributeName": "PK", "AttributeType": "S"},
+                {"AttributeName": "SK", "AttributeType": "S"},
+            ],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        install_dynamodb_metrics(self.dynamodb.meta.client)
+        self.repo = BuildingRepository(db=self.dynamodb)
+
+    def tearDown(self):
+        self.table.delete()
+
+    async def test_calls_and_cancellations_are_recorded(self):
+        before_ok = dynamodb_calls.values().get(("TransactWriteItems", "ok"), 0)
+        before_cancel = transaction_cancellations.values().get(("ConditionalCheckFailed",), 0)
+        before_errors = sum(
+            repository_call_duration.values().get(("BuildingRepository.add_building", "error"), [0])[:-1]
+        )
+
+        building = Building(BuildingId="b1", BuildingName="HQ")
+        await self.repo.add_building(building)
+        with self.assertRaises(Exception):
+            await self.repo.add_building(building)
+
+        self.assertEqual(dynamodb_calls.values()[("TransactWriteItems", "ok")] - before_ok, 1)
+        self.assertEqual(
+            transaction_cancellations.values()[("ConditionalCheckFailed",)] - before_cancel, 1
+        )
+        errors = sum(repository_call_duration.values()[("BuildingRepository.add_building", "error")][:-1])
+        self.assertEqual(errors - before_errors, 1)
+
+
+@mock_aws
+class TestConsumedCapacity(unittest.TestCase):
+
+    def setUp(self):
+        self.dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
+        self.table = self.dynamodb.create_table(
+            TableName=TABLE,
+            KeySchema=[
+                {"AttributeName": "PK", "KeyType": "HASH"},
+                {"AttributeName": "SK", "KeyType": "RANGE"},
+            ],
+            AttributeDefinitions=[
+                {"AttributeName": "PK", "AttributeType": "S"},
+                {"AttributeName": "SK", "AttributeType": "S"},
+            ],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        install_capacity_accounting(self.dynamodb.meta.client)
+        app.state.db = self.dynamodb
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        self.client.close()
+        del app.state.db
+        self.table.delete()
+
+    def test_request_capacity_header_and_metrics(self):
+        self.table.put_item(Item={
+            "PK": "OFFICE",
+            "SK": "DETAILS#o1",
+            "OfficeName": "Engineering",
+            "BuildingId": "b1",
+            "FloorNumber": 1,
+            "OfficeId": "o1",
+        })
+        key = ("GET", "/offices/", "read")
+        before = route_consumed_capacity.values().get(key, 0)
+
+        response = self.client.get("/offices/")
+
+        assert response.status_code == 200
+        # one GetItem for the version counter; the offices Query is a single-flight read,
+        # shared between requests and so charged to none of them
+        assert response.headers["x-consumed-capacity"] == "read=0.5, write=0, total=0.5"
+        assert "ddb-rcu" in response.headers["server-timing"]
+        assert route_consumed_capacity.values()[key] - before == 0.5
+
+    def test_writes_are_tallied_separately(self):
+        tally = CapacityTally()
+        token = request_capacity.set(tally)
+        try:
+            self.table.put_item(Item={"PK": "A", "SK": "B"})
+            self.table.get_item(Key={"PK": "A", "SK": "B"})
+        finally:
+            request_capacity.reset(token)
+
+        self.assertEqual(tally.totals(), (0.5, 1.0))
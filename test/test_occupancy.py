@@ -0,0 +1,46 @@
+import unittest
+
+import numpy as np
+
+from app.utils.occupancy import HOUR, arrivals, occupied_seconds
+
+
+def brute_force(starts, ends, range_start, hours):
+    result = []
+    for h in range(hours):
+        lo, hi = range_start + h * HOUR, range_start + (h + 1) * HOUR
+        result.append(sum(max(0, min(e, hi) - max(s, lo)) for s, e in zip(starts, ends)))
+    return result
+
+
+class TestOccupancy(unittest.TestCase):
+
+    def test_sessions_split_across_hours(self):
+        # 00:30-02:15, and 01:00-01:30
+        starts = [1800, 3600]
+        ends = [8100, 5400]
+
+        self.assertEqual(occupied_seconds(starts, ends, 0, 4).tolist(), [1800, 5400, 900, 0])
+        self.assertEqual(arrivals(starts, 0, 4).tolist(), [1, 1, 0, 0])
+
+    def test_sessions_outside_the_range_are_clipped(self):
+        starts = [-HOUR, 2 * HOUR]
+        ends = [HOUR // 2, 10 * HOUR]
+
+        self.assertEqual(occupied_seconds(starts, ends, 0, 3).tolist(), [1800, 0, 3600])
+        self.assertEqual(arrivals(starts, 0, 3).tolist(), [0, 0, 1])
+
+    def test_matches_brute_force(self):
+        rng = np.random.default_rng(7)
+        starts = rng.integers(0, 48 * HOUR, 500)
+        ends = starts + rng.integers(0, 10 * HOUR, 500)
+
+        self.assertEqual(occupied_seconds(starts, ends, 6 * HOUR, 24).tolist(), brute_force(starts, ends, 6 * HOUR, 24))
+
+    def test_no_sessions(self):
+        self.assertEqual(occupied_seconds([], [], 0, 2).tolist(), [0, 0])
+        self.assertEqual(arrivals([], 0, 2).tolist(), [0, 0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,10 +7,13 @@ from app.models.office import Office
 from app.constants import TABLE
 
 
-@mock_aws
 class TestOfficeRepository(unittest.IsolatedAsyncioTestCase):
 
-    def setUp(self):
+    async def asyncSetUp(self):
+        self.mock_aws = mock_aws()
+        self.mock_aws.start()
+        self.addCleanup(self.mock_aws.stop)
+
         self.dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
 
         self.table = self.dynamodb.create_table(
@@ -44,10 +47,10 @@ class TestOfficeRepository(unittest.IsolatedAsyncioTestCase):
 
     async def test_add_office_success(self):
         office = Office(
-            office_name="Engineering Office",
-            building_id=self.building_id,
-            floor_number=self.floor_number,
-            office_id="office001"
+            OfficeName="Engineering Office",
+            BuildingId=self.building_id,
+            FloorNumber=self.floor_number,
+            OfficeId="office001"
         )
         
         await self.repo.add_office(office)
@@ -62,10 +65,10 @@ class TestOfficeRepository(unittest.IsolatedAsyncioTestCase):
 
     async def test_add_office_updates_floor(self):
         office = Office(
-            office_name="Sales Office",
-            building_id=self.building_id,
-            floor_number=self.floor_number,
-            office_id="office002"
+            OfficeName="Sales Office",
+            BuildingId=self.building_id,
+            FloorNumber=self.floor_number,
+            OfficeId="office002"
         )
         
         await self.repo.add_office(office)
@@ -80,10 +83,10 @@ class TestOfficeRepository(unittest.IsolatedAsyncioTestCase):
 
     async def test_add_office_duplicate_raises_error(self):
         office = Office(
-            office_name="Office 1",
-            building_id=self.building_id,
-            floor_number=self.floor_number,
-            office_id="office003"
+            OfficeName="Office 1",
+            BuildingId=self.building_id,
+            FloorNumber=self.floor_number,
+            OfficeId="office003"
         )
         await self.repo.add_office(office)
         
@@ -92,16 +95,16 @@ class TestOfficeRepository(unittest.IsolatedAsyncioTestCase):
 
     async def test_add_office_to_occupied_floor_raises_error(self):
         office1 = Office(
-            office_name="First Office",
-            building_id=self.building_id,
-            floor_number=self.floor_number,
-            office_id="office004"
+            OfficeName="First Office",
+            BuildingId=self.building_id,
+            FloorNumber=self.floor_number,
+            OfficeId="office004"
         )
         office2 = Office(
-            office_name="Second Office",
-            building_id=self.building_id,
-            floor_number=self.floor_number,
-            office_id="office005"
+            OfficeName="Second Office",
+            BuildingId=self.building_id,
+            FloorNumber=self.floor_number,
+            OfficeId="office005"
         )
         await self.repo.add_office(office1)
         
@@ -110,10 +113,10 @@ class TestOfficeRepository(unittest.IsolatedAsyncioTestCase):
 
     async def test_get_office_by_id_success(self):
         office = Office(
-            office_name="HR Office",
-            building_id=self.building_id,
-            floor_number=self.floor_number,
-            office_id="office006"
+            OfficeName="HR Office",
+            BuildingId=self.building_id,
+            FloorNumber=self.floor_number,
+            OfficeId="office006"
         )
         await self.repo.add_office(office)
         
@@ -125,6 +128,20 @@ class TestOfficeRepository(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(result.building_id, self.building_id)
         self.assertEqual(result.floor_number, self.floor_number)
 
+    async def test_get_offices_by_ids(self):
+        office = Office(
+            OfficeName="HR Office",
+            BuildingId=self.building_id,
+            FloorNumber=self.floor_number,
+            OfficeId="office006"
+        )
+        await self.repo.add_office(office)
+
+        result = await self.repo.get_offices_by_ids(["office006", "missing"])
+
+        self.assertEqual(list(result), ["office006"])
+        self.assertEqual(result["office006"].office_name, "HR Office")
+
     async def test_get_offices_empty(self):
         result = await self.repo.get_offices()
         
@@ -143,16 +160,16 @@ class TestOfficeRepository(unittest.IsolatedAsyncioTestCase):
         })
         
         office1 = Office(
-            office_name="Office A",
-            building_id=self.building_id,
-            floor_number=self.floor_number,
-            office_id="office007"
+            OfficeName="Office A",
+            BuildingId=self.building_id,
+            FloorNumber=self.floor_number,
+            OfficeId="office007"
         )
         office2 = Office(
-            office_name="Office B",
-            building_id=self.building_id,
-            floor_number=floor2,
-            office_id="office008"
+            OfficeName="Office B",
+            BuildingId=self.building_id,
+            FloorNumber=floor2,
+            OfficeId="office008"
         )
         await self.repo.add_office(office1)
         await self.repo.add_office(office2)
@@ -166,10 +183,10 @@ class TestOfficeRepository(unittest.IsolatedAsyncioTestCase):
 
     async def test_get_all_offices(self):
         office = Office(
-            office_name="Complete Office",
-            building_id=self.building_id,
-            floor_number=self.floor_number,
-            office_id="office009"
+            OfficeName="Complete Office",
+            BuildingId=self.building_id,
+            FloorNumber=self.floor_number,
+            OfficeId="office009"
         )
         await self.repo.add_office(office)
         
@@ -180,10 +197,10 @@ class TestOfficeRepository(unittest.IsolatedAsyncioTestCase):
 
     async def test_delete_office_success(self):
         office = Office(
-            office_name="Temp Office",
-            building_id=self.building_id,
-            floor_number=self.floor_number,
-            office_id="office010"
+            OfficeName="Temp Office",
+            BuildingId=self.building_id,
+            FloorNumber=self.floor_number,
+            OfficeId="office010"
         )
         await self.repo.add_office(office)
         
@@ -208,10 +225,10 @@ class TestOfficeRepository(unittest.IsolatedAsyncioTestCase):
 
     async def test_delete_office_wrong_floor_raises_error(self):
         office = Office(
-            office_name="Office to Delete",
-            building_id=self.building_id,
-            floor_number=self.floor_number,
-            office_id="office011"
+            OfficeName="Office to Delete",
+            BuildingId=self.building_id,
+            FloorNumber=self.floor_number,
+            OfficeId="office011"
         )
         await self.repo.add_office(office)
         
@@ -2,8 +2,10 @@ import unittest
 from unittest.mock import AsyncMock
 from fastapi.testclient import TestClient
 
+from app.dto.office import OfficeResponseDTO
 from app.main import app
 from app.services.office import OfficeService
+from app.services.version import VersionService
 
 
 class TestOfficeRouter(unittest.TestCase):
@@ -11,18 +13,27 @@ class TestOfficeRouter(unittest.TestCase):
     def setUp(self):
         self.client = TestClient(app)
         self.office_service_mock = AsyncMock(spec=OfficeService)
+        self.version_service_mock = AsyncMock(spec=VersionService)
+        self.version_service_mock.get_offices_etag.return_value = '"offices-v1"'
         app.dependency_overrides[OfficeService] = lambda: self.office_service_mock
+        app.dependency_overrides[VersionService] = lambda: self.version_service_mock
 
     def tearDown(self):
         app.dependency_overrides.clear()
         self.client.close()
 
     def test_get_all_offices(self):
-        self.office_service_mock.get_offices.return_value = [
-            {"building_id": "b1", "floor_number": 1, "office_name": "Office A", "office_id": "o1"}
-        ]
+        offices = [{"building_id": "b1", "floor_number": 1, "office_name": "Office A", "office_id": "o1"}]
+        self.office_service_mock.get_offices.return_value = [OfficeResponseDTO(**o) for o in offices]
 
         response = self.client.get("/offices/")
 
         assert response.status_code == 200
-        assert response.json() == self.office_service_mock.get_offices.return_value
+        assert response.json() == offices
+        assert response.headers["etag"] == '"offices-v1"'
+
+    def test_get_all_offices_not_modified(self):
+        response = self.client.get("/offices/", headers={"If-None-Match": '"offices-v1"'})
+
+        assert response.status_code == 304
+        self.office_service_mock.get_offices.assert_not_awaited()
@@ -0,0 +1,44 @@
+import unittest
+from decimal import Decimal
+
+from app.errors.web_exception import WebException
+from app.utils.pagination import decode_cursor, encode_cursor
+
+
+class TestPagination(unittest.TestCase):
+
+    def test_round_trip(self):
+        key = {"PK": "USER#u1", "SK": "PARKING#OPEN#1", "ActiveBuildingId": "b1", "ActiveSince": Decimal(1735689600)}
+
+        cursor = encode_cursor(key, "active-parkings:b1")
+
+        self.assertNotIn("=", cursor)
+        self.assertEqual(decode_cursor(cursor, "active-parkings:b1"), {**key, "ActiveSince": 1735689600})
+
+    def test_no_more_pages(self):
+        self.assertIsNone(encode_cursor(None, "parkings:u1"))
+        self.assertIsNone(decode_cursor(None, "parkings:u1"))
+        self.assertIsNone(decode_cursor("", "parkings:u1"))
+
+    def test_rejects_tampered_and_malformed_cursors(self):
+        cursor = encode_cursor({"PK": "USER#u1", "SK": "PARKING#OPEN#1"}, "parkings:u1")
+        tampered = cursor[:-2] + ("A" if cursor[-2] != "A" else "B") + cursor[-1]
+
+        for bad in (tampered, "not a cursor!", "AAAA"):
+            with self.subTest(cursor=bad):
+                with self.assertRaises(WebException) as ctx:
+                    decode_cursor(bad, "parkings:u1")
+                self.assertEqual(ctx.exception.status_code, 400)
+
+    def test_rejects_cursors_of_another_listing(self):
+        cursor = encode_cursor({"PK": "USER#u1", "SK": "PARKING#OPEN#1"}, "parkings:u1")
+
+        for scope in ("parkings:u2", "active-parkings:u1"):
+            with self.subTest(scope=scope):
+                with self.assertRaises(WebException) as ctx:
+                    decode_cursor(cursor, scope)
+                self.assertEqual(ctx.exception.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
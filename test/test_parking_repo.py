@@ -1,13 +1,23 @@
 import unittest
+from unittest.mock import patch
 import boto3
 import time
 from moto import mock_aws
 
-from app.repository.parking_repo import ParkingRepository
+import asyncio
+
+from app.repository.parking_repo import (
+    ParkingRepository,
+    closed_parking_sk,
+    migrate_parking_item,
+    month_bucket,
+    open_parking_sk,
+)
 from app.models.parking_history import ParkingHistory
 from app.models.user import User
 from app.models.roles import Roles
 from app.constants import TABLE
+from app.db_schemas import TABLE_DEFINITION
 from app.errors.web_exception import WebException
 
 
@@ -106,7 +116,7 @@ class TestParkingRepository(unittest.IsolatedAsyncioTestCase):
         parking_response = self.table.get_item(
             Key={
                 "PK": f"USER#{self.user_id}",
-                "SK": f"PARKING#{start_time}"
+                "SK": open_parking_sk(start_time)
             }
         )
         self.assertIn("Item", parking_response)
@@ -227,7 +237,7 @@ class TestParkingRepository(unittest.IsolatedAsyncioTestCase):
         parking_response = self.table.get_item(
             Key={
                 "PK": f"USER#{self.user_id}",
-                "SK": f"PARKING#{start_time}"
+                "SK": closed_parking_sk(start_time)
             }
         )
         self.assertIn("EndTime", parking_response["Item"])
@@ -409,5 +419,199 @@ class TestParkingRepository(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(result[0].start_time, completed_time)
 
 
+@mock_aws
+class TestParkingHistoryLayout(unittest.TestCase):
+
+    def setUp(self):
+        self.dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
+        self.table = self.dynamodb.create_table(**TABLE_DEFINITION)
+        self.repo = ParkingRepository(db=self.dynamodb)
+        self.user_id = "user001"
+
+        for item in (
+            {"PK": f"USER#{self.user_id}", "SK": "PROFILE", "Id": self.user_id, "Username": "testuser",
+             "Email": "test@example.com", "PasswordHash": "hash", "OfficeId": "office001", "Role": Roles.CUSTOMER},
+            {"PK": f"USER#{self.user_id}", "SK": "VEHICLE#ABC123", "VehicleId": "vehicle001",
+             "Numberplate": "ABC123", "VehicleType": "TwoWheeler", "IsParked": False},
+            {"PK": "BUILDING", "SK": "BUILDING#bldg001", "BuildingId": "bldg001", "BuildingName": "Test Building",
+             "TotalFloors": 1, "TotalSlots": 30, "AvailableSlots": 30},
+            {"PK": "BUILDING#bldg001", "SK": "FLOORINFO#1", "FloorNumber": 1, "TotalSlots": 30, "AvailableSlots": 30},
+            {"PK": "BUILDING#bldg001", "SK": "FLOOR#1#SLOT#5", "SlotId": 5, "SlotType": "TwoWheeler",
+             "IsOccupied": False, "IsAssigned": False},
+        ):
+            self.table.put_item(Item=item)
+
+    def tearDown(self):
+        self.table.delete()
+
+    def _history_item(self, sk: str, start_time: int, end_time: int | None) -> dict:
+        return {
+            "PK": f"USER#{self.user_id}",
+            "SK": sk,
+            "Numberplate": "ABC123",
+            "BuildingId": "bldg001",
+            "FloorNumber": 1,
+            "SlotId": 5,
+            "StartTime": start_time,
+            "EndTime": end_time,
+            "ParkingId": f"p{start_time}",
+            "VehicleType": "TwoWheeler",
+        }
+
+    def _sort_keys(self) -> list[str]:
+        items = self.table.scan()["Items"]
+        return sorted(i["SK"] for i in items if i["PK"] == f"USER#{self.user_id}" and i["SK"].startswith("PARKING#"))
+
+    def test_sort_keys(self):
+        self.assertEqual(month_bucket(1735689600), "202501")
+        self.assertEqual(closed_parking_sk(1735689600), "PARKING#202501#1735689600")
+        # open sessions sort after every closed month, so closed ranges never include them
+        self.assertGreater(open_parking_sk(0), closed_parking_sk(4102444800))
+
+    def test_unpark_moves_session_to_its_month(self):
+        start_time = 1735689600
+        asyncio.run(self.repo.add_parking(ParkingHistory(
+            user_id=self.user_id,
+            Numberplate="ABC123",
+            BuildingId="bldg001",
+            FloorNumber=1,
+            SlotId=5,
+            StartTime=start_time,
+            ParkingId="p1",
+            VehicleType="TwoWheeler",
+        )))
+        self.assertEqual(self._sort_keys(), [open_parking_sk(start_time)])
+
+        asyncio.run(self.repo.unpark_by_numberplate(self.user_id, "ABC123"))
+
+        self.assertEqual(self._sort_keys(), [closed_parking_sk(start_time)])
+        history = asyncio.run(self.repo.get_parking_history(self.user_id, start_time, start_time + 1))
+        self.assertEqual([h.parking_id for h in history], ["p1"])
+        self.assertIsNotNone(history[0].end_time)
+
+    def test_unpark_retries_when_the_open_session_was_just_migrated(self):
+        start_time = 1735689600
+        self.table.put_item(Item=self._history_item(f"PARKING#{start_time}", start_time, None))
+        read = self.repo.get_open_parkings
+
+        async def read_then_migrate(*args, **kwargs):
+            items = await read(*args, **kwargs)
+            new_item = migrate_parking_item(items[0])
+            if new_item is not None:
+                # the migration moves the legacy item between the read and the unpark
+                self.repo._move_parking_item(items[0], new_item)
+            return items
+
+        with patch.object(self.repo, "get_open_parkings", side_effect=read_then_migrate) as get_open_parkings:
+            asyncio.run(self.repo.unpark_by_numberplate(self.user_id, "ABC123"))
+
+        self.assertEqual(get_open_parkings.call_count, 2)
+        self.assertEqual(self._sort_keys(), [closed_parking_sk(start_time)])
+
+    def test_unpark_conflict_after_retry(self):
+        start_time = 1735689600
+        stale = self._history_item(f"PARKING#{start_time}", start_time, None)
+
+        with patch.object(self.repo, "get_open_parkings", return_value=[stale]):
+            with self.assertRaises(WebException) as raised:
+                asyncio.run(self.repo.unpark_by_numberplate(self.user_id, "ABC123"))
+
+        self.assertEqual(raised.exception.status_code, 409)
+
+    def test_active_parkings_index_holds_open_sessions_only(self):
+        asyncio.run(self.repo.add_parking(ParkingHistory(
+            user_id=self.user_id,
+            Numberplate="ABC123",
+            BuildingId="bldg001",
+            FloorNumber=1,
+            SlotId=5,
+            StartTime=1735689600,
+            ParkingId="p1",
+            VehicleType="TwoWheeler",
+        )))
+        self.table.put_item(Item={
+            **self._history_item(open_parking_sk(1735689700), 1735689700, None),
+            "PK": "USER#user002",
+            "ParkingId": "p2",
+            "ActiveBuildingId": "bldg001",
+            "ActiveSince": 1735689700,
+        })
+
+        first, cursor = asyncio.run(self.repo.get_active_parkings("bldg001", limit=1))
+        second, _ = asyncio.run(self.repo.get_active_parkings("bldg001", limit=1, exclusive_start_key=cursor))
+
+        self.assertEqual([(p.parking_id, p.user_id) for p in first + second], [("p1", self.user_id), ("p2", "user002")])
+
+        asyncio.run(self.repo.unpark_by_numberplate(self.user_id, "ABC123"))
+
+        remaining, _ = asyncio.run(self.repo.get_active_parkings("bldg001", limit=10))
+        self.assertEqual([p.parking_id for p in remaining], ["p2"])
+        closed = self.table.get_item(Key={"PK": f"USER#{self.user_id}", "SK": closed_parking_sk(1735689600)})["Item"]
+        self.assertNotIn("ActiveBuildingId", closed)
+
+    def test_history_range_is_exact_across_months(self):
+        january, february, march = 1735689600, 1738368000, 1740787200
+        for start_time in (january, february, march):
+            self.table.put_item(Item=self._history_item(closed_parking_sk(start_time), start_time, start_time + 60))
+        self.table.put_item(Item=self._history_item(open_parking_sk(february + 5), february + 5, None))
+
+        history = asyncio.run(self.repo.get_parking_history(self.user_id, january + 1, march))
+
+        self.assertEqual(sorted(h.start_time for h in history), [february, march])
+
+    def test_legacy_items_are_read_and_migrated(self):
+        self.table.put_item(Item=self._history_item("PARKING#1735689600", 1735689600, 1735689660))
+        self.table.put_item(Item=self._history_item("PARKING#1738368000", 1738368000, None))
+
+        history = asyncio.run(self.repo.get_parking_history(self.user_id, 0, 1800000000))
+        self.assertEqual([h.start_time for h in history], [1735689600])
+
+        migrated = asyncio.run(self.repo.migrate_parking_items(4))
+
+        self.assertEqual(migrated, 2)
+        self.assertEqual(self._sort_keys(), [closed_parking_sk(1735689600), open_parking_sk(1738368000)])
+        self.assertEqual(asyncio.run(self.repo.migrate_parking_items(4)), 0)
+
+    def _page_through(self, limit: int, start_time: int, end_time: int) -> list[list[int]]:
+        pages, position = [], None
+        while True:
+            page, position = asyncio.run(
+                self.repo.get_parking_history_page(self.user_id, start_time, end_time, limit=limit, position=position)
+            )
+            pages.append([h.start_time for h in page])
+            if position is None:
+                return pages
+
+    def test_history_pages_newest_first_then_legacy(self):
+        starts = [1735689600 + day * 86400 * 20 for day in range(5)]
+        for start in starts:
+            self.table.put_item(Item=self._history_item(closed_parking_sk(start), start, start + 60))
+        self.table.put_item(Item=self._history_item("PARKING#1700000000", 1700000000, 1700000060))
+        self.table.put_item(Item=self._history_item("PARKING#1700000100", 1700000100, None))
+        self.table.put_item(Item=self._history_item(open_parking_sk(1800000000), 1800000000, None))
+
+        pages = self._page_through(limit=2, start_time=0, end_time=1800000000)
+
+        self.assertEqual([t for page in pages for t in page], sorted(starts, reverse=True) + [1700000000])
+        self.assertTrue(all(len(page) <= 2 for page in pages))
+
+    def test_history_pages_without_legacy_reads(self):
+        self.table.put_item(Item=self._history_item(closed_parking_sk(1735689600), 1735689600, 1735689660))
+        self.table.put_item(Item=self._history_item("PARKING#1700000000", 1700000000, 1700000060))
+
+        with patch("app.repository.parking_repo.PARKING_HISTORY_LEGACY_READS", False):
+            pages = self._page_through(limit=10, start_time=0, end_time=1800000000)
+
+        self.assertEqual(pages, [[1735689600]])
+
+    def test_migrate_parking_item_skips_new_layout(self):
+        self.assertIsNone(migrate_parking_item(self._history_item(closed_parking_sk(1), 1, 2)))
+        self.assertIsNone(migrate_parking_item(self._history_item(open_parking_sk(1), 1, None)))
+        self.assertEqual(
+            migrate_parking_item(self._history_item("PARKING#5", 5, "null"))["SK"],
+            open_parking_sk(5),
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,9 +1,11 @@
+import json
 import time
 import jwt
 import unittest
 from unittest.mock import AsyncMock
 from fastapi.testclient import TestClient
 
+from app.dto.parking import ParkingHistoryResponseDTO
 from app.main import app
 from app.models.roles import Roles
 from app.services.parking import ParkingService
@@ -48,8 +50,8 @@ class TestParkingRouter(unittest.TestCase):
         assert response.status_code == 201
         assert response.json() == {"ticketId": "ticket_123"}
 
-    def test_get_parkings(self):
-        self.parking_service_mock.get_parkings.return_value = [
+    def _history(self):
+        return [
             {
                 "TicketId": "ticket_123",
                 "NumberPlate": "ABC123",
@@ -63,13 +65,49 @@ class TestParkingRouter(unittest.TestCase):
             }
         ]
 
+    def test_get_parkings(self):
+        self.parking_service_mock.get_parkings.return_value = (
+            [ParkingHistoryResponseDTO(**item) for item in self._history()], "next-page"
+        )
+
         response = self.client.get(
-            "/parkings/?start_time=1&end_time=10",
+            "/parkings/?start_time=1&end_time=10&limit=1&cursor=abc",
             headers=self._auth_headers(),
         )
 
         assert response.status_code == 200
-        assert response.json() == self.parking_service_mock.get_parkings.return_value
+        assert response.json() == self._history()
+        assert response.headers["X-Next-Cursor"] == "next-page"
+        self.parking_service_mock.get_parkings.assert_awaited_once_with(
+            user_id="user_1", start_time=1, end_time=10, limit=1, cursor="abc"
+        )
+
+    def test_get_parkings_last_page_has_no_cursor(self):
+        self.parking_service_mock.get_parkings.return_value = ([], None)
+
+        response = self.client.get("/parkings/", headers=self._auth_headers())
+
+        assert response.status_code == 200
+        assert "X-Next-Cursor" not in response.headers
+        self.parking_service_mock.get_parkings.assert_awaited_once_with(
+            user_id="user_1", start_time=None, end_time=None, limit=None, cursor=None
+        )
+
+    def test_get_parkings_ndjson_stream(self):
+        history = [ParkingHistoryResponseDTO(**item) for item in self._history() * 2]
+
+        async def stream(**kwargs):
+            for item in history:
+                yield item
+
+        self.parking_service_mock.stream_parkings = stream
+
+        response = self.client.get("/parkings/", headers={**self._auth_headers(), "Accept": "application/x-ndjson"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert [json.loads(line) for line in response.text.splitlines()] == self._history() * 2
+        self.parking_service_mock.get_parkings.assert_not_awaited()
 
     def test_unpark_vehicle(self):
         response = self.client.patch(
@@ -2,6 +2,7 @@ import asyncio
 import unittest
 from unittest.mock import AsyncMock, patch
 
+from app.constants import PARKINGS_PAGE_SIZE
 from app.dto.parking import ParkRequestDTO
 from app.errors.web_exception import CONFLICT_ERROR, DB_ERROR, WebException
 from app.models.building import Building
@@ -12,6 +13,7 @@ from app.repository.parking_repo import ParkingRepository
 from app.repository.slot_repo import SlotRepository
 from app.repository.vehicle_repo import VehicleRepository
 from app.services.parking import ParkingService
+from app.utils.pagination import decode_cursor, encode_cursor
 
 
 class TestParkingService(unittest.TestCase):
@@ -81,43 +83,102 @@ class TestParkingService(unittest.TestCase):
         self.assertEqual(ctx.exception.status_code, 409)
         self.assertEqual(ctx.exception.error_code, CONFLICT_ERROR)
 
-    def test_get_parkings_sorts_and_maps(self):
-        records = [
+    def _records(self):
+        return [
             ParkingHistory(
                 user_id="user_1",
-                ParkingId="p1",
-                Numberplate="ABC123",
+                ParkingId="p2",
+                Numberplate="XYZ999",
                 BuildingId="b1",
                 FloorNumber=1,
-                SlotId=2,
-                StartTime=5,
-                EndTime=None,
+                SlotId=3,
+                StartTime=10,
+                EndTime=20,
                 VehicleType="Car",
             ),
             ParkingHistory(
                 user_id="user_1",
-                ParkingId="p2",
-                Numberplate="XYZ999",
+                ParkingId="p1",
+                Numberplate="ABC123",
                 BuildingId="b1",
                 FloorNumber=1,
-                SlotId=3,
-                StartTime=10,
-                EndTime=20,
+                SlotId=2,
+                StartTime=5,
+                EndTime=6,
                 VehicleType="Car",
             ),
         ]
-        self.parking_repo.get_parking_history.return_value = records
-        self.building_repo.get_building_by_id.return_value = Building(
-            BuildingId="b1", BuildingName="HQ", TotalFloors=1, TotalSlots=10, AvailableSlots=8
-        )
 
-        responses = asyncio.run(self.service.get_parkings("user_1", start_time=None, end_time=None))
+    def test_get_parkings_maps_a_page(self):
+        self.parking_repo.get_parking_history_page.return_value = (self._records(), {"legacy": False, "key": {"PK": "USER#user_1", "SK": "x"}})
+        self.building_repo.get_buildings_by_ids.return_value = {
+            "b1": Building(BuildingId="b1", BuildingName="HQ", TotalFloors=1, TotalSlots=10, AvailableSlots=8)
+        }
 
-        self.parking_repo.get_parking_history.assert_awaited()
+        responses, cursor = asyncio.run(self.service.get_parkings("user_1", start_time=None, end_time=None, limit=2))
+
+        self.assertEqual(self.parking_repo.get_parking_history_page.await_args.kwargs["limit"], 2)
+        self.building_repo.get_buildings_by_ids.assert_awaited_once_with(["b1", "b1"])
+        self.building_repo.get_building_by_id.assert_not_awaited()
         self.assertEqual([r.ticket_id for r in responses], ["p2", "p1"])
         self.assertEqual(responses[0].building_name, "HQ")
         self.assertEqual(responses[0].start_time, "1970-01-01T00:00:10Z")
         self.assertEqual(responses[0].end_time, "1970-01-01T00:00:20Z")
+        self.assertEqual(
+            decode_cursor(cursor, "parkings:user_1:None:None"), {"legacy": False, "key": {"PK": "USER#user_1", "SK": "x"}}
+        )
+
+    def test_get_parkings_passes_the_cursor_back(self):
+        position = {"legacy": True, "key": None}
+        self.parking_repo.get_parking_history_page.return_value = ([], None)
+        self.building_repo.get_buildings_by_ids.return_value = {}
+
+        cursor = encode_cursor(position, "parkings:user_1:None:None")
+
+        responses, cursor = asyncio.run(self.service.get_parkings("user_1", cursor=cursor))
+
+        self.assertEqual(self.parking_repo.get_parking_history_page.await_args.kwargs["position"], position)
+        self.assertEqual(self.parking_repo.get_parking_history_page.await_args.kwargs["limit"], PARKINGS_PAGE_SIZE)
+        self.assertEqual((responses, cursor), ([], None))
+
+    def test_get_parkings_rejects_another_users_cursor(self):
+        cursor = encode_cursor({"legacy": False, "key": {"PK": "USER#user_2", "SK": "x"}}, "parkings:user_2:None:None")
+
+        with self.assertRaises(WebException) as ctx:
+            asyncio.run(self.service.get_parkings("user_1", cursor=cursor))
+
+        self.assertEqual(ctx.exception.status_code, 400)
+        self.parking_repo.get_parking_history_page.assert_not_awaited()
+
+    def test_get_parkings_without_limit_or_cursor_returns_the_whole_range(self):
+        first, second = self._records()
+        self.parking_repo.get_parking_history_page.side_effect = [([first], {"legacy": False, "key": {}}), ([second], None)]
+        self.building_repo.get_buildings_by_ids.return_value = {
+            "b1": Building(BuildingId="b1", BuildingName="HQ", TotalFloors=1, TotalSlots=10, AvailableSlots=8)
+        }
+
+        responses, cursor = asyncio.run(self.service.get_parkings("user_1"))
+
+        self.assertEqual([r.ticket_id for r in responses], ["p2", "p1"])
+        self.assertIsNone(cursor)
+
+    def test_stream_parkings_reads_page_by_page(self):
+        first, second = self._records()
+        self.parking_repo.get_parking_history_page.side_effect = [([first], {"legacy": False, "key": {}}), ([second], None)]
+        self.building_repo.get_buildings_by_ids.side_effect = [
+            {"b1": Building(BuildingId="b1", BuildingName="HQ", TotalFloors=1, TotalSlots=10, AvailableSlots=8)},
+            {},
+        ]
+
+        async def collect():
+            return [r async for r in self.service.stream_parkings("user_1")]
+
+        responses = asyncio.run(collect())
+
+        self.assertEqual([r.ticket_id for r in responses], ["p2", "p1"])
+        self.assertEqual(self.parking_repo.get_parking_history_page.await_count, 2)
+        # the building resolved for the first page is not looked up again
+        self.assertEqual(self.building_repo.get_buildings_by_ids.await_args_list[1].args, ([],))
 
     def test_unpark_calls_repo(self):
         asyncio.run(self.service.unpark("user_1", "ABC123"))
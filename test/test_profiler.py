@@ -0,0 +1,100 @@
+import asyncio
+import threading
+import time
+import unittest
+
+import jwt
+from fastapi.testclient import TestClient
+
+from app.errors.web_exception import WebException
+from app.main import app
+from app.metrics import profiler
+
+
+def spin(stop: threading.Event):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+class TestSamplingProfiler(unittest.IsolatedAsyncioTestCase):
+
+    async def test_collapsed_stacks_include_busy_thread(self):
+        stop = threading.Event()
+        worker = threading.Thread(target=spin, args=(stop,), name="busy")
+        worker.start()
+        try:
+            samples = await profiler.profile(0.1, 0.005, {worker.ident})
+        finally:
+            stop.set()
+            worker.join()
+
+        self.assertTrue(samples)
+        stack = samples.most_common(1)[0][0]
+        self.assertTrue(stack.startswith("busy;"))
+        self.assertIn("test.test_profiler:spin", stack)
+        line = profiler.render_collapsed(samples).splitlines()[0]
+        self.assertRegex(line, r"^busy;.* \d+$")
+
+    async def test_one_profile_at_a_time(self):
+        first = asyncio.create_task(profiler.profile(0.1, 0.01))
+        await asyncio.sleep(0.02)
+
+        with self.assertRaises(WebException) as ctx:
+            await profiler.profile(0.1, 0.01)
+
+        self.assertEqual(ctx.exception.status_code, 409)
+        await first
+
+    def test_no_thread_when_idle(self):
+        # a profile from an earlier test may still be returning from its thread
+        for thread in threading.enumerate():
+            if thread.name == "sampling-profiler":
+                thread.join(timeout=1)
+
+        self.assertFalse(any(t.name == "sampling-profiler" for t in threading.enumerate()))
+
+
+class TestProfileEndpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        self.client.close()
+
+    def _headers(self, role: int):
+        now = int(time.time())
+        token = jwt.encode(
+            {
+                "email": "admin@example.com",
+                "id": "admin_1",
+                "role": role,
+                "officeId": "office_1",
+                "exp": now + 3600,
+                "iat": now,
+            },
+            "asdfasasdfasdf",
+            algorithm="HS256",
+        )
+        return {"Authorization": f"Bearer {token}"}
+
+    def test_admin_gets_collapsed_stacks(self):
+        response = self.client.get("/admin/profile?seconds=0.05&interval_ms=5", headers=self._headers(1))
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert response.text.strip()
+
+    def test_customer_is_rejected(self):
+        response = self.client.get("/admin/profile?seconds=0.05", headers=self._headers(0))
+
+        assert response.status_code == 401
+
+    def test_duration_is_bounded(self):
+        response = self.client.get("/admin/profile?seconds=3600", headers=self._headers(1))
+
+        assert response.status_code == 422
+
+
+if __name__ == "__main__":
+    unittest.main()
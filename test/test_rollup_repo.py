@@ -0,0 +1,97 @@
+import asyncio
+import datetime
+import unittest
+
+import boto3
+from moto import mock_aws
+
+from app.db_schemas import TABLE_DEFINITION
+from app.errors.web_exception import WebException
+from app.repository.parking_repo import closed_parking_sk, open_parking_sk
+from app.repository.rollup_repo import RollupRepository, day_start
+from app.services.utilization import UtilizationService
+
+JAN_1 = datetime.date(2025, 1, 1)
+JAN_2 = datetime.date(2025, 1, 2)
+
+
+@mock_aws
+class TestRollups(unittest.TestCase):
+
+    def setUp(self):
+        self.dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
+        self.table = self.dynamodb.create_table(**TABLE_DEFINITION)
+        self.repo = RollupRepository(db=self.dynamodb)
+        self.service = UtilizationService(rollup_repo=self.repo)
+
+        for floor in (1, 2):
+            self.table.put_item(Item={
+                "PK": "BUILDING#b1", "SK": f"FLOORINFO#{floor}", "FloorNumber": floor, "TotalSlots": 4, "AvailableSlots": 4,
+            })
+
+    def tearDown(self):
+        self.table.delete()
+
+    def _session(self, user: str, start: int, end: int | None, floor: int = 1):
+        self.table.put_item(Item={
+            "PK": f"USER#{user}",
+            "SK": closed_parking_sk(start) if end is not None else open_parking_sk(start),
+            "ParkingId": f"p{start}",
+            "Numberplate": "ABC123",
+            "BuildingId": "b1",
+            "FloorNumber": floor,
+            "SlotId": 1,
+            "StartTime": start,
+            "EndTime": end,
+            "VehicleType": "TwoWheeler",
+        })
+
+    def test_build_and_read_heatmap(self):
+        midnight = day_start(JAN_1)
+        # 09:00-11:30 on Jan 1, 23:00 Jan 1 - 01:00 Jan 2, a session before the range, and one still open
+        self._session("u1", midnight + 9 * 3600, midnight + 11 * 3600 + 1800)
+        self._session("u2", midnight + 23 * 3600, midnight + 25 * 3600)
+        self._session("u3", midnight - 7200, midnight - 3600)
+        self._session("u4", midnight + 10 * 3600, None)
+
+        written = asyncio.run(self.repo.build_rollups(JAN_1, JAN_2, total_segments=2))
+        heatmap = asyncio.run(self.service.get_heatmap("b1", JAN_1, JAN_2))
+
+        self.assertEqual(written, 4)
+        self.assertEqual([f.floor_number for f in heatmap.floors], [1, 2])
+        floor = heatmap.floors[0]
+        self.assertEqual(floor.days, ["2025-01-01", "2025-01-02"])
+        self.assertEqual(floor.occupancy[0][8:12], [0.0, 1.0, 1.0, 0.5])
+        self.assertEqual(floor.occupancy[0][23], 1.0)
+        self.assertEqual(floor.occupancy[1][0], 1.0)
+        self.assertEqual(floor.utilization[0][9], 0.25)
+        self.assertEqual(sum(map(sum, floor.arrivals)), 2)
+        self.assertEqual(sum(map(sum, heatmap.floors[1].occupancy)), 0)
+
+    def test_rebuild_overwrites(self):
+        midnight = day_start(JAN_1)
+        asyncio.run(self.repo.build_rollups(JAN_1, JAN_1, total_segments=1))
+        self._session("u1", midnight, midnight + 3600)
+
+        asyncio.run(self.repo.build_rollups(JAN_1, JAN_1, total_segments=1))
+        heatmap = asyncio.run(self.service.get_heatmap("b1", JAN_1, JAN_1))
+
+        self.assertEqual(heatmap.floors[0].occupancy[0][0], 1.0)
+
+    def test_range_only_reads_requested_days(self):
+        asyncio.run(self.repo.build_rollups(JAN_1, JAN_2, total_segments=1))
+
+        heatmap = asyncio.run(self.service.get_heatmap("b1", JAN_2, JAN_2))
+
+        self.assertEqual(heatmap.floors[0].days, ["2025-01-02"])
+
+
+    def test_rejects_reversed_and_oversized_ranges(self):
+        for start, end in [(JAN_2, JAN_1), (JAN_1, JAN_1 + datetime.timedelta(days=400))]:
+            with self.subTest(start=start, end=end):
+                with self.assertRaises(WebException) as ctx:
+                    asyncio.run(self.service.get_heatmap("b1", start, end))
+                self.assertEqual(ctx.exception.status_code, 400)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import boto3
+from boto3.dynamodb.conditions import Attr
+from botocore.exceptions import ClientError
+from moto import mock_aws
+
+from app.db_schemas import TABLE_DEFINITION
+from app.repository.scan import CapacityLimiter, ScanCheckpoint, parallel_scan
+
+
+async def collect(table, total_segments, **kwargs):
+    pages = []
+    async for page in parallel_scan(table, total_segments, **kwargs):
+        pages.append(page)
+    return pages
+
+
+@mock_aws
+class TestParallelScan(unittest.TestCase):
+
+    def setUp(self):
+        self.dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
+        self.table = self.dynamodb.create_table(**TABLE_DEFINITION)
+        with self.table.batch_writer() as batch:
+            for i in range(40):
+                batch.put_item(Item={"PK": f"USER#u{i}", "SK": "PROFILE" if i % 2 else f"VEHICLE#P{i}"})
+        self.tmp = tempfile.TemporaryDirectory()
+        self.checkpoint_path = os.path.join(self.tmp.name, "scan.json")
+
+    def tearDown(self):
+        self.table.delete()
+        self.tmp.cleanup()
+
+    def _keys(self, pages):
+        return sorted(item["PK"] for page in pages for item in page.items)
+
+    def test_every_item_once_across_segments(self):
+        pages = asyncio.run(collect(self.table, 4, Limit=3))
+
+        self.assertEqual(self._keys(pages), sorted(f"USER#u{i}" for i in range(40)))
+        self.assertEqual({p.segment for p in pages if p.last_key is None}, {0, 1, 2, 3})
+
+    def test_scan_arguments_are_passed_through(self):
+        pages = asyncio.run(collect(self.table, 2, FilterExpression=Attr("SK").begins_with("VEHICLE#")))
+
+        self.assertEqual(self._keys(pages), sorted(f"USER#u{i}" for i in range(0, 40, 2)))
+
+    def test_resumes_from_checkpoint(self):
+        async def stop_after_three_pages():
+            seen = []
+            checkpoint = ScanCheckpoint(self.checkpoint_path, 2)
+            async for page in parallel_scan(self.table, 2, checkpoint, Limit=5):
+                seen.append(page)
+                if len(seen) == 3:
+                    break
+            return seen
+
+        first = asyncio.run(stop_after_three_pages())
+        rest = asyncio.run(collect(self.table, 2, checkpoint=ScanCheckpoint(self.checkpoint_path, 2), Limit=5))
+
+        # the page the interrupted run stopped on is the only one that can repeat
+        keys = self._keys(first[:-1] + rest)
+        self.assertEqual(keys, sorted(f"USER#u{i}" for i in range(40)))
+        self.assertEqual(asyncio.run(collect(self.table, 2, checkpoint=ScanCheckpoint(self.checkpoint_path, 2))), [])
+
+    def test_checkpoint_rejects_a_different_segment_count(self):
+        ScanCheckpoint(self.checkpoint_path, 2).save(0, None)
+
+        with self.assertRaises(ValueError):
+            ScanCheckpoint(self.checkpoint_path, 4)
+
+    def test_worker_errors_reach_the_caller(self):
+        error = ClientError({"Error": {"Code": "ValidationException", "Message": "bad"}}, "Scan")
+
+        with patch.object(self.table, "scan", side_effect=error):
+            with self.assertRaises(ClientError):
+                asyncio.run(collect(self.table, 3))
+
+    def test_throttled_pages_are_retried_at_a_lower_rate(self):
+        throttle = ClientError({"Error": {"Code": "ProvisionedThroughputExceededException", "Message": ""}}, "Scan")
+        real_scan = self.table.scan
+        calls = []
+
+        def scan(**kwargs):
+            calls.append(kwargs)
+            if len(calls) == 1:
+                raise throttle
+            return real_scan(**kwargs)
+
+        sleeps = []
+
+        async def fake_sleep(seconds):
+            sleeps.append(seconds)
+
+        limiter = CapacityLimiter(100, sleep=fake_sleep)
+        with patch.object(self.table, "scan", side_effect=scan):
+            pages = asyncio.run(collect(self.table, 1, limiter=limiter))
+
+        self.assertEqual(len(self._keys(pages)), 40)
+        self.assertEqual(len(sleeps), 1)
+        self.assertEqual(calls[0]["ReturnConsumedCapacity"], "TOTAL")
+
+
+class TestCapacityLimiter(unittest.TestCase):
+
+    def test_paces_to_the_rate_and_backs_off_on_throttling(self):
+        now = [0.0]
+        sleeps = []
+
+        async def fake_sleep(seconds):
+            sleeps.append(seconds)
+            now[0] += seconds
+
+        limiter = CapacityLimiter(10, clock=lambda: now[0], sleep=fake_sleep)
+
+        async def run():
+            await limiter.consume(20)
+            await limiter.consume(20)
+            await limiter.throttled()
+            rate_after_throttle = limiter.rate
+            await limiter.consume(5)
+            return rate_after_throttle
+
+        rate_after_throttle = asyncio.run(run())
+
+        self.assertEqual(sleeps[0], 2.0)
+        self.assertEqual(rate_after_throttle, 5)
+        self.assertEqual(limiter.rate, 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
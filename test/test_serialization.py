@@ -0,0 +1,49 @@
+import json
+import unittest
+
+from fastapi.testclient import TestClient
+from starlette.responses import Response
+
+from app.dto.building import FloorResponseDTO
+from app.main import app
+from app.utils.serialization import ORJSONResponse, dto_response, serializer
+
+
+class TestSerialization(unittest.TestCase):
+
+    def _floors(self):
+        return [FloorResponseDTO(buildingId="b1", floorNumber=1, totalSlots=5, availableSlots=3, assignedOffice=None)]
+
+    def test_dto_response_uses_aliases(self):
+        response = dto_response(self._floors(), list[FloorResponseDTO])
+
+        self.assertEqual(response.media_type, "application/json")
+        self.assertEqual(
+            json.loads(response.body),
+            [{"buildingId": "b1", "floorNumber": 1, "totalSlots": 5, "availableSlots": 3, "assignedOffice": None}],
+        )
+
+    def test_dto_response_keeps_headers_set_on_the_injected_response(self):
+        injected = Response()
+        del injected.headers["content-length"]
+        injected.headers["etag"] = '"v1"'
+
+        response = dto_response(self._floors(), list[FloorResponseDTO], injected)
+
+        self.assertEqual(response.headers["etag"], '"v1"')
+        self.assertEqual(response.headers["content-length"], str(len(response.body)))
+
+    def test_serializers_are_built_once_per_type(self):
+        self.assertIs(serializer(list[FloorResponseDTO]), serializer(list[FloorResponseDTO]))
+
+    def test_orjson_is_the_default_response_class(self):
+        with TestClient(app) as client:
+            response = client.get("/health")
+
+        route = next(r for r in app.routes if getattr(r, "path", None) == "/health")
+        self.assertIs(getattr(route.response_class, "value", route.response_class), ORJSONResponse)
+        self.assertEqual(response.headers["content-type"], "application/json")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import asyncio
+import contextvars
+import unittest
+
+from app.utils.single_flight import single_flight, single_flight_stats
+
+request_marker: contextvars.ContextVar[str | None] = contextvars.ContextVar("request_marker", default=None)
+
+
+class FakeRepository:
+    def __init__(self, db: object = None):
+        self.db = db
+        self.calls = 0
+
+    @single_flight
+    async def get_items(self, key: str):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return [key, self.calls]
+
+    @single_flight
+    async def get_marker(self):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return request_marker.get()
+
+    @single_flight
+    async def get_failing(self, key: str):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        raise ValueError(key)
+
+
+class TestSingleFlight(unittest.IsolatedAsyncioTestCase):
+
+    async def test_concurrent_identical_calls_share_one_request(self):
+        repo = FakeRepository()
+        before = single_flight_stats().get("FakeRepository.get_items", {"calls": 0, "coalesced": 0})
+
+        results = await asyncio.gather(*(repo.get_items("a") for _ in range(20)))
+
+        self.assertEqual(repo.calls, 1)
+        self.assertTrue(all(r is results[0] for r in results))
+        stats = single_flight_stats()["FakeRepository.get_items"]
+        self.assertEqual(stats["calls"] - before["calls"], 20)
+        self.assertEqual(stats["coalesced"] - before["coalesced"], 19)
+
+    async def test_different_arguments_are_not_coalesced(self):
+        repo = FakeRepository()
+
+        a, b = await asyncio.gather(repo.get_items("a"), repo.get_items("b"))
+
+        self.assertEqual(repo.calls, 2)
+        self.assertEqual(a[0], "a")
+        self.assertEqual(b[0], "b")
+
+    async def test_sequential_calls_are_not_cached(self):
+        repo = FakeRepository()
+
+        await repo.get_items("a")
+        await repo.get_items("a")
+
+        self.assertEqual(repo.calls, 2)
+
+    async def test_exception_is_shared(self):
+        repo = FakeRepository()
+
+        results = await asyncio.gather(
+            *(repo.get_failing("x") for _ in range(5)), return_exceptions=True
+        )
+
+        self.assertEqual(repo.calls, 1)
+        self.assertTrue(all(isinstance(r, ValueError) for r in results))
+
+    async def test_cancelled_leader_does_not_cancel_followers(self):
+        repo = FakeRepository()
+
+        leader = asyncio.ensure_future(repo.get_items("c"))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(repo.get_items("c"))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        self.assertEqual((await follower)[0], "c")
+        self.assertEqual(repo.calls, 1)
+
+    async def test_cancelled_follower_does_not_cancel_the_shared_call(self):
+        repo = FakeRepository()
+
+        leader = asyncio.ensure_future(repo.get_items("d"))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(repo.get_items("d"))
+        await asyncio.sleep(0)
+        follower.cancel()
+
+        self.assertEqual((await leader)[0], "d")
+        self.assertEqual(repo.calls, 1)
+
+    async def test_shared_call_does_not_see_the_leaders_context(self):
+        repo = FakeRepository()
+        request_marker.set("leader")
+
+        self.assertIsNone(await repo.get_marker())
+
+    async def test_different_databases_are_not_coalesced(self):
+        first, second = FakeRepository(db=object()), FakeRepository(db=object())
+
+        await asyncio.gather(first.get_items("a"), second.get_items("a"))
+
+        self.assertEqual((first.calls, second.calls), (1, 1))
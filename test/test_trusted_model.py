@@ -0,0 +1,93 @@
+import unittest
+from decimal import Decimal
+from unittest.mock import patch
+
+from pydantic import ValidationError
+
+from app.models.parking_history import ParkingHistory
+from app.models.slot import OccupantDetails, Slot, SlotType
+from app.models.vehicle import AssignedSlot, Vehicle, VehicleType
+from app.utils.trusted_model import converter, from_item
+
+
+class TestTrustedModel(unittest.TestCase):
+
+    def _parking_item(self, **overrides):
+        item = {
+            "PK": "USER#u1",
+            "SK": "PARKING#202501#1735689600",
+            "ParkingId": "p1",
+            "Numberplate": "KA01AB1234",
+            "BuildingId": "b1",
+            "FloorNumber": Decimal(2),
+            "SlotId": Decimal(7),
+            "StartTime": Decimal(1735689600),
+            "EndTime": Decimal(1735693200),
+        }
+        item.update(overrides)
+        return item
+
+    def test_matches_validated_model(self):
+        item = self._parking_item()
+
+        trusted = from_item(ParkingHistory, item, user_id="u1")
+
+        self.assertEqual(trusted, ParkingHistory(**item, user_id="u1"))
+        self.assertIs(type(trusted.floor_number), int)
+        self.assertIs(type(trusted.end_time), int)
+
+    def test_defaults_fill_missing_optional_attributes(self):
+        item = self._parking_item()
+        del item["EndTime"]
+
+        parking = from_item(ParkingHistory, item, user_id="u1")
+
+        self.assertIsNone(parking.end_time)
+        self.assertIsNone(parking.vehicle_type)
+
+    def test_enums_and_nested_models(self):
+        slot = from_item(Slot, {
+            "SlotId": Decimal(3),
+            "SlotType": "FourWheeler",
+            "IsAssigned": True,
+            "IsOccupied": True,
+            "OccupiedBy": {"Username": "u", "NumberPlate": "KA01", "Email": "u@example.com", "StartTime": Decimal(5)},
+        }, building_id="b1", floor_number=1)
+        vehicle = from_item(Vehicle, {
+            "VehicleId": "v1",
+            "Numberplate": "KA01",
+            "VehicleType": "TwoWheeler",
+            "IsParked": False,
+            "AssignedSlot": {"BuildingId": "b1", "FloorNumber": Decimal(1), "SlotId": Decimal(4)},
+        })
+
+        self.assertIs(slot.slot_type, SlotType.FOUR_WHEELER)
+        self.assertIsInstance(slot.occupied_by, OccupantDetails)
+        self.assertEqual(slot.occupied_by.start_time, 5)
+        self.assertEqual(slot.model_dump(by_alias=True)["OccupiedBy"]["StartTime"], 5)
+        self.assertIs(vehicle.vehicle_type, VehicleType.TWO_WHEELER)
+        self.assertEqual(vehicle.assigned_slot, AssignedSlot(BuildingId="b1", FloorNumber=1, SlotId=4))
+
+    def test_bad_items_are_still_validated(self):
+        with self.assertRaises(ValidationError):
+            from_item(ParkingHistory, self._parking_item(FloorNumber="not a number"), user_id="u1")
+
+        missing = self._parking_item()
+        del missing["ParkingId"]
+        with self.assertRaises(ValidationError):
+            from_item(ParkingHistory, missing, user_id="u1")
+
+    def test_flag_off_validates_every_item(self):
+        with patch("app.utils.trusted_model.TRUSTED_REPOSITORY_READS", False), \
+                patch.object(ParkingHistory, "model_construct") as construct:
+            parking = from_item(ParkingHistory, self._parking_item(), user_id="u1")
+
+        construct.assert_not_called()
+        self.assertEqual(parking.slot_id, 7)
+
+    def test_converters_are_built_once_per_model(self):
+        self.assertIs(converter(ParkingHistory), converter(ParkingHistory))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -10,10 +10,13 @@ from app.errors.web_exception import WebException
 from fastapi import HTTPException
 
 
-@mock_aws
 class TestUserRepository(unittest.IsolatedAsyncioTestCase):
 
-    def setUp(self):
+    async def asyncSetUp(self):
+        self.mock_aws = mock_aws()
+        self.mock_aws.start()
+        self.addCleanup(self.mock_aws.stop)
+
         self.dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
 
         self.table = self.dynamodb.create_table(
@@ -147,6 +150,7 @@ class TestUserRepository(unittest.IsolatedAsyncioTestCase):
         )
 
         user2 = User(
+            Id="user006",
             Username="second",
             Email="second@example.com",
             PasswordHash="password2",
@@ -249,6 +253,67 @@ class TestUserRepository(unittest.IsolatedAsyncioTestCase):
             result = await self.repo.get_by_email(f"user{i}@example.com")
             self.assertEqual(result.user_id, f"user{i}")
 
+    async def test_save_user_writes_login_fields_on_lookup(self):
+        user = User(
+            Id="user020",
+            Username="lookupuser",
+            Email="lookup@example.com",
+            PasswordHash="hash020",
+            OfficeId="office001",
+            Role=Roles.ADMIN
+        )
+
+        await self.repo.save_user(user)
+
+        lookup = self.table.get_item(Key={"PK": "USER", "SK": "lookup@example.com"})["Item"]
+        self.assertEqual(lookup["UUID"], "user020")
+        self.assertEqual(lookup["PasswordHash"], "hash020")
+        self.assertEqual(lookup["Role"], Roles.ADMIN.value)
+        self.assertEqual(lookup["OfficeId"], "office001")
+        self.assertEqual(lookup["Username"], "lookupuser")
+
+    async def test_get_by_email_single_read(self):
+        user = User(
+            Id="user021",
+            Username="fastuser",
+            Email="fast@example.com",
+            PasswordHash="hash021",
+            OfficeId="office001",
+        )
+        await self.repo.save_user(user)
+        self.table.delete_item(Key={"PK": "USER#user021", "SK": "PROFILE"})
+
+        result = await self.repo.get_by_email("fast@example.com")
+
+        self.assertEqual(result, user)
+
+    async def test_backfill_lookup_items(self):
+        self.table.put_item(Item={"PK": "USER", "SK": "old@example.com", "UUID": "user022"})
+        self.table.put_item(Item={
+            "PK": "USER#user022",
+            "SK": "PROFILE",
+            "Id": "user022",
+            "Username": "olduser",
+            "Email": "old@example.com",
+            "PasswordHash": "hash022",
+            "OfficeId": "office001",
+            "Role": Roles.CUSTOMER,
+        })
+        await self.repo.save_user(User(
+            Id="user023",
+            Username="newuser",
+            Email="new@example.com",
+            PasswordHash="hash023",
+            OfficeId="office001",
+        ))
+
+        self.assertEqual(await self.repo.backfill_lookup_items(), 1)
+        self.assertEqual(await self.repo.backfill_lookup_items(), 0)
+
+        lookup = self.table.get_item(Key={"PK": "USER", "SK": "old@example.com"})["Item"]
+        self.assertEqual(lookup["PasswordHash"], "hash022")
+        self.assertEqual(lookup["Username"], "olduser")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,10 +1,12 @@
+import asyncio
 import unittest
 import boto3
 from moto import mock_aws
 
-from app.repository.vehicle_repo import VehicleRepository
+from app.repository.vehicle_repo import VehicleRepository, normalize_plate
 from app.models.vehicle import Vehicle, VehicleType, AssignedSlot
 from app.constants import TABLE
+from app.db_schemas import TABLE_DEFINITION
 
 
 @mock_aws
@@ -291,5 +293,74 @@ class TestVehicleRepository(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(vehicles_user2[0].vehicle_type, VehicleType.FOUR_WHEELER)
 
 
+
+@mock_aws
+class TestPlateIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
+        self.table = self.dynamodb.create_table(**TABLE_DEFINITION)
+        self.repo = VehicleRepository(db=self.dynamodb)
+
+    def tearDown(self):
+        self.table.delete()
+
+    def _vehicle(self, plate: str) -> Vehicle:
+        return Vehicle(VehicleId=f"v-{plate}", Numberplate=plate, VehicleType=VehicleType.FOUR_WHEELER, IsParked=False)
+
+    def test_normalize_plate(self):
+        self.assertEqual(normalize_plate("ka-01 ab 1234"), "KA01AB1234")
+        self.assertEqual(normalize_plate(" - "), "")
+
+    def test_save_and_delete_maintain_the_index(self):
+        asyncio.run(self.repo.save_vehicle(self._vehicle("KA-01-AB-1234"), "user001"))
+        asyncio.run(self.repo.save_vehicle(self._vehicle("KA01AB1234"), "user002"))
+        asyncio.run(self.repo.save_vehicle(self._vehicle("MH02CD5678"), "user001"))
+
+        found = asyncio.run(self.repo.search_by_plate("ka 01", 10))
+        self.assertEqual(
+            [(i["Numberplate"], i["UserId"]) for i in found],
+            [("KA-01-AB-1234", "user001"), ("KA01AB1234", "user002")],
+        )
+
+        asyncio.run(self.repo.delete_vehicle("user001", "KA-01-AB-1234"))
+
+        found = asyncio.run(self.repo.search_by_plate("KA01AB1234", 10))
+        self.assertEqual([i["UserId"] for i in found], ["user002"])
+
+    def test_plates_of_one_user_that_normalize_the_same_are_indexed_apart(self):
+        asyncio.run(self.repo.save_vehicle(self._vehicle("KA-01 AB"), "user001"))
+        asyncio.run(self.repo.save_vehicle(self._vehicle("KA01AB"), "user001"))
+
+        found = asyncio.run(self.repo.search_by_plate("KA01AB", 10))
+        self.assertEqual(sorted(i["Numberplate"] for i in found), ["KA-01 AB", "KA01AB"])
+
+        asyncio.run(self.repo.delete_vehicle("user001", "KA01AB"))
+
+        found = asyncio.run(self.repo.search_by_plate("KA01AB", 10))
+        self.assertEqual([i["Numberplate"] for i in found], ["KA-01 AB"])
+
+    def test_duplicate_vehicle_leaves_the_index_unchanged(self):
+        asyncio.run(self.repo.save_vehicle(self._vehicle("DUP123"), "user001"))
+
+        with self.assertRaises(self.table.meta.client.exceptions.TransactionCanceledException):
+            asyncio.run(self.repo.save_vehicle(self._vehicle("DUP123"), "user001"))
+
+        self.assertEqual(len(asyncio.run(self.repo.search_by_plate("DUP", 10))), 1)
+
+    def test_backfill_indexes_existing_vehicles(self):
+        for user_id, plate in [("user001", "OLD-1"), ("user002", "OLD-2")]:
+            self.table.put_item(Item={
+                **self._vehicle(plate).model_dump(by_alias=True),
+                "PK": f"USER#{user_id}",
+                "SK": f"VEHICLE#{plate}",
+            })
+
+        indexed = asyncio.run(self.repo.backfill_plate_index(2))
+
+        self.assertEqual(indexed, 2)
+        found = asyncio.run(self.repo.search_by_plate("OLD", 10))
+        self.assertEqual([(i["Numberplate"], i["UserId"]) for i in found], [("OLD-1", "user001"), ("OLD-2", "user002")])
+
 if __name__ == "__main__":
     unittest.main()
@@ -4,6 +4,7 @@ import unittest
 from unittest.mock import AsyncMock
 from fastapi.testclient import TestClient
 
+from app.dto.vehicle import VehicleResponseDTO
 from app.main import app
 from app.models.roles import Roles
 from app.services.vehicle import VehicleService
@@ -37,7 +38,7 @@ class TestVehicleRouter(unittest.TestCase):
         return {"Authorization": f"Bearer {token}"}
 
     def test_get_vehicles(self):
-        self.vehicle_service_mock.get_vehicles_by_user.return_value = [
+        vehicles = [
             {
                 "number_plate": "ABC123",
                 "vehicle_type": "Car",
@@ -48,11 +49,12 @@ class TestVehicleRouter(unittest.TestCase):
                 "assigned_slot_number": 2,
             }
         ]
+        self.vehicle_service_mock.get_vehicles_by_user.return_value = [VehicleResponseDTO(**v) for v in vehicles]
 
         response = self.client.get("/vehicles/", headers=self._auth_headers())
 
         assert response.status_code == 200
-        assert response.json() == self.vehicle_service_mock.get_vehicles_by_user.return_value
+        assert response.json() == vehicles
 
     def test_add_vehicle(self):
         response = self.client.post(
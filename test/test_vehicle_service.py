@@ -4,7 +4,7 @@ from types import SimpleNamespace
 from unittest.mock import AsyncMock
 
 from app.dto.vehicle import AddVehicleRequestDTO
-from app.errors.web_exception import CONFLICT_ERROR, DB_ERROR, WebException
+from app.errors.web_exception import CONFLICT_ERROR, DB_ERROR, VALIDATION_ERROR, WebException
 from app.models.building import Building
 from app.models.office import Office
 from app.models.slot import Slot, SlotType
@@ -63,13 +63,13 @@ class TestVehicleService(unittest.TestCase):
             AssignedSlot=assigned_slot,
         )
         self.vehicle_repo.get_vehicles_by_user_id.return_value = [vehicle]
-        self.building_repo.get_building_by_id.return_value = Building(
-            BuildingId="b1", BuildingName="HQ", TotalFloors=1, TotalSlots=10, AvailableSlots=8
-        )
+        self.building_repo.get_buildings_by_ids.return_value = {
+            "b1": Building(BuildingId="b1", BuildingName="HQ", TotalFloors=1, TotalSlots=10, AvailableSlots=8)
+        }
 
         vehicles = asyncio.run(self.service.get_vehicles_by_user("user_1"))
 
-        self.building_repo.get_building_by_id.assert_awaited_once_with("b1")
+        self.building_repo.get_buildings_by_ids.assert_awaited_once_with(["b1"])
         v = vehicles[0]
         self.assertEqual(v.assigned_building_name, "HQ")
         self.assertEqual(v.assigned_slot_number, 5)
@@ -159,3 +159,23 @@ class TestVehicleService(unittest.TestCase):
         asyncio.run(self.service.delete_vehicle("ABC123", "user_1"))
 
         self.vehicle_repo.delete_vehicle.assert_awaited_once_with("user_1", "ABC123")
+
+    def test_search_by_plate_maps_index_items(self):
+        self.vehicle_repo.search_by_plate.return_value = [
+            {"PK": "PLATE", "SK": "KA01AB1234#user_1#KA-01-AB-1234", "UserId": "user_1", "Numberplate": "KA-01-AB-1234", "VehicleType": "FourWheeler"},
+        ]
+
+        result = asyncio.run(self.service.search_by_plate("ka01", 20))
+
+        self.assertEqual(len(result), 1)
+        self.assertEqual(result[0].number_plate, "KA-01-AB-1234")
+        self.assertEqual(result[0].user_id, "user_1")
+        self.vehicle_repo.search_by_plate.assert_awaited_once_with("ka01", 20)
+
+    def test_search_by_plate_rejects_prefix_without_plate_characters(self):
+        with self.assertRaises(WebException) as ctx:
+            asyncio.run(self.service.search_by_plate(" -- ", 20))
+
+        self.assertEqual(ctx.exception.status_code, 400)
+        self.assertEqual(ctx.exception.error_code, VALIDATION_ERROR)
+        self.vehicle_repo.search_by_plate.assert_not_awaited()
@@ -0,0 +1,115 @@
+import unittest
+import boto3
+from botocore.exceptions import ClientError
+from moto import mock_aws
+
+from app.constants import TABLE
+from app.models.building import Building
+from app.models.office import Office
+from app.repository.building_repo import BuildingRepository
+from app.repository.floor_repo import FloorRepository
+from app.repository.office_repo import OfficeRepository
+from app.repository.slot_repo import SlotRepository
+from app.repository.version_repo import (
+    BUILDINGS_SCOPE,
+    OFFICES_SCOPE,
+    VersionRepository,
+    building_scope,
+)
+
+
+class TestVersionRepository(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.mock_aws = mock_aws()
+        self.mock_aws.start()
+        self.addCleanup(self.mock_aws.stop)
+
+        self.dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
+
+        self.table = self.dynamodb.create_table(
+            TableName=TABLE,
+            KeySchema=[
+                {"AttributeName": "PK", "KeyType": "HASH"},
+                {"AttributeName": "SK", "KeyType": "RANGE"},
+            ],
+            AttributeDefinitions=[
+                {"AttributeName": "PK", "AttributeType": "S"},
+                {"AttributeName": "SK", "AttributeType": "S"},
+            ],
+            BillingMode="PAY_PER_REQUEST",
+        )
+
+        self.repo = VersionRepository(db=self.dynamodb)
+
+    def tearDown(self):
+        self.table.delete()
+
+    async def test_get_version_missing_is_zero(self):
+        self.assertEqual(await self.repo.get_version(BUILDINGS_SCOPE), 0)
+        self.assertEqual(await self.repo.get_versions(), {})
+
+    async def test_bump_increments(self):
+        await self.repo.bump(BUILDINGS_SCOPE)
+        await self.repo.bump(BUILDINGS_SCOPE, OFFICES_SCOPE)
+
+        self.assertEqual(await self.repo.get_version(BUILDINGS_SCOPE), 2)
+        self.assertEqual(await self.repo.get_versions(), {BUILDINGS_SCOPE: 2, OFFICES_SCOPE: 1})
+
+    async def test_add_building_and_floor_bump_versions(self):
+        building_repo = BuildingRepository(db=self.dynamodb)
+        floor_repo = FloorRepository(db=self.dynamodb)
+
+        await building_repo.add_building(Building(BuildingId="b1", BuildingName="HQ"))
+        await floor_repo.add_floor(building_id="b1", floor_number=1)
+
+        self.assertEqual(await self.repo.get_version(BUILDINGS_SCOPE), 2)
+        self.assertEqual(await self.repo.get_version(building_scope("b1")), 2)
+
+    async def test_slot_writes_bump_building_version_in_the_same_transaction(self):
+        slot_repo = SlotRepository(db=self.dynamodb)
+        self.table.put_item(Item={
+            "PK": "BUILDING#b1",
+            "SK": "FLOOR#1#SLOT#1",
+            "SlotId": 1,
+            "SlotType": "TwoWheeler",
+            "IsAssigned": False,
+            "IsOccupied": False,
+        })
+
+        await slot_repo.update_slot_occupancy("b1", 1, 1, occupied_by=None, is_occupied=True)
+        self.assertEqual(await self.repo.get_version(building_scope("b1")), 1)
+
+        await slot_repo.update_slot_occupancy("b1", 1, 1, occupied_by=None, is_occupied=False)
+        self.assertEqual(await self.repo.get_version(building_scope("b1")), 2)
+
+    async def test_duplicate_floor_leaves_versions_unchanged(self):
+        building_repo = BuildingRepository(db=self.dynamodb)
+        floor_repo = FloorRepository(db=self.dynamodb)
+        await building_repo.add_building(Building(BuildingId="b1", BuildingName="HQ"))
+        await floor_repo.add_floor(building_id="b1", floor_number=1)
+
+        with self.assertRaises(ClientError):
+            await floor_repo.add_floor(building_id="b1", floor_number=1)
+
+        self.assertEqual(await self.repo.get_version(building_scope("b1")), 2)
+        building = await building_repo.get_building_by_id("b1")
+        self.assertEqual(building.total_floors, 1)
+
+    async def test_office_writes_bump_versions(self):
+        office_repo = OfficeRepository(db=self.dynamodb)
+        self.table.put_item(Item={
+            "PK": "BUILDING#b1",
+            "SK": "FLOORINFO#1",
+            "FloorNumber": 1,
+            "OfficeId": None,
+        })
+
+        await office_repo.add_office(
+            Office(OfficeName="Engineering", BuildingId="b1", FloorNumber=1, OfficeId="o1")
+        )
+        self.assertEqual(await self.repo.get_version(OFFICES_SCOPE), 1)
+
+        await office_repo.delete_office(building_id="b1", floor_number=1, office_id="o1")
+        self.assertEqual(await self.repo.get_version(OFFICES_SCOPE), 2)
+        self.assertEqual(await self.repo.get_version(building_scope("b1")), 2)
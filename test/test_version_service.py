@@ -0,0 +1,40 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock
+
+from app.repository.version_repo import VersionRepository
+from app.services.version import VersionService
+
+
+class TestVersionService(unittest.TestCase):
+    def setUp(self):
+        self.version_repo = AsyncMock(VersionRepository)
+        self.service = VersionService(version_repo=self.version_repo)
+
+    def test_buildings_etag_changes_with_any_building(self):
+        self.version_repo.get_versions.return_value = {"BUILDINGS": 1, "BUILDING#b1": 4, "OFFICES": 2}
+        before = asyncio.run(self.service.get_buildings_etag())
+
+        self.version_repo.get_versions.return_value = {"BUILDINGS": 1, "BUILDING#b1": 5, "OFFICES": 2}
+        after = asyncio.run(self.service.get_buildings_etag())
+
+        self.assertNotEqual(before, after)
+        self.assertTrue(before.startswith('"') and before.endswith('"'))
+
+    def test_buildings_etag_ignores_offices(self):
+        self.version_repo.get_versions.return_value = {"BUILDINGS": 1, "OFFICES": 2}
+        before = asyncio.run(self.service.get_buildings_etag())
+
+        self.version_repo.get_versions.return_value = {"BUILDINGS": 1, "OFFICES": 3}
+        after = asyncio.run(self.service.get_buildings_etag())
+
+        self.assertEqual(before, after)
+
+    def test_building_etag_depends_on_parts(self):
+        self.version_repo.get_version.return_value = 3
+
+        floors = asyncio.run(self.service.get_building_etag("b1", "floors"))
+        slots = asyncio.run(self.service.get_building_etag("b1", "slots", 1))
+
+        self.assertNotEqual(floors, slots)
+        self.version_repo.get_version.assert_awaited_with("BUILDING#b1")